@@ -1,55 +1,91 @@
 """
 Application factory for the StackIt backend.
 Everything – config, extensions, blueprints – is wired up here.
+
+Heavy optional pieces (Flask‑Migrate/alembic, Socket.IO, marshmallow,
+bleach) are imported only when actually used, to keep cold start short.
 """
 
+from importlib import import_module
+import os
+
 from flask import Flask
 from flask_cors import CORS
-from flask_migrate import Migrate
-from dotenv import load_dotenv
-import os
 
-from .extensions import db, jwt, limiter, socketio
+from .concurrency import check_driver, engine_options
+from .config import Config
+from .extensions import db, jwt, limiter
+from .json_provider import FastJSONProvider
+from .services.ratelimit import settle_local_hits
+
+# (module under app.blueprints, url prefix) – imported only when enabled
+BLUEPRINTS = [
+    ("questions",     "/api/questions"),
+    ("notifications", "/api/notifications"),
+    ("auth",          "/api/auth"),
+    ("answers",       "/api/questions/<int:q_id>/answers"),
+    ("votes",         "/api/votes"),
+    ("tags",          "/api/tags"),
+    ("admin",         "/api/admin"),
+    ("users",         "/api/users"),
+]
 
-migrate = Migrate()
 
-def create_app() -> Flask:
-    load_dotenv()
+def register_blueprints(app: Flask) -> None:
+    enabled = app.config.get("ENABLED_BLUEPRINTS")
+    for name, prefix in BLUEPRINTS:
+        if enabled is not None and name not in enabled:
+            continue
+        module = import_module(f".blueprints.{name}", __name__)
+        app.register_blueprint(module.bp, url_prefix=prefix)
+
+
+def create_app(config_object=Config) -> Flask:
     app = Flask(__name__)
+    app.config.from_object(config_object)
+    app.json = FastJSONProvider(app)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
-    app.config.update(
-        SQLALCHEMY_DATABASE_URI=os.getenv("DATABASE_URI", "sqlite:///../instance/stackit.db"),
-        SQLALCHEMY_TRACK_MODIFICATIONS=False,
-        JWT_SECRET_KEY=os.getenv("JWT_SECRET_KEY", "super-secret"),
-    )
 
+    # pool sized for the worker model; explicit engine options still win
+    check_driver(app.config)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(app.config), **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})}
     db.init_app(app)
     jwt.init_app(app)
     limiter.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*")
-    migrate.init_app(app, db)
-    CORS(app)
+    app.after_request(settle_local_hits)
+    if app.config["SOCKETIO_ENABLED"]:
+        from .extensions import socketio
+        from .services.live import register_handlers
+        socketio.init_app(app, cors_allowed_origins="*",
+                          async_mode=app.config["ASYNC_MODE"],
+                          message_queue=app.config["SOCKETIO_MESSAGE_QUEUE"])
+        register_handlers(socketio)
+    # alembic alone costs ~0.3s to import; only the `flask` CLI needs it
+    if os.environ.get("FLASK_RUN_FROM_CLI"):
+        from flask_migrate import Migrate
+        Migrate(app, db)
 
     from . import models
+    from .cli import register_cli
+
+    if app.config["INDEX_ADVISOR"]:
+        from .index_advisor import advisor
+        with app.app_context():
+            advisor.install(db.engine)
 
-    from .blueprints.questions import bp as questions_bp
-    from .blueprints.notifications import bp as notifications_bp
-    from .blueprints.auth import bp as auth_bp
-    from .blueprints.answers import bp as answers_bp
-    from .blueprints.votes import bp as votes_bp
-    from .blueprints.tags import bp as tags_bp
-    from .blueprints.admin import bp as admin_bp
-
-    app.register_blueprint(questions_bp,     url_prefix="/api/questions")
-    app.register_blueprint(notifications_bp, url_prefix="/api/notifications")
-    app.register_blueprint(auth_bp,          url_prefix="/api/auth")
-    app.register_blueprint(answers_bp,       url_prefix="/api/answers")
-    app.register_blueprint(votes_bp,         url_prefix="/api/votes")
-    app.register_blueprint(tags_bp,          url_prefix="/api/tags")
-    app.register_blueprint(admin_bp,         url_prefix="/api/admin")
+    from .profiling import profiler
+    profiler.init_app(app)
+
+    register_blueprints(app)
+    register_cli(app)
 
     @app.errorhandler(404)
     def not_found(_):
         return {"error": "Not Found"}, 404
 
+    @app.errorhandler(413)
+    def too_large(_):
+        return {"error": "Request body too large"}, 413
+
     return app
@@ -1,14 +1,21 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..extensions import db
 from ..models.user import User
 from ..models.question import Question
 from ..models.answer import Answer
 from ..models.vote import Vote
+from ..models.audit import AdminAudit
+from ..profiling import HEADER as PROFILE_HEADER, profiler
+from ..services import counters, summaries, views
+from ..services.export import EXPORTS, gzip_chunks, iter_ndjson
 from ..services.rbac import admin_required
 
 bp = Blueprint('admin', __name__)
 
+ROLES = ['user', 'moderator', 'admin']
+BULK_MAX_IDS = 5000
+
 @bp.route('/users', methods=['GET'])
 @admin_required
 def get_users():
@@ -51,11 +58,12 @@ def update_user_role(user_id):
         data = request.get_json()
         new_role = data.get('role')
         
-        if new_role not in ['user', 'moderator', 'admin']:
+        if new_role not in ROLES:
             return jsonify({'error': 'Invalid role'}), 400
         
         user.role = new_role
         db.session.commit()
+        summaries.users.invalidate(user_id)
         
         return jsonify({
             'message': 'User role updated successfully',
@@ -89,6 +97,7 @@ def update_user_status(user_id):
         
         user.is_active = bool(is_active)
         db.session.commit()
+        summaries.users.invalidate(user_id)
         
         status = 'activated' if is_active else 'deactivated'
         return jsonify({
@@ -100,6 +109,103 @@ def update_user_status(user_id):
         db.session.rollback()
         return jsonify({'error': 'Failed to update user status'}), 500
 
+def bulk_criteria(criteria):
+    """WHERE clauses for a bulk user selection; raises ValueError on bad input"""
+    clauses = []
+    ids = criteria.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            raise ValueError('ids must be a list of integers')
+        if len(ids) > BULK_MAX_IDS:
+            raise ValueError(f'At most {BULK_MAX_IDS} ids per request')
+        clauses.append(User.id.in_(ids))
+    if 'role' in criteria:
+        clauses.append(User.role == criteria['role'])
+    if 'is_active' in criteria:
+        if not isinstance(criteria['is_active'], bool):
+            raise ValueError('is_active must be true or false')
+        clauses.append(User.is_active == criteria['is_active'])
+    for key in ('username_prefix', 'email_domain'):
+        if criteria.get(key) is not None and not isinstance(criteria[key], str):
+            raise ValueError(f'{key} must be a string')
+    if criteria.get('username_prefix'):
+        prefix = criteria['username_prefix'].lower()
+        clauses.append(db.func.lower(User.username).startswith(prefix, autoescape=True))
+    if criteria.get('email_domain'):
+        domain = criteria['email_domain'].lower().lstrip('@')
+        clauses.append(db.func.lower(User.email).endswith('@' + domain, autoescape=True))
+    if criteria.get('max_reputation') is not None:
+        clauses.append(User.reputation <= int(criteria['max_reputation']))
+    if not clauses:
+        raise ValueError('Specify ids or at least one filter')
+    return clauses
+
+
+@bp.route('/users/bulk', methods=['PUT'])
+@admin_required
+def bulk_update_users():
+    """Change role and/or status for many users in one UPDATE
+
+    Body: ``{"ids": [...]}`` and/or ``{"filter": {role, is_active,
+    username_prefix, email_domain, max_reputation}}`` plus
+    ``{"set": {"role": ..., "is_active": ...}}``.
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        changes = data.get('set') or {}
+
+        values = {}
+        if 'role' in changes:
+            if changes['role'] not in ROLES:
+                return jsonify({'error': 'Invalid role'}), 400
+            values['role'] = changes['role']
+        if 'is_active' in changes:
+            if not isinstance(changes['is_active'], bool):
+                return jsonify({'error': 'is_active must be true or false'}), 400
+            values['is_active'] = changes['is_active']
+        if not values:
+            return jsonify({'error': 'set must contain role and/or is_active'}), 400
+
+        criteria = dict(data.get('filter') or {})
+        if 'ids' in data:
+            criteria['ids'] = data['ids']
+        try:
+            clauses = bulk_criteria(criteria)
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
+
+        # never the caller, and only rows that actually change
+        clauses.append(User.id != current_user_id)
+        clauses.append(db.or_(*(getattr(User, k) != v for k, v in values.items())))
+
+        stmt = db.update(User).where(*clauses).values(**values)
+        if db.engine.dialect.update_returning:
+            user_ids = db.session.execute(
+                stmt.returning(User.id), execution_options={'synchronize_session': False}
+            ).scalars().all()
+        else:
+            user_ids = db.session.scalars(db.select(User.id).where(*clauses)).all()
+            db.session.execute(db.update(User).where(User.id.in_(user_ids)).values(**values),
+                               execution_options={'synchronize_session': False})
+
+        audit = AdminAudit(actor_id=current_user_id, action='users.bulk_update',
+                           criteria=criteria, changes=values, affected_ids=user_ids)
+        db.session.add(audit)
+        db.session.commit()
+        summaries.users.invalidate(*user_ids)
+
+        return jsonify({
+            'message': f'{len(user_ids)} users updated',
+            'updated': len(user_ids),
+            'user_ids': user_ids,
+            'audit_id': audit.id
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to update users'}), 500
+
 @bp.route('/stats', methods=['GET'])
 @admin_required
 def get_admin_stats():
@@ -126,3 +232,93 @@ def get_admin_stats():
         
     except Exception as e:
         return jsonify({'error': 'Failed to get stats'}), 500
+
+@bp.route('/cache', methods=['GET'])
+@admin_required
+def get_cache_metrics():
+    """Hit rates of this process's summary caches and its write buffers"""
+    return jsonify({**summaries.metrics(), 'vote_buffer': counters.buffer.metrics(),
+                    'view_buffer': views.buffer.metrics()}), 200
+
+@bp.route('/profiling', methods=['GET'])
+@admin_required
+def get_profiling():
+    """Profiling settings of this process and the profiles it kept"""
+    return jsonify({'settings': profiler.settings(),
+                    'profiles': [p.meta() for p in reversed(profiler.profiles)]}), 200
+
+@bp.route('/profiling', methods=['PUT'])
+@admin_required
+def update_profiling():
+    """Switch sampled profiling on/off: {enabled, sample_rate, path_prefix}"""
+    data = request.get_json(silent=True) or {}
+    enabled = data.get('enabled')
+    sample_rate = data.get('sample_rate')
+    path_prefix = data.get('path_prefix')
+    if enabled is not None and not isinstance(enabled, bool):
+        return jsonify({'error': 'enabled must be a boolean'}), 400
+    if sample_rate is not None and (isinstance(sample_rate, bool)
+                                    or not isinstance(sample_rate, (int, float))
+                                    or not 0 <= sample_rate <= 1):
+        return jsonify({'error': 'sample_rate must be a number between 0 and 1'}), 400
+    if path_prefix is not None and not (isinstance(path_prefix, str) and path_prefix.startswith('/')):
+        return jsonify({'error': 'path_prefix must start with "/"'}), 400
+
+    settings = profiler.configure(enabled=enabled, sample_rate=sample_rate,
+                                  path_prefix=path_prefix)
+    db.session.add(AdminAudit(actor_id=get_jwt_identity(), action='profiling.update',
+                              changes={k: v for k, v in data.items()
+                                       if k in ('enabled', 'sample_rate', 'path_prefix')}))
+    db.session.commit()
+    return jsonify({'settings': settings}), 200
+
+@bp.route('/profiling/token', methods=['POST'])
+@admin_required
+def create_profiling_token():
+    """Signed header value that profiles any request carrying it"""
+    return jsonify({'header': PROFILE_HEADER,
+                    'token': profiler.make_token(get_jwt_identity()),
+                    'expires_in': current_app.config['PROFILING_TOKEN_SECONDS']}), 201
+
+@bp.route('/profiling/<profile_id>', methods=['GET'])
+@admin_required
+def get_profile(profile_id):
+    """One kept profile; ?format=json (default) | speedscope | pstats"""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Profile not found in this process'}), 404
+    fmt = request.args.get('format', 'json')
+    if fmt == 'json':
+        return jsonify(profile.to_dict()), 200
+    if fmt == 'speedscope':
+        body = current_app.json.dumps_bytes(profile.to_speedscope())
+        filename, mimetype = f'{profile_id}.speedscope.json', 'application/json'
+    elif fmt == 'pstats':
+        body = profile.to_pstats()
+        filename, mimetype = f'{profile_id}.pstats', 'application/octet-stream'
+    else:
+        return jsonify({'error': 'format must be json, speedscope or pstats'}), 400
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+@bp.route('/export/<table>', methods=['GET'])
+@admin_required
+def export_table(table):
+    """Stream a table as NDJSON; ?since_id= resumes, ?gzip=1 compresses"""
+    if table not in EXPORTS:
+        return jsonify({'error': f'Unknown export, expected one of {sorted(EXPORTS)}'}), 404
+    since_id = request.args.get('since_id', type=int)
+    limit = request.args.get('limit', type=int)
+
+    chunks = iter_ndjson(table, current_app.json.dumps_bytes, since_id=since_id, limit=limit)
+    filename = f'{table}.ndjson'
+    mimetype = 'application/x-ndjson'
+    if request.args.get('gzip', type=int):
+        chunks = gzip_chunks(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    response = current_app.response_class(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
@@ -1,12 +1,16 @@
 """Answers blueprint – nested under /api/questions/<id>/answers."""
-from flask import Blueprint, request
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..extensions import db
 from ..models.answer import Answer
-from ..models.question import Question
-from ..schemas.answer import AnswerSchema
-from ..utils import sanitize_html, error_response
+from ..serializers import ANSWER
+from ..services import live, mentions, summaries
+from ..services.content import ContentTooLarge, render_post
+from ..services.idempotency import idempotent
+from ..services.purge import soft_delete_answer
+from ..services.rbac import can_delete
+from ..utils import error_response
 
 bp = Blueprint(
     "answers",
@@ -14,8 +18,16 @@ bp = Blueprint(
     url_prefix="/questions/<int:q_id>/answers",  # note: parent question id in prefix
 )
 
-aschema = AnswerSchema()
-aschema_many = AnswerSchema(many=True)
+_aschema = None
+
+
+def answer_schema():
+    """marshmallow‑sqlalchemy is slow to import; build the schema on first use."""
+    global _aschema
+    if _aschema is None:
+        from ..schemas.answer import AnswerSchema
+        _aschema = AnswerSchema()
+    return _aschema
 
 
 # ───────────────────────────────────────────────────────────
@@ -23,22 +35,34 @@ aschema_many = AnswerSchema(many=True)
 # ───────────────────────────────────────────────────────────
 @bp.post("")
 @jwt_required()
+@idempotent
 def post_answer(q_id):
     # Ensure parent question exists
-    Question.query.get_or_404(q_id)
+    if not summaries.questions.get(q_id):
+        return error_response("Question not found", 404)
 
     user_id = get_jwt_identity()
     data = request.get_json(silent=True) or {}
-    data["content"] = sanitize_html(data.get("content", ""))
+    try:
+        data["content"], content_text = render_post(data.get("content", ""))
+    except ContentTooLarge:
+        return error_response("Content is too large", 413)
 
-    errors = aschema.validate(data)
+    # question / author come from the URL and the token, not the body
+    errors = answer_schema().validate(data, partial=("question_id", "user_id"))
     if errors:
         return error_response(errors, 400)
 
-    ans = Answer(content=data["content"], question_id=q_id, user_id=user_id)
+    ans = Answer(content=data["content"], content_text=content_text,
+                 question_id=q_id, user_id=user_id)
     db.session.add(ans)
     db.session.commit()
-    return aschema.jsonify(ans), 201
+    summaries.questions.invalidate(q_id)
+    mentions.notify_mentions(content_text, author_id=user_id, question_id=q_id)
+
+    live.publish(q_id, new_answer_id=ans.id,
+                 answer_count=Answer.query.filter_by(question_id=q_id, deleted_at=None).count())
+    return jsonify(ANSWER.obj(ans)), 201
 
 
 # ───────────────────────────────────────────────────────────
@@ -46,10 +70,29 @@ def post_answer(q_id):
 # ───────────────────────────────────────────────────────────
 @bp.get("")
 def list_answers(q_id):
-    Question.query.get_or_404(q_id)
-    answers = (
-        Answer.query.filter_by(question_id=q_id)
+    if not summaries.questions.get(q_id):
+        return error_response("Question not found", 404)
+    rows = db.session.execute(
+        ANSWER.select()
+        .where(Answer.question_id == q_id, Answer.deleted_at.is_(None))
         .order_by(Answer.created_at.asc())
-        .all()
-    )
-    return aschema_many.jsonify(answers), 200
+    ).all()
+    return jsonify(ANSWER.many(rows)), 200
+
+
+# ───────────────────────────────────────────────────────────
+# DELETE /api/questions/<q_id>/answers/<answer_id>  (soft delete)
+# ───────────────────────────────────────────────────────────
+@bp.delete("/<int:answer_id>")
+@jwt_required()
+def delete_answer(q_id, answer_id):
+    answer = db.session.get(Answer, answer_id)
+    if answer is None or answer.question_id != q_id or answer.deleted_at is not None:
+        return error_response("Answer not found", 404)
+    if not can_delete(answer.user_id):
+        return error_response("Not allowed to delete this answer", 403)
+
+    purge = soft_delete_answer(answer)
+    summaries.questions.invalidate(q_id)
+    live.publish(q_id, answer_count=Answer.query.filter_by(question_id=q_id, deleted_at=None).count())
+    return jsonify({"message": "Answer deleted", "purge_job_id": purge.id}), 200
@@ -5,9 +5,10 @@ from flask_jwt_extended import (
     jwt_required,
     get_jwt_identity
 )
-from werkzeug.security import check_password_hash
+from sqlalchemy.exc import IntegrityError
 from ..extensions import db, limiter
 from ..models.user import User
+from ..services import mentions, summaries
 import re
 import traceback
 
@@ -18,6 +19,20 @@ def validate_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
+def duplicate_field_error(exc):
+    """Map a users unique‑violation to the matching 409 message.
+
+    None for any other integrity error – the caller re‑raises it.
+    """
+    diag = getattr(exc.orig, 'diag', None)  # psycopg2 exposes the constraint name
+    constraint = (getattr(diag, 'constraint_name', None) or str(exc.orig)).lower()
+    # users_email_key / ix_users_email_lower, or SQLite's "users.email"
+    if 'email' in constraint:
+        return 'Email already registered'
+    if 'username' in constraint:
+        return 'Username already taken'
+    return None
+
 def validate_password(password):
     """Validate password strength."""
     if len(password) < 8:
@@ -47,22 +62,26 @@ def register():
 
         if not validate_email(email):
             return jsonify({'error': 'Invalid email format'}), 400
+        if '@' in username:
+            return jsonify({'error': 'Username cannot contain "@"'}), 400
 
         is_valid, msg = validate_password(password)
         if not is_valid:
             return jsonify({'error': msg}), 400
 
-        # Unique constraints
-        if User.query.filter_by(email=email).first():
-            return jsonify({'error': 'Email already registered'}), 409
-        if User.query.filter_by(username=username).first():
-            return jsonify({'error': 'Username already taken'}), 409
-
-        # Create & commit
+        # Create & commit – uniqueness is left to the lower() indexes
         user = User(username=username, email=email, role='user')
         user.set_password(password)
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError as exc:
+            db.session.rollback()
+            message = duplicate_field_error(exc)
+            if message is None:
+                raise
+            return jsonify({'error': message}), 409
+        mentions.add(username)
 
         access_token = create_access_token(
             identity=user.id,
@@ -95,15 +114,18 @@ def login():
         if not identifier or not password:
             return jsonify({'error': 'Email/username and password required'}), 400
 
-        user = User.query.filter(
-            (User.email == identifier) | (User.username == identifier)
-        ).first()
+        user = User.find_by_login(identifier)
 
         if not user or not user.check_password(password):
             return jsonify({'error': 'Invalid credentials'}), 401
         if getattr(user, 'is_active', True) is False:
             return jsonify({'error': 'Account is deactivated'}), 401
 
+        # Transparently upgrade hashes made with old parameters
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+
         access_token = create_access_token(
             identity=user.id,
             additional_claims={'role': user.role, 'username': user.username}
@@ -118,6 +140,7 @@ def login():
         }), 200
 
     except Exception:
+        db.session.rollback()
         print("❌ Login Error:")
         traceback.print_exc()
         return jsonify({'error': 'Login failed'}), 500
@@ -127,8 +150,8 @@ def login():
 def refresh():
     """Refresh token."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    if not user or getattr(user, 'is_active', True) is False:
+    user = summaries.users.get(current_user_id)
+    if not user or not user.is_active:
         return jsonify({'error': 'User not found or inactive'}), 404
 
     new_access_token = create_access_token(
@@ -148,7 +171,7 @@ def logout():
 def get_current_user():
     """Get current user info."""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, current_user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     return jsonify({'user': user.to_dict()}), 200
@@ -3,11 +3,26 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..extensions import db
 from ..models.notification import Notification
+from ..serializers import NOTIFICATION
+from ..services.idempotency import idempotent
 from ..services.notifications import create_notification
+from ..services.partitions import retained_since
 
 bp = Blueprint("notifications", __name__, url_prefix="/notifications")
 
 
+def _retained():
+    """Bound on ``created_at`` matching the partitions retention keeps: on
+    PostgreSQL it prunes the expired months, and every kept row stays
+    readable."""
+    since = retained_since("notifications")
+    return db.true() if since is None else Notification.created_at >= since
+
+
+def _recent(user_id):
+    return db.and_(Notification.user_id == user_id, _retained())
+
+
 @bp.get("/")
 @jwt_required()
 def get_notifications():
@@ -15,24 +30,22 @@ def get_notifications():
     page    = int(request.args.get("page", 1))
     per     = int(request.args.get("limit", 10))
 
-    paged = (
-        Notification.query.filter_by(user_id=user_id)
+    page, per = max(page, 1), max(per, 1)
+
+    recent = _recent(user_id)
+    total = Notification.query.filter(recent).count()
+    rows  = db.session.execute(
+        NOTIFICATION.select()
+        .where(recent)
         .order_by(Notification.created_at.desc())
-        .paginate(page=page, per_page=per, error_out=False)
-    )
+        .limit(per)
+        .offset((page - 1) * per)
+    ).all()
 
     return jsonify(
         status="success",
-        data=[
-            {
-                "id": n.id,
-                "message": n.message,
-                "is_read": n.is_read,
-                "created_at": n.created_at.isoformat(),
-            }
-            for n in paged.items
-        ],
-        pagination=dict(page=paged.page, total_pages=paged.pages, total_items=paged.total),
+        data=NOTIFICATION.many(rows),
+        pagination=dict(page=page, total_pages=-(-total // per), total_items=total),
     )
 
 
@@ -40,7 +53,7 @@ def get_notifications():
 @jwt_required()
 def unread_count():
     user_id = get_jwt_identity()
-    count   = Notification.query.filter_by(user_id=user_id, is_read=False).count()
+    count   = Notification.query.filter(_recent(user_id), Notification.is_read.is_(False)).count()
     return jsonify(status="success", data={"unread": count})
 
 
@@ -48,7 +61,9 @@ def unread_count():
 @jwt_required()
 def mark_read(notif_id):
     user_id = get_jwt_identity()
-    notif   = Notification.query.get_or_404(notif_id)
+    notif   = Notification.query.filter(
+        Notification.id == notif_id, _retained()
+    ).first_or_404()
     if notif.user_id != user_id:
         return jsonify(status="error", error="unauthorized"), 403
     notif.is_read = True
@@ -58,6 +73,7 @@ def mark_read(notif_id):
 
 @bp.post("/")
 @jwt_required()
+@idempotent
 def create_notif():
     user_id = get_jwt_identity()
     data    = request.get_json(silent=True) or {}
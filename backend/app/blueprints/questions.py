@@ -1,17 +1,48 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from ..models.answer import Answer
 from ..models.question import Question
-from ..extensions import db
+from ..models.vote import Vote
+from ..extensions import db, limiter
+from ..serializers import ANSWER, QUESTION, QUESTION_DETAIL, stream_json_array
+from ..models.tag import Tag
+from ..services import mentions, similarity, summaries, views
+from ..services.jobs import enqueue
+from ..services.related import ensure_scheduled, related_for
+from ..services.content import ContentTooLarge, render_post
+from ..services.idempotency import idempotent
+from ..services.purge import soft_delete_question
+from ..services.rbac import can_delete
 
 bp = Blueprint("questions", __name__)
 
+# ?sort= for the listing; each order has a partial index over live rows
+SORTS = {
+    "newest": (Question.created_at.desc(),),
+    "views":  (Question.view_count.desc(), Question.id.desc()),
+}
+
+
 @bp.route("", methods=["GET"])
 def get_questions():
-    questions = Question.query.order_by(Question.created_at.desc()).all()
-    return jsonify({"questions": [q.to_dict() for q in questions]}), 200
+    sort = request.args.get("sort", "newest")
+    if sort not in SORTS:
+        return jsonify({"error": f"sort must be one of {sorted(SORTS)}"}), 400
+    stmt = (QUESTION.select()
+            .where(Question.deleted_at.is_(None))
+            .order_by(*SORTS[sort]))
+    if request.args.get("stream", type=int):
+        rows = db.session.execute(stmt.execution_options(yield_per=500))
+        return stream_json_array(rows, QUESTION, key="questions")
+    rows = db.session.execute(stmt).all()
+    return jsonify({"questions": QUESTION.many(rows)}), 200
+
+MAX_TAGS = 5
+
 
 @bp.route("", methods=["POST"])
 @jwt_required()
+@idempotent
 def post_question_safe():  # 💡 renamed to avoid endpoint name conflict
     try:
         data = request.get_json()
@@ -20,16 +51,37 @@ def post_question_safe():  # 💡 renamed to avoid endpoint name conflict
 
         if not title or not content:
             return jsonify({"error": "Title and content are required"}), 400
+        tag_names = data.get("tags") or []
+        if (not isinstance(tag_names, list) or len(tag_names) > MAX_TAGS
+                or not all(isinstance(t, str) and 0 < len(t.strip()) <= 50 for t in tag_names)):
+            return jsonify({"error": f"tags must be a list of up to {MAX_TAGS} names"}), 400
+
+        try:
+            content, content_text = render_post(content)
+        except ContentTooLarge:
+            return jsonify({"error": "Content is too large"}), 413
 
         user_id = get_jwt_identity()
 
-        question = Question(title=title, content=content, user_id=user_id)
+        question = Question(title=title, content=content,
+                            content_text=content_text, user_id=user_id,
+                            tags=Tag.ensure(tag_names))
+        # duplicate hints: questions like this one that already exist
+        similar = similarity.similar_questions(title, question.excerpt)
         db.session.add(question)
+        db.session.flush()
+        enqueue("related.update", {"question_id": question.id},
+                key=f"related:{question.id}",
+                delay=current_app.config["RELATED_UPDATE_DELAY"], commit=False)
+        ensure_scheduled(commit=False)        # keeps the periodic rebuild going
         db.session.commit()
+        similarity.index.add(question.id, title, question.excerpt)
+        mentions.notify_mentions(content_text, author_id=user_id, question_id=question.id)
 
         return jsonify({
             "message": "Question created",
-            "question": question.to_dict()
+            "question": question.to_dict(),
+            "similar": similar
         }), 201
 
     except Exception as e:
@@ -37,3 +89,157 @@ def post_question_safe():  # 💡 renamed to avoid endpoint name conflict
         traceback.print_exc()
         db.session.rollback()
         return jsonify({"error": "Failed to create question"}), 500
+
+
+@bp.route("/similar", methods=["GET"])
+@limiter.limit("120 per minute")
+def get_similar_questions():
+    """Near‑duplicates of a draft title, for as‑you‑type suggestions."""
+    title = (request.args.get("title") or "").strip()
+    if not title:
+        return jsonify({"error": "title is required"}), 400
+    limit = min(max(request.args.get("limit", 5, type=int), 1), 20)
+    return jsonify({"similar": similarity.similar_questions(title, limit=limit)}), 200
+
+
+@bp.route("/<int:question_id>/related", methods=["GET"])
+def get_related_questions(question_id):
+    """Precomputed neighbours by shared tags and co‑voters."""
+    if not summaries.questions.get(question_id):
+        return jsonify({"error": "Question not found"}), 404
+    return jsonify({"related": related_for(question_id)}), 200
+
+
+@bp.route("/<int:question_id>", methods=["DELETE"])
+@jwt_required()
+def delete_question(question_id):
+    """Soft delete now; answers, votes and tag links are purged by a job."""
+    question = db.session.get(Question, question_id)
+    if question is None or question.deleted_at is not None:
+        return jsonify({"error": "Question not found"}), 404
+    if not can_delete(question.user_id):
+        return jsonify({"error": "Not allowed to delete this question"}), 403
+
+    purge = soft_delete_question(question)
+    summaries.questions.invalidate(question_id)
+    similarity.index.remove(question_id)
+    return jsonify({"message": "Question deleted", "purge_job_id": purge.id}), 200
+
+
+# section -> field names it can be narrowed to (``question.title``)
+FULL_SECTIONS = {
+    "question": QUESTION_DETAIL.names,
+    "answers":  ANSWER.names,
+    "votes":    (),
+    "my_votes": (),
+    "authors":  (),
+}
+
+
+def parse_fields(raw):
+    """``fields=question.title,answers,votes`` → ``{section: subfields|None}``.
+
+    A bare section name selects all of its fields; without ``fields`` every
+    section is returned. Raises ValueError naming an unknown field.
+    """
+    if not raw:
+        return {name: None for name in FULL_SECTIONS}
+    wanted = {}
+    for item in raw.split(","):
+        section, _, sub = item.strip().partition(".")
+        if section not in FULL_SECTIONS or (sub and sub not in FULL_SECTIONS[section]):
+            raise ValueError(f"unknown field {item.strip()!r}")
+        current = wanted.get(section, set())
+        if current is None:
+            continue
+        if sub:
+            current.add(sub)
+            wanted[section] = current
+        else:
+            wanted[section] = None
+    return wanted
+
+
+def _projection(serializer, subfields):
+    return serializer if subfields is None else serializer.only(subfields)
+
+
+def _caller_id():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+@bp.route("/<int:question_id>/full", methods=["GET"])
+def get_question_full(question_id):
+    """Question, a page of answers, vote scores, caller votes and authors.
+
+    Built from a fixed number of set‑based queries regardless of how many
+    answers the page holds.
+    """
+    try:
+        wanted = parse_fields(request.args.get("fields"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    page     = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
+    body     = {}
+
+    q_ser = _projection(QUESTION_DETAIL, wanted.get("question", ()))
+    row = db.session.execute(
+        db.select(Question.user_id, Question.created_at, *q_ser.columns)
+        .where(Question.id == question_id, Question.deleted_at.is_(None))
+    ).first()
+    if row is None:
+        return jsonify({"error": "Question not found"}), 404
+    caller_id = _caller_id()
+    views.record(question_id, f"u:{caller_id}" if caller_id is not None
+                 else f"a:{request.remote_addr}|{request.user_agent.string}")
+    author_ids, since = {row[0]}, row[1]     # votes are no older than the question
+    if "question" in wanted:
+        body["question"] = q_ser(row[2:])
+
+    answer_ids = []
+    if wanted.keys() & {"answers", "votes", "my_votes", "authors"}:
+        a_ser = _projection(ANSWER, wanted.get("answers", ()))
+        rows = db.session.execute(
+            db.select(Answer.id, Answer.user_id, db.func.count().over(), *a_ser.columns)
+            .where(Answer.question_id == question_id, Answer.deleted_at.is_(None))
+            .order_by(Answer.created_at.asc(), Answer.id.asc())
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        ).all()
+        answer_ids = [r[0] for r in rows]
+        author_ids.update(r[1] for r in rows)
+        if "answers" in wanted:
+            if rows:
+                total = rows[0][2]
+            elif page == 1:
+                total = 0
+            else:
+                total = Answer.query.filter_by(question_id=question_id, deleted_at=None).count()
+            body["answers"] = {
+                "items": [a_ser(r[3:]) for r in rows],
+                "page": page,
+                "per_page": per_page,
+                "total": total,
+            }
+
+    if "votes" in wanted:
+        body["votes"] = Vote.get_vote_counts_many(question_id=question_id, answer_ids=answer_ids,
+                                                  since=since)
+
+    if "my_votes" in wanted:
+        body["my_votes"] = (
+            Vote.get_user_votes(caller_id, question_id=question_id, answer_ids=answer_ids,
+                                since=since)
+            if caller_id is not None else None
+        )
+
+    if "authors" in wanted:
+        authors = summaries.users.get_many(author_ids)
+        body["authors"] = {uid: {"id": uid, "username": a.username} for uid, a in authors.items()}
+
+    return jsonify(body), 200
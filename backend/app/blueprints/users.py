@@ -0,0 +1,27 @@
+"""Users blueprint – public per‑user views under /api/users."""
+from flask import Blueprint, jsonify, request
+
+from ..services import activity, summaries
+
+bp = Blueprint("users", __name__)
+
+
+@bp.get("/<int:user_id>/activity")
+def get_activity(user_id):
+    """User's questions, answers and votes received, newest first.
+
+    ``?cursor=`` continues from the previous page's ``next_cursor``.
+    """
+    if not summaries.users.get(user_id):
+        return jsonify({"error": "User not found"}), 404
+    limit  = min(max(request.args.get("limit", activity.DEFAULT_LIMIT, type=int), 1),
+                 activity.MAX_LIMIT)
+    cursor = request.args.get("cursor")
+
+    if cursor is None and limit == activity.DEFAULT_LIMIT:
+        return jsonify(activity.first_pages.get(user_id)), 200
+    try:
+        key = activity.decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    return jsonify(activity.activity_page(user_id, limit, key)), 200
@@ -5,6 +5,8 @@ from ..models.vote import Vote, VoteType
 from ..models.user import User
 from ..models.question import Question
 from ..models.answer import Answer
+from ..services import counters, live, summaries
+from ..services.idempotency import idempotent
 from datetime import datetime
 
 bp = Blueprint('votes', __name__)
@@ -20,6 +22,7 @@ def calculate_reputation_change(vote_type, is_question=True):
 @bp.route('/', methods=['POST'])
 @jwt_required()
 @limiter.limit("30 per minute")
+@idempotent
 def cast_vote():
     """Cast or update a vote"""
     try:
@@ -43,33 +46,37 @@ def cast_vote():
         
         # Get the target content and check ownership
         target_author_id = None
+        room_question_id = question_id
         if question_id:
-            question = Question.query.get(question_id)
+            question = summaries.questions.get(question_id)
             if not question:
                 return jsonify({'error': 'Question not found'}), 404
             target_author_id = question.author_id
+            since = question.created_at
             
         if answer_id:
             answer = Answer.query.get(answer_id)
-            if not answer:
+            if (not answer or answer.deleted_at is not None
+                    or not summaries.questions.get(answer.question_id)):
                 return jsonify({'error': 'Answer not found'}), 404
-            target_author_id = answer.author_id
+            target_author_id = answer.user_id
+            room_question_id = answer.question_id
+            since = answer.created_at
         
         # Prevent self-voting
         if target_author_id == current_user_id:
             return jsonify({'error': 'Cannot vote on your own content'}), 403
         
-        # Check for existing vote
-        existing_vote = Vote.query.filter_by(
-            user_id=current_user_id,
-            question_id=question_id,
-            answer_id=answer_id
-        ).first()
+        # Check for existing vote (under a per user/target lock on PostgreSQL)
+        Vote.lock_target(current_user_id, question_id, answer_id)
+        existing_vote = Vote.get_user_vote(current_user_id, question_id=question_id,
+                                           answer_id=answer_id, since=since)
         
         vote_type_enum = VoteType.UP if vote_type == 'up' else VoteType.DOWN
         action = None
         reputation_change = 0
         
+        old_type = existing_vote.vote_type if existing_vote else None
         if existing_vote:
             if existing_vote.vote_type == vote_type_enum:
                 # Remove vote (toggle off)
@@ -92,22 +99,33 @@ def cast_vote():
                 user_id=current_user_id,
                 question_id=question_id,
                 answer_id=answer_id,
+                recipient_id=target_author_id,
                 vote_type=vote_type_enum
             )
             reputation_change = calculate_reputation_change(vote_type_enum, bool(question_id))
             db.session.add(new_vote)
             action = 'created'
         
-        # Update target author's reputation
-        if reputation_change != 0:
-            target_author = User.query.get(target_author_id)
-            if target_author:
-                target_author.update_reputation(reputation_change)
-        
-        db.session.commit()
+        # Target score and author reputation: inline, or buffered (write-behind)
+        new_type = None if action == 'removed' else vote_type_enum
+        counters.record(question_id=question_id, answer_id=answer_id,
+                        author_id=target_author_id,
+                        score=counters.score_change(old_type, new_type),
+                        reputation=reputation_change)
+        counters.commit()
+        summaries.questions.invalidate(room_question_id)
+        summaries.users.invalidate(target_author_id)
         
         # Get updated vote counts
-        vote_counts = Vote.get_vote_counts(question_id=question_id, answer_id=answer_id)
+        vote_counts = Vote.get_vote_counts(question_id=question_id, answer_id=answer_id,
+                                           since=since)
+
+        # Push the new score to everyone viewing the question (coalesced)
+        if question_id:
+            live.publish(room_question_id, question_score=vote_counts['total'])
+        else:
+            live.publish(room_question_id, answer_id=answer_id,
+                         answer_score=vote_counts['total'])
         
         return jsonify({
             'action': action,
@@ -123,11 +141,11 @@ def cast_vote():
 def get_question_votes(question_id):
     """Get vote counts for a question"""
     try:
-        question = Question.query.get(question_id)
+        question = summaries.questions.get(question_id)
         if not question:
             return jsonify({'error': 'Question not found'}), 404
         
-        vote_counts = Vote.get_vote_counts(question_id=question_id)
+        vote_counts = Vote.get_vote_counts(question_id=question_id, since=question.created_at)
         
         return jsonify({
             'question_id': question_id,
@@ -142,10 +160,10 @@ def get_answer_votes(answer_id):
     """Get vote counts for an answer"""
     try:
         answer = Answer.query.get(answer_id)
-        if not answer:
+        if not answer or answer.deleted_at is not None:
             return jsonify({'error': 'Answer not found'}), 404
         
-        vote_counts = Vote.get_vote_counts(answer_id=answer_id)
+        vote_counts = Vote.get_vote_counts(answer_id=answer_id, since=answer.created_at)
         
         return jsonify({
             'answer_id': answer_id,
@@ -167,10 +185,12 @@ def get_user_vote():
         if not question_id and not answer_id:
             return jsonify({'error': 'Must specify question_id or answer_id'}), 400
         
+        question = summaries.questions.get(question_id) if question_id else None
         user_vote = Vote.get_user_vote(
             user_id=current_user_id,
             question_id=question_id,
-            answer_id=answer_id
+            answer_id=answer_id,
+            since=question.created_at if question else None
         )
         
         if user_vote:
@@ -0,0 +1,219 @@
+"""Flask CLI commands (``flask --app app <command>``)."""
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import click
+from flask.cli import AppGroup
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _import_times():
+    """Run ``python -X importtime`` on a fresh interpreter, return rows.
+
+    Each row is ``(module, self_us, cumulative_us)``.
+    """
+    code = "from app import create_app; create_app()"
+    # profile the serving path, not the CLI one (which also loads alembic)
+    env = {k: v for k, v in os.environ.items() if k != "FLASK_RUN_FROM_CLI"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise click.ClickException(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def register_cli(app):
+    @app.cli.command("startup-profile")
+    @click.option("--top", default=25, show_default=True, help="Rows to show.")
+    @click.option("--sort", "sort_key", type=click.Choice(["cumulative", "self"]),
+                  default="cumulative", show_default=True)
+    @click.option("--packages", is_flag=True, help="Aggregate self time per top‑level package.")
+    def startup_profile(top, sort_key, packages):
+        """Report per‑module import time of create_app() in a fresh process."""
+        rows = _import_times()
+        total_ms = sum(r[1] for r in rows) / 1000
+
+        if packages:
+            per_pkg = defaultdict(int)
+            for name, self_us, _ in rows:
+                per_pkg[name.split(".")[0]] += self_us
+            ranked = sorted(per_pkg.items(), key=lambda kv: kv[1], reverse=True)[:top]
+            click.echo(f"{'self ms':>10}  package")
+            for pkg, self_us in ranked:
+                click.echo(f"{self_us / 1000:>10.1f}  {pkg}")
+        else:
+            index = 2 if sort_key == "cumulative" else 1
+            ranked = sorted(rows, key=lambda r: r[index], reverse=True)[:top]
+            click.echo(f"{'self ms':>10}{'cum ms':>10}  module")
+            for name, self_us, cum_us in ranked:
+                click.echo(f"{self_us / 1000:>10.1f}{cum_us / 1000:>10.1f}  {name}")
+
+        click.echo(f"\n{len(rows)} modules, {total_ms:.1f} ms total import time")
+
+    jobs_cli = AppGroup("jobs", help="Background job queue (app.services.jobs).")
+    app.cli.add_command(jobs_cli)
+
+    @jobs_cli.command("worker")
+    @click.option("--threads", default=4, show_default=True, help="Thread pool size.")
+    @click.option("--poll", default=1.0, show_default=True, help="Idle poll interval (s).")
+    @click.option("--lease", default=300, show_default=True,
+                  help="Seconds before a running job is presumed dead and re‑queued.")
+    @click.option("--once", is_flag=True, help="Claim one batch, run it and exit.")
+    def jobs_worker(threads, poll, lease, once):
+        """Claim due jobs and run them until interrupted."""
+        from .services.jobs import Worker
+
+        worker = Worker(app, threads=threads, poll_interval=poll, lease_seconds=lease)
+        click.echo(f"worker {worker.worker_id}: {threads} threads")
+        try:
+            worker.run(once=once)
+        except KeyboardInterrupt:
+            worker.stop()
+
+    @jobs_cli.command("enqueue")
+    @click.argument("job_type")
+    @click.option("--payload", default="{}", help="JSON keyword arguments for the handler.")
+    @click.option("--key", default=None, help="Idempotency key.")
+    @click.option("--delay", default=0, help="Seconds before the job is due.")
+    def jobs_enqueue(job_type, payload, key, delay):
+        """Queue a job by type name."""
+        import json
+
+        from .services.jobs import enqueue
+
+        queued = enqueue(job_type, json.loads(payload), key=key, delay=delay)
+        click.echo(f"job {queued.id} {queued.status}")
+
+    @jobs_cli.command("stats")
+    def jobs_stats():
+        """Job counts per type and status."""
+        from .extensions import db
+        from .models.job import Job
+
+        rows = db.session.execute(
+            db.select(Job.type, Job.status, db.func.count())
+            .group_by(Job.type, Job.status).order_by(Job.type, Job.status)
+        ).all()
+        click.echo(f"{'type':<28}{'status':<10}{'count':>8}")
+        for type_, status, count in rows:
+            click.echo(f"{type_:<28}{status:<10}{count:>8}")
+
+    @app.cli.command("export")
+    @click.argument("table", type=click.Choice(["questions", "answers", "votes", "users"]))
+    @click.option("-o", "--output", type=click.Path(dir_okay=False), default="-",
+                  show_default=True, help="File to write ('-' for stdout).")
+    @click.option("--since-id", type=int, default=None, help="Only rows with a larger id.")
+    @click.option("--gzip", "compress", is_flag=True, help="Gzip the output.")
+    def export(table, output, since_id, compress):
+        """Dump TABLE as NDJSON (same format as /api/admin/export/<table>)."""
+        from .services.export import gzip_chunks, iter_ndjson
+
+        chunks = iter_ndjson(table, app.json.dumps_bytes, since_id=since_id)
+        if compress:
+            chunks = gzip_chunks(chunks)
+        with click.open_file(output, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+
+    similarity_cli = AppGroup("similarity", help="Near‑duplicate question index.")
+    app.cli.add_command(similarity_cli)
+
+    @similarity_cli.command("rebuild")
+    def similarity_rebuild():
+        """Hash every live question and write a fresh snapshot."""
+        from .services.similarity import index
+
+        index.reset()
+        added = index.catch_up()
+        saved = index.save()
+        click.echo(f"indexed {added} questions" + (f", snapshot {index.snapshot_path()}"
+                                                  if saved else ""))
+
+    @similarity_cli.command("query")
+    @click.argument("title")
+    @click.option("--limit", default=5, show_default=True)
+    def similarity_query(title, limit):
+        """Show questions similar to TITLE."""
+        from .services.similarity import index, similar_questions
+
+        index.build()                   # in the foreground: the CLI cannot wait for a lookup
+        for hit in similar_questions(title, limit=limit):
+            click.echo(f"{hit['score']:.3f}  #{hit['id']}  {hit['title']}")
+
+    related_cli = AppGroup("related", help="Precomputed related questions.")
+    app.cli.add_command(related_cli)
+
+    @related_cli.command("rebuild")
+    def related_rebuild():
+        """Recompute every question's related list in this process."""
+        from .services.related import rebuild, schedule_next
+
+        t0 = time.perf_counter()
+        count = rebuild()
+        click.echo(f"related lists for {count} questions in {time.perf_counter() - t0:.1f}s")
+        queued = schedule_next()
+        click.echo(f"next run: job {queued.id}" if queued else "periodic rebuilds are off")
+
+    @related_cli.command("show")
+    @click.argument("question_id", type=int)
+    def related_show(question_id):
+        """Print the stored related list of QUESTION_ID."""
+        from .services.related import related_for
+
+        for hit in related_for(question_id):
+            click.echo(f"{hit['score']:.3f}  #{hit['id']}  {hit['title']}")
+
+    votes_cli = AppGroup("votes", help="Vote score / reputation counters.")
+    app.cli.add_command(votes_cli)
+
+    @votes_cli.command("reconcile")
+    @click.option("--batch", default=1000, show_default=True)
+    def votes_reconcile(batch):
+        """Recompute scores and reputation from the votes table."""
+        from .services.counters import reconcile
+
+        t0 = time.perf_counter()
+        updated = reconcile(batch=batch)
+        click.echo(f"reconciled {updated} rows in {time.perf_counter() - t0:.1f}s")
+
+    partitions_cli = AppGroup("partitions", help="Monthly partitions (PostgreSQL).")
+    app.cli.add_command(partitions_cli)
+
+    @partitions_cli.command("maintain")
+    def partitions_maintain():
+        """Create upcoming months and drop those past retention."""
+        from .services.partitions import enabled, maintain, schedule_next
+
+        if not enabled():
+            click.echo("not PostgreSQL: tables are not partitioned")
+            return
+        for table, change in maintain().items():
+            click.echo(f"{table}: created {change['created'] or '-'}, "
+                       f"dropped {change['dropped'] or '-'}, "
+                       f"moved from default {change['moved'] or '-'}")
+        click.echo(f"next run: job {schedule_next().id}")
+
+    @partitions_cli.command("list")
+    def partitions_list():
+        """Attached partitions per table."""
+        from .services.partitions import PARTITIONED, enabled, partitions
+
+        if not enabled():
+            click.echo("not PostgreSQL: tables are not partitioned")
+            return
+        for table in PARTITIONED:
+            click.echo(f"{table}: {', '.join(name for _, name in partitions(table)) or '-'}")
@@ -0,0 +1,86 @@
+"""Supported worker models and the database pool each one gets.
+
+``ASYNC_MODE`` selects the whole stack – what ``wsgi.py`` patches, the
+gunicorn worker class (``gunicorn.conf.py``), Socket.IO's async mode and the
+pool sizing below:
+
+============  ===============  ======================  =========================
+ASYNC_MODE    gunicorn worker  requests per worker     DB pool (size + overflow)
+============  ===============  ======================  =========================
+threading     gthread          ``WORKER_THREADS``      threads + 2, no overflow
+gevent        gevent           ``WORKER_CONNECTIONS``  10 + 10
+eventlet      eventlet         ``WORKER_CONNECTIONS``  10 + 10
+============  ===============  ======================  =========================
+
+Threaded workers hold at most one connection per thread, plus the vote and
+view flushers. Green workers run far more requests than PostgreSQL has
+connections, so the pool is the throttle: greenlets past size + overflow
+wait up to ``DB_POOL_TIMEOUT`` on a (patched, cooperative) queue. That only
+works if the driver yields while a query runs – plain psycopg2 blocks the
+whole hub, so one slow query stalls every request in the worker. ``wsgi.py``
+installs psycogreen's wait callback for that, and :func:`check_driver`
+refuses to start a patched worker without it.
+"""
+import sys
+
+from sqlalchemy.engine import make_url
+
+MODES = {
+    #  mode        (gunicorn worker, green?)
+    "threading": ("gthread",  False),
+    "gevent":    ("gevent",   True),
+    "eventlet":  ("eventlet", True),
+}
+GREEN_POOL = (10, 10)
+FLUSHER_THREADS = 2             # counters.DeltaBuffer, views.ViewBuffer
+
+
+def is_green(mode) -> bool:
+    return MODES[mode][1]
+
+
+def default_pool(config) -> tuple:
+    """``(pool_size, max_overflow)`` for ``ASYNC_MODE`` before overrides."""
+    if is_green(config["ASYNC_MODE"]):
+        return GREEN_POOL
+    return config["WORKER_THREADS"] + FLUSHER_THREADS, 0
+
+
+def engine_options(config) -> dict:
+    """``SQLALCHEMY_ENGINE_OPTIONS`` matching the worker model."""
+    mode = config["ASYNC_MODE"]
+    if mode not in MODES:
+        raise ValueError(f"ASYNC_MODE must be one of {sorted(MODES)}, not {mode!r}")
+    if make_url(config["SQLALCHEMY_DATABASE_URI"]).get_backend_name() == "sqlite":
+        return {}                   # SQLite keeps Flask‑SQLAlchemy's own pool choice
+    size, overflow = default_pool(config)
+    return {
+        "pool_size":     config.get("DB_POOL_SIZE") or size,
+        "max_overflow":  overflow if config.get("DB_MAX_OVERFLOW") is None
+                         else config["DB_MAX_OVERFLOW"],
+        "pool_timeout":  config.get("DB_POOL_TIMEOUT", 10),
+        "pool_pre_ping": True,
+    }
+
+
+def monkey_patched(mode) -> bool:
+    """Whether *mode*'s library has patched ``socket`` in this process."""
+    if mode == "gevent" and "gevent.monkey" in sys.modules:
+        return sys.modules["gevent.monkey"].is_module_patched("socket")
+    if mode == "eventlet" and "eventlet.patcher" in sys.modules:
+        return sys.modules["eventlet.patcher"].is_monkey_patched("socket")
+    return False
+
+
+def check_driver(config) -> None:
+    """Fail fast when a patched worker would use a blocking psycopg2."""
+    mode = config["ASYNC_MODE"]
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() != "postgresql" or url.get_driver_name() != "psycopg2":
+        return
+    if not monkey_patched(mode):
+        return                      # CLI, tests, threaded workers: blocking is fine
+    from psycopg2 import extensions
+    if extensions.get_wait_callback() is None:
+        raise RuntimeError(f"ASYNC_MODE={mode} with psycopg2 needs psycogreen's wait "
+                           f"callback; start the app through wsgi.py")
@@ -2,13 +2,25 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from flask_socketio import SocketIO
+
+from .services.ratelimit import rate_limit_key, under_local_budget
 
 # ORM / auth / rate‑limit
 db      = SQLAlchemy()
 jwt     = JWTManager()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=rate_limit_key)   # storage: RATELIMIT_STORAGE_URI
+limiter.request_filter(under_local_budget)
+
+# WebSocket (used by notifications blueprint/service). flask_socketio pulls in
+# python-socketio/engineio, so the instance is created on first access.
+_socketio = None
+
 
-# WebSocket (used by notifications blueprint/service)
-socketio = SocketIO(cors_allowed_origins="*")
+def __getattr__(name):
+    global _socketio
+    if name == "socketio":
+        if _socketio is None:
+            from flask_socketio import SocketIO
+            _socketio = SocketIO(cors_allowed_origins="*")
+        return _socketio
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,102 @@
+"""Dev‑only index advisor.
+
+Hooks SQLAlchemy execution, runs ``EXPLAIN`` once per distinct statement and
+records full scans of the tables expected to grow large. Enabled with
+``INDEX_ADVISOR=1`` (the test suite does this from ``tests/conftest.py`` and
+prints the findings at the end of the run).
+
+On PostgreSQL the plan is taken with ``enable_seqscan`` off (``SET LOCAL`` in
+a savepoint that is rolled back afterwards), so a sequential scan that
+survives means no usable index exists – tiny test tables would otherwise
+always be seq‑scanned. On SQLite a bare ``SCAN <table>`` (no index)
+is flagged.
+"""
+import re
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import event
+
+LARGE_TABLES = {"users", "questions", "answers", "votes", "notifications"}
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+@dataclass(frozen=True)
+class Finding:
+    table: str
+    detail: str
+    statement: str
+
+
+def _pg_seq_scans(node):
+    if node.get("Node Type") == "Seq Scan":
+        table = node.get("Relation Name")
+        yield table, f"Seq Scan on {table}"
+    for child in node.get("Plans", ()):
+        yield from _pg_seq_scans(child)
+
+
+class IndexAdvisor:
+    def __init__(self, tables=LARGE_TABLES, ignore=()):
+        self.tables   = set(tables)
+        self.ignore   = [re.compile(p) for p in ignore]
+        self.findings = []
+        self._seen    = set()
+        self._local   = threading.local()
+
+    def install(self, engine) -> None:
+        if not event.contains(engine, "after_cursor_execute", self._after_execute):
+            event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def reset(self) -> None:
+        self.findings.clear()
+        self._seen.clear()
+
+    # ── hook ────────────────────────────────────────────────
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or getattr(self._local, "busy", False):
+            return
+        if statement.lstrip()[:6].upper() not in ("SELECT", "UPDATE", "DELETE"):
+            return
+        if statement in self._seen or any(p.search(statement) for p in self.ignore):
+            return
+        self._seen.add(statement)
+
+        self._local.busy = True
+        try:
+            scans = self._explain(conn, statement, parameters)
+        except Exception:
+            scans = []           # statement EXPLAIN cannot handle – not our call
+        finally:
+            self._local.busy = False
+
+        for table, detail in scans:
+            if table in self.tables:
+                self.findings.append(Finding(table, detail, " ".join(statement.split())))
+
+    def _explain(self, conn, statement, parameters):
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            return [(m.group(1), row[-1]) for row in rows
+                    if (m := _SQLITE_SCAN.match(row[-1]))]
+        if dialect == "postgresql":
+            # inside a savepoint that is always rolled back: a failing EXPLAIN
+            # cannot abort the caller's transaction, and SET LOCAL goes with it
+            savepoint = conn.begin_nested()
+            try:
+                conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement,
+                                            parameters).scalar()
+            finally:
+                savepoint.rollback()
+            return list(_pg_seq_scans(plan[0]["Plan"]))
+        return []
+
+    # ── reporting ───────────────────────────────────────────
+    def report(self) -> list:
+        return [f"{f.detail}: {f.statement}" for f in self.findings]
+
+
+advisor = IndexAdvisor()
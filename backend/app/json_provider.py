@@ -0,0 +1,39 @@
+"""Flask JSON provider backed by orjson, with the stdlib provider as fallback."""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover – orjson is optional
+    orjson = None
+
+# datetimes still go through Flask's default() so their format is unchanged
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # key order carries no meaning for clients and sorting costs per dict
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS).decode()
+
+    def dumps_bytes(self, obj) -> bytes:
+        """Compact UTF‑8 encoding, skipping the str round trip when possible."""
+        if orjson is None:
+            return super().dumps(obj, separators=(",", ":")).encode()
+        return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
@@ -6,16 +6,25 @@ Do NOT import Flask extensions, blueprints, etc. – only models.
 from .user         import User           # noqa: F401
 from .question     import Question       # noqa: F401
 from .answer       import Answer         # noqa: F401
-from .tag          import Tag            # noqa: F401
+from .tag          import Tag, question_tags  # noqa: F401
 from .vote         import Vote, VoteType # noqa: F401
 from .notification import Notification   # noqa: F401
+from .job          import Job            # noqa: F401
+from .audit        import AdminAudit     # noqa: F401
+from .related      import RelatedQuestion  # noqa: F401
+from .vote_delta   import VoteDelta      # noqa: F401
 
 __all__ = [
     "User",
     "Question",
     "Answer",
     "Tag",
+    "question_tags",
     "Vote",
     "VoteType",
     "Notification",
+    "Job",
+    "AdminAudit",
+    "RelatedQuestion",
+    "VoteDelta",
 ]
@@ -4,9 +4,24 @@ class Answer(db.Model):
     __tablename__ = "answers"
 
     id          = db.Column(db.Integer, primary_key=True)
-    content     = db.Column(db.Text, nullable=False)
+    content     = db.Column(db.Text, nullable=False)   # sanitized HTML
+    content_text = db.Column(db.Text)                  # plain‑text rendering
     question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), nullable=False)
     user_id     = db.Column(db.Integer, db.ForeignKey("users.id"),     nullable=False)
     created_at  = db.Column(db.DateTime, server_default=db.func.now())
+    deleted_at  = db.Column(db.DateTime)               # soft delete; purged later
+    score       = db.Column(db.Integer, nullable=False, default=0,
+                            server_default="0")        # up − down; app.services.counters
 
     votes = db.relationship("Vote", backref="answer", lazy=True)
+
+    __table_args__ = (
+        # answers of a question, in display order
+        db.Index("ix_answers_question_id_created_at", "question_id", "created_at"),
+        # same for live answers only, what every listing reads
+        db.Index("ix_answers_live_question_id_created_at", "question_id", "created_at",
+                 postgresql_where=db.text("deleted_at IS NULL"),
+                 sqlite_where=db.text("deleted_at IS NULL")),
+        # a user's answers newest first (activity feed, author lookups)
+        db.Index("ix_answers_user_id_created_at", "user_id", "created_at"),
+    )
@@ -0,0 +1,23 @@
+"""AdminAudit model – one row per admin batch action, not per affected row."""
+from ..extensions import db
+from datetime import datetime, timezone
+
+
+class AdminAudit(db.Model):
+    __tablename__ = "admin_audit"
+
+    id           = db.Column(db.Integer, primary_key=True)
+    actor_id     = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    action       = db.Column(db.String(64), nullable=False)
+    criteria     = db.Column(db.JSON, nullable=False, default=dict)   # ids / filters given
+    changes      = db.Column(db.JSON, nullable=False, default=dict)   # values set
+    affected_ids = db.Column(db.JSON, nullable=False, default=list)
+    created_at   = db.Column(
+        db.DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:           # pragma: no cover
+        return f"<AdminAudit {self.id} {self.action} by={self.actor_id}>"
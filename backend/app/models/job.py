@@ -0,0 +1,35 @@
+"""Job model – one row per deferred unit of work (see services/jobs.py)."""
+from ..extensions import db
+from datetime import datetime, timezone
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+
+    QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+    id           = db.Column(db.Integer, primary_key=True)
+    type         = db.Column(db.String(64),  nullable=False)
+    key          = db.Column(db.String(255), unique=True)        # idempotency key
+    payload      = db.Column(db.JSON, nullable=False, default=dict)
+    status       = db.Column(db.String(16), nullable=False, default=QUEUED)
+    attempts     = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at       = db.Column(db.DateTime, nullable=False, default=_now)
+    locked_at    = db.Column(db.DateTime)
+    locked_by    = db.Column(db.String(64))
+    last_error   = db.Column(db.Text)
+    created_at   = db.Column(db.DateTime, nullable=False, default=_now)
+    finished_at  = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # the worker's poll: queued jobs that are due, oldest first
+        db.Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    def __repr__(self) -> str:           # pragma: no cover
+        return f"<Job {self.id} {self.type} {self.status}>"
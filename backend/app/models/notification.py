@@ -12,12 +12,22 @@ class Notification(db.Model):
                           nullable=False)
     message   = db.Column(db.String(255), nullable=False)
     is_read   = db.Column(db.Boolean, default=False, nullable=False)
+    # partition key on PostgreSQL (monthly, see services/partitions.py);
+    # the primary key there is (id, created_at)
     created_at = db.Column(
         db.DateTime,
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
 
+    __table_args__ = (
+        # listing (newest first) and the unread counter
+        db.Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_notifications_user_unread", "user_id",
+                 postgresql_where=db.text("is_read = false"),
+                 sqlite_where=db.text("is_read = false")),
+    )
+
     # convenience repr
     def __repr__(self) -> str:           # pragma: no cover
         return f"<Notification {self.id} user={self.user_id}>"
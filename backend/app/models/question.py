@@ -1,5 +1,9 @@
 from ..extensions import db
+from ..utils import excerpt
 from datetime import datetime
+from sqlalchemy.orm import deferred, validates
+
+EXCERPT_CHARS = 200
 
 
 class Question(db.Model):
@@ -7,14 +11,45 @@ class Question(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    content = db.Column(db.Text, nullable=False)        # sanitized HTML
+    content_text = db.Column(db.Text)                  # plain‑text rendering
+    excerpt = db.Column(db.String(EXCERPT_CHARS + 1))   # list views; set from content_text
+    content_length = db.Column(db.Integer)             # chars of content_text
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)                # soft delete; purged later
+    score = db.Column(db.Integer, nullable=False, default=0,
+                      server_default="0")              # up − down; app.services.counters
+    # app.services.views: flushed in bulk, never written by the read path
+    view_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    unique_viewers = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    viewers_hll = deferred(db.Column(db.LargeBinary))  # HyperLogLog sketch; loaded on access
 
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
     # ── Relationships ─────────────────────────────────────────
     answers = db.relationship("Answer", backref="question", lazy=True)
     votes = db.relationship("Vote", backref="question", lazy=True)
+    tags = db.relationship("Tag", secondary="question_tags", lazy=True)
+
+    __table_args__ = (
+        # newest‑first listing of live questions; deleted rows stay out of it
+        db.Index("ix_questions_live_created_at", "created_at",
+                 postgresql_where=db.text("deleted_at IS NULL"),
+                 sqlite_where=db.text("deleted_at IS NULL")),
+        # a user's questions newest first (activity feed, author lookups)
+        db.Index("ix_questions_user_id_created_at", "user_id", "created_at"),
+        # ?sort=views listing of live questions
+        db.Index("ix_questions_live_view_count", "view_count", "id",
+                 postgresql_where=db.text("deleted_at IS NULL"),
+                 sqlite_where=db.text("deleted_at IS NULL")),
+    )
+
+    @validates("content_text")
+    def _derive_summary(self, key, text):
+        """Keep the list‑view columns in step with the body on every write."""
+        self.excerpt = excerpt(text or "", EXCERPT_CHARS)
+        self.content_length = len(text or "")
+        return text
 
     def to_dict(self):
         """Serialize question object to dictionary."""
@@ -0,0 +1,17 @@
+"""RelatedQuestion model – precomputed top‑k neighbours per question."""
+from ..extensions import db
+
+
+class RelatedQuestion(db.Model):
+    __tablename__ = "related_questions"
+
+    # PK (question_id, rank) is the index the /related read walks, in order
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id", ondelete="CASCADE"),
+                            primary_key=True)
+    rank        = db.Column(db.SmallInteger, primary_key=True)
+    related_id  = db.Column(db.Integer, db.ForeignKey("questions.id", ondelete="CASCADE"),
+                            nullable=False, index=True)
+    score       = db.Column(db.Float, nullable=False)
+
+    def __repr__(self) -> str:           # pragma: no cover
+        return f"<RelatedQuestion {self.question_id}#{self.rank} -> {self.related_id}>"
@@ -1,6 +1,37 @@
+from importlib import import_module
+
 from ..extensions import db
 
+# created by the initial migration; PK (question_id, tag_id) serves per‑question reads
+question_tags = db.Table(
+    "question_tags",
+    db.Column("question_id", db.Integer, db.ForeignKey("questions.id"), primary_key=True),
+    db.Column("tag_id",      db.Integer, db.ForeignKey("tags.id"),      primary_key=True),
+    db.Index("ix_question_tags_tag_id", "tag_id"),
+)
+
+
 class Tag(db.Model):
     __tablename__ = "tags"
     id   = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
+
+    @classmethod
+    def ensure(cls, names):
+        """Tags for *names*, creating the missing ones.
+
+        New names are inserted with ``ON CONFLICT DO NOTHING`` and re‑selected,
+        so two posts introducing the same tag at once both get the one row.
+        """
+        names = sorted({n.strip().lower() for n in names if n and n.strip()})
+        if not names:
+            return []
+        found = {t.name: t for t in cls.query.filter(cls.name.in_(names))}
+        missing = [n for n in names if n not in found]
+        if missing:
+            dialect = import_module(f"sqlalchemy.dialects.{db.session.get_bind().dialect.name}")
+            db.session.execute(dialect.insert(cls)
+                               .values([{"name": n} for n in missing])
+                               .on_conflict_do_nothing(index_elements=["name"]))
+            found.update((t.name, t) for t in cls.query.filter(cls.name.in_(missing)))
+        return [found[n] for n in names]
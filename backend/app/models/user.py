@@ -1,5 +1,5 @@
 from ..extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from ..services.passwords import hash_password, needs_rehash, verify_password
 
 
 class User(db.Model):
@@ -8,8 +8,16 @@ class User(db.Model):
     id            = db.Column(db.Integer, primary_key=True)
     username      = db.Column(db.String(80),  unique=True, nullable=False)
     email         = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     role          = db.Column(db.String(20),  default="user")
+    reputation    = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    is_active     = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+
+    # Case‑insensitive uniqueness; also the indexes login lookups hit
+    __table_args__ = (
+        db.Index("ix_users_username_lower", db.func.lower(username), unique=True),
+        db.Index("ix_users_email_lower",    db.func.lower(email),    unique=True),
+    )
 
     # ── Relationships ─────────────────────────────────────────
     questions     = db.relationship("Question",      backref="author", lazy=True)
@@ -18,12 +26,37 @@ class User(db.Model):
     notifications = db.relationship("Notification",  backref="user",   lazy=True,
                                     cascade="all, delete-orphan")
 
+    # ── Lookups ───────────────────────────────────────────────
+    @classmethod
+    def find_by_login(cls, identifier: str):
+        """Fetch a user by email *or* username through the lower() indexes.
+
+        New usernames cannot contain "@", so the identifier decides which
+        index is tried first – no OR across both columns. Accounts created
+        before that rule may still have one, so an identifier with "@" that
+        matches no email is looked up as a username too.
+        """
+        identifier = identifier.strip().lower()
+        if "@" in identifier:
+            user = cls.query.filter(db.func.lower(cls.email) == identifier).first()
+            if user is not None:
+                return user
+        return cls.query.filter(db.func.lower(cls.username) == identifier).first()
+
     # ── Helpers ───────────────────────────────────────────────
     def set_password(self, raw_password: str) -> None:
-        self.password_hash = generate_password_hash(raw_password)
+        self.password_hash = hash_password(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
-        return check_password_hash(self.password_hash, raw_password)
+        return verify_password(self.password_hash, raw_password)
+
+    def password_needs_rehash(self) -> bool:
+        """Stored hash uses outdated algorithm / cost parameters."""
+        return needs_rehash(self.password_hash)
+
+    def update_reputation(self, delta: int) -> None:
+        """Apply *delta* in SQL so concurrent votes don't overwrite each other."""
+        self.reputation = User.reputation + delta
 
     def is_admin(self) -> bool:
         return self.role == "admin"
@@ -35,6 +68,8 @@ class User(db.Model):
             "username": self.username,
             "email": self.email,
             "role": self.role,
+            "reputation": self.reputation,
+            "is_active": self.is_active,
         }
 
     def __repr__(self) -> str:           # pragma: no cover
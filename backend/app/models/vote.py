@@ -1,7 +1,10 @@
 from ..extensions import db
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 
+# votes can't predate their target; the slack covers clock skew between hosts
+PRUNE_SLACK = timedelta(days=1)
+
 class VoteType(Enum):
     UP = "up"
     DOWN = "down"
@@ -12,12 +15,21 @@ class Vote(db.Model):
     id          = db.Column(db.Integer, primary_key=True)
     vote_type   = db.Column(db.Enum(VoteType), nullable=False)
     user_id     = db.Column(db.Integer, db.ForeignKey("users.id"),      nullable=False)
-    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), nullable=True)
-    answer_id   = db.Column(db.Integer, db.ForeignKey("answers.id"),   nullable=True)
-    created_at  = db.Column(db.DateTime,  default=lambda: datetime.now(timezone.utc))
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), nullable=True, index=True)
+    answer_id   = db.Column(db.Integer, db.ForeignKey("answers.id"),   nullable=True, index=True)
+    # author of the voted post, copied at insert (a plain copy, no FK): the
+    # activity feed reads a user's received votes newest‑first straight off
+    # (recipient_id, created_at, id)
+    recipient_id = db.Column(db.Integer, nullable=True)
+    # partition key on PostgreSQL (monthly, see services/partitions.py)
+    created_at  = db.Column(db.DateTime,  default=lambda: datetime.now(timezone.utc),
+                            nullable=False)
     updated_at  = db.Column(db.DateTime,  default=lambda: datetime.now(timezone.utc),
                             onupdate=lambda: datetime.now(timezone.utc))
 
+    # On PostgreSQL the table is partitioned: its primary key is (id,
+    # created_at) and these unique constraints are plain indexes there –
+    # cast_vote takes Vote.lock_target before its existence check instead.
     __table_args__ = (
         db.UniqueConstraint("user_id", "question_id", name="uq_user_question_vote"),
         db.UniqueConstraint("user_id", "answer_id",   name="uq_user_answer_vote"),
@@ -26,6 +38,7 @@ class Vote(db.Model):
             "(question_id IS NULL AND answer_id IS NOT NULL)",
             name="vote_target_check",
         ),
+        db.Index("ix_votes_recipient_created_at", "recipient_id", "created_at", "id"),
     )
 
     @property
@@ -34,33 +47,99 @@ class Vote(db.Model):
         return 1 if self.vote_type == VoteType.UP else -1
     
     @classmethod
-    def get_vote_counts(cls, question_id=None, answer_id=None):
-        """Get vote counts for question or answer"""
+    def lock_target(cls, user_id, question_id=None, answer_id=None):
+        """Serialise one user's votes on one target until commit (PostgreSQL).
+
+        Stands in for the unique constraints a partitioned table can't have;
+        elsewhere those constraints exist and this is a no‑op.
+        """
+        if db.session.get_bind().dialect.name != "postgresql":
+            return
+        target = question_id if question_id else -answer_id
+        db.session.execute(db.select(db.func.pg_advisory_xact_lock(user_id, target)))
+
+    @classmethod
+    def get_vote_counts(cls, question_id=None, answer_id=None, since=None):
+        """Get vote counts for question or answer (aggregated in SQL)"""
         if question_id:
-            query = cls.query.filter_by(question_id=question_id)
+            return cls.get_vote_counts_many(question_id=question_id, since=since)["question"]
         elif answer_id:
-            query = cls.query.filter_by(answer_id=answer_id)
-        else:
-            return {"upvotes": 0, "downvotes": 0, "total": 0}
-        
-        votes = query.all()
-        upvotes = sum(1 for vote in votes if vote.vote_type == VoteType.UP)
-        downvotes = sum(1 for vote in votes if vote.vote_type == VoteType.DOWN)
-        
-        return {
-            "upvotes": upvotes,
-            "downvotes": downvotes,
-            "total": upvotes - downvotes
-        }
+            return cls.get_vote_counts_many(answer_ids=[answer_id],
+                                            since=since)["answers"][answer_id]
+        return {"upvotes": 0, "downvotes": 0, "total": 0}
     
     @classmethod
-    def get_user_vote(cls, user_id, question_id=None, answer_id=None):
+    def _target_filter(cls, question_id=None, answer_ids=(), since=None):
+        """Target clause; *since* (the target's creation time) lets
+        PostgreSQL skip the monthly partitions older than it."""
+        clauses = []
+        if question_id:
+            clauses.append(cls.question_id == question_id)
+        if answer_ids:
+            clauses.append(cls.answer_id.in_(answer_ids))
+        if not clauses:
+            return None
+        target = db.or_(*clauses)
+        if since is not None:
+            target = db.and_(target, cls.created_at >= since - PRUNE_SLACK)
+        return target
+
+    @classmethod
+    def get_vote_counts_many(cls, question_id=None, answer_ids=(), since=None):
+        """Vote counts for a question and a set of answers in one grouped query.
+
+        Returns ``{"question": counts, "answers": {answer_id: counts}}``.
+        """
+        empty = {"upvotes": 0, "downvotes": 0, "total": 0}
+        result = {"question": dict(empty), "answers": {a: dict(empty) for a in answer_ids}}
+        target = cls._target_filter(question_id, answer_ids, since)
+        if target is None:
+            return result
+
+        up   = db.func.sum(db.case((cls.vote_type == VoteType.UP, 1), else_=0))
+        down = db.func.sum(db.case((cls.vote_type == VoteType.DOWN, 1), else_=0))
+        rows = db.session.execute(
+            db.select(cls.question_id, cls.answer_id, up, down)
+            .where(target)
+            .group_by(cls.question_id, cls.answer_id)
+        )
+        for q_id, a_id, upvotes, downvotes in rows:
+            counts = {"upvotes": upvotes, "downvotes": downvotes, "total": upvotes - downvotes}
+            if q_id is not None:
+                result["question"] = counts
+            else:
+                result["answers"][a_id] = counts
+        return result
+
+    @classmethod
+    def get_user_votes(cls, user_id, question_id=None, answer_ids=(), since=None):
+        """User's vote types for a question and a set of answers in one query."""
+        result = {"question": None, "answers": {}}
+        target = cls._target_filter(question_id, answer_ids, since)
+        if target is None:
+            return result
+
+        rows = db.session.execute(
+            db.select(cls.question_id, cls.answer_id, cls.vote_type)
+            .where(cls.user_id == user_id, target)
+        )
+        for q_id, a_id, vote_type in rows:
+            if q_id is not None:
+                result["question"] = vote_type.value
+            else:
+                result["answers"][a_id] = vote_type.value
+        return result
+
+    @classmethod
+    def get_user_vote(cls, user_id, question_id=None, answer_id=None, since=None):
         """Get user's vote for specific question or answer"""
         query = cls.query.filter_by(user_id=user_id)
         if question_id:
             query = query.filter_by(question_id=question_id)
         elif answer_id:
             query = query.filter_by(answer_id=answer_id)
+        if since is not None:
+            query = query.filter(cls.created_at >= since - PRUNE_SLACK)
         
         return query.first()
     
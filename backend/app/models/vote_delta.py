@@ -0,0 +1,30 @@
+"""VoteDelta model – counter changes of committed votes not yet applied.
+
+Write‑behind votes insert their score / reputation deltas here in the vote's
+own transaction; the flusher moves them onto the counter rows and deletes
+them in one transaction (app/services/counters.py).
+"""
+from ..extensions import db
+
+
+class VoteDelta(db.Model):
+    __tablename__ = "vote_deltas"
+
+    id     = db.Column(db.Integer, primary_key=True)
+    target = db.Column(db.String(16), nullable=False)      # questions | answers | users
+    row_id = db.Column(db.Integer, nullable=False)
+    delta  = db.Column(db.Integer, nullable=False)
+
+    # reconcile sums pending deltas per counter row
+    __table_args__ = (db.Index("ix_vote_deltas_target_row", "target", "row_id"),)
+
+    @classmethod
+    def pending_for(cls, target, model):
+        """Correlated sum of unapplied deltas for the outer *model* row."""
+        return (db.select(db.func.coalesce(db.func.sum(cls.delta), 0))
+                .where(cls.target == target, cls.row_id == model.id)
+                .correlate(model)
+                .scalar_subquery())
+
+    def __repr__(self) -> str:           # pragma: no cover
+        return f"<VoteDelta {self.target}:{self.row_id} {self.delta:+d}>"
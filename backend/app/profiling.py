@@ -0,0 +1,342 @@
+"""On‑demand request profiling for admins.
+
+A request is profiled when it carries a valid ``X-Profile-Token`` (signed by
+``POST /api/admin/profiling/token``, valid ``PROFILING_TOKEN_SECONDS``) or,
+while profiling is switched on with ``PUT /api/admin/profiling``, when it
+matches the path prefix and wins the ``sample_rate`` draw.
+
+Profiling is sampling, not tracing: one daemon OS thread wakes every
+``PROFILING_INTERVAL_MS`` and records the Python stack of each profiled
+request, weighted by the wall time since that request's previous sample.
+The request itself only pays for the SQL hooks – each statement's text,
+start offset and duration – and unprofiled requests pay one dict lookup per
+statement. Under eventlet / gevent workers a request is a greenlet: the
+sampler reads a suspended greenlet's ``gr_frame`` and the OS thread's frame
+(``sys._current_frames``) for the one running, and it is started, locked and
+put to sleep with the unpatched primitives so it really runs beside the hub.
+
+Finished profiles go to a ring buffer of the last ``PROFILING_KEEP`` and are
+downloadable as JSON (hot frames and SQL), a speedscope file (the sampled
+call tree plus an evented "SQL" lane) or a marshalled ``pstats`` file, where
+call counts are sample counts. Settings and the buffer are per process;
+profile ids carry the pid, so with several workers fetch a profile from the
+worker named in its ``X-Profile-Id``.
+"""
+import itertools
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from importlib import import_module
+
+from flask import current_app, g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import event
+
+from .extensions import db
+
+HEADER    = "X-Profile-Token"
+ID_HEADER = "X-Profile-Id"
+_SALT     = "profiling"
+_SKIP     = "/api/admin/profiling"       # never profile the profiler's own endpoints
+_SQL_MAX  = 2000
+
+
+def _native(module, name):
+    """*module.name* as it was before eventlet / gevent monkey‑patching."""
+    if "eventlet.patcher" in sys.modules:
+        from eventlet import patcher
+        if patcher.is_monkey_patched(module.lstrip("_")):
+            return getattr(patcher.original(module), name)
+    if "gevent.monkey" in sys.modules:
+        from gevent import monkey
+        return monkey.get_original(module, name)
+    return getattr(import_module(module), name)
+
+
+def _current_greenlet():
+    """The running greenlet when requests are greenlets, else None."""
+    if threading.get_ident is _native("_thread", "get_ident"):
+        return None
+    from greenlet import getcurrent
+    return getcurrent()
+
+
+class Profile:
+    """One profiled request: stack samples plus its SQL statements."""
+
+    def __init__(self, id, method, path, requested_by=None):
+        self.id           = id
+        self.method       = method
+        self.path         = path
+        self.requested_by = requested_by
+        self.started_at   = time.time()
+        self.started      = time.perf_counter()
+        self.frames       = {}                 # (file, line, name) -> index
+        self.samples      = Counter()          # stack of frame indexes, root first -> count
+        self.seconds      = Counter()          # stack -> wall time since the previous sample
+        self._last        = self.started
+        self.sql          = []                 # (offset ms, duration ms, statement, executemany)
+        self.duration_ms  = self.status = self.error = None
+
+    def sample(self, frame, now=None) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            index = self.frames.get(key)
+            if index is None:
+                index = self.frames[key] = len(self.frames)
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        now = time.perf_counter() if now is None else now
+        self.samples[tuple(stack)] += 1
+        self.seconds[tuple(stack)] += now - self._last
+        self._last = now
+
+    def meta(self) -> dict:
+        return {
+            "id": self.id, "method": self.method, "path": self.path,
+            "status": self.status, "error": self.error,
+            "started_at": self.started_at, "duration_ms": self.duration_ms,
+            "samples": sum(self.samples.values()),
+            "sql_count": len(self.sql),
+            "sql_ms": round(sum(s[1] for s in self.sql), 3),
+            "requested_by": self.requested_by,
+        }
+
+    # ── exports ─────────────────────────────────────────────
+    def hot_frames(self, limit=20) -> list:
+        own, total = Counter(), Counter()
+        for stack, seconds in self.seconds.items():
+            own[stack[-1]] += seconds
+            for index in set(stack):
+                total[index] += seconds
+        keys = list(self.frames)
+        return [{"file": keys[i][0], "line": keys[i][1], "name": keys[i][2],
+                 "self_ms": round(t * 1000, 3), "total_ms": round(total[i] * 1000, 3)}
+                for i, t in own.most_common(limit)]
+
+    def to_dict(self) -> dict:
+        return {**self.meta(), "hot": self.hot_frames(),
+                "sql": [{"offset_ms": o, "duration_ms": d, "statement": s, "executemany": m}
+                        for o, d, s, m in self.sql]}
+
+    def to_speedscope(self) -> dict:
+        frames = [{"name": name, "file": file, "line": line}
+                  for file, line, name in self.frames]
+        stacks = [(stack, seconds * 1000) for stack, seconds in self.seconds.items()]
+        profiles = [{
+            "type": "sampled", "name": f"{self.method} {self.path}", "unit": "milliseconds",
+            "startValue": 0, "endValue": sum(ms for _, ms in stacks),
+            "samples": [list(stack) for stack, _ in stacks],
+            "weights": [ms for _, ms in stacks],
+        }]
+        if self.sql:
+            events, sql_frames = [], {}
+            for offset, duration, statement, _ in self.sql:
+                index = sql_frames.get(statement)
+                if index is None:
+                    index = sql_frames[statement] = len(frames)
+                    frames.append({"name": "SQL " + statement[:120]})
+                events.append({"type": "O", "frame": index, "at": offset})
+                events.append({"type": "C", "frame": index, "at": offset + duration})
+            profiles.append({
+                "type": "evented", "name": "SQL", "unit": "milliseconds",
+                "startValue": 0, "endValue": max(self.duration_ms or 0, events[-1]["at"]),
+                "events": events,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path} ({self.id})",
+            "exporter": "stackit",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def to_pstats(self) -> bytes:
+        """``marshal`` dump loadable with ``pstats.Stats(path)``."""
+        keys = list(self.frames)
+        stats = {}
+        for stack, count in self.samples.items():
+            seconds, seen = self.seconds[stack], set()
+            for depth, index in enumerate(stack):
+                leaf = depth == len(stack) - 1
+                entry = stats.setdefault(keys[index], [0, 0, 0.0, 0.0, {}])
+                if index not in seen:                   # recursion counts once
+                    seen.add(index)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += seconds
+                if leaf:
+                    entry[2] += seconds
+                if depth:
+                    edge = entry[4].setdefault(keys[stack[depth - 1]], [0, 0, 0.0, 0.0])
+                    edge[0] += count
+                    edge[1] += count
+                    edge[2] += seconds if leaf else 0.0
+                    edge[3] += seconds
+        return marshal.dumps({
+            key: (nc, cc, tt, ct, {caller: tuple(edge) for caller, edge in callers.items()})
+            for key, (nc, cc, tt, ct, callers) in stats.items()
+        })
+
+
+class Profiler:
+    def __init__(self):
+        self._lock    = _native("_thread", "allocate_lock")()
+        self._active  = {}          # request thread/greenlet id -> (Profile, greenlet, OS thread id)
+        self._wakeup  = _native("_thread", "allocate_lock")()   # released when work arrives
+        self._wakeup.acquire()
+        self._idle    = True
+        self._started = False
+        self._ids     = itertools.count(1)
+        self.interval = 0.005
+        self.profiles = deque(maxlen=50)
+        self.reset()
+
+    def reset(self) -> None:
+        """Switch off and forget stored profiles (tests)."""
+        self.enabled     = False
+        self.sample_rate = 0.0
+        self.path_prefix = "/api/"
+        self.profiles.clear()
+
+    def settings(self) -> dict:
+        return {"enabled": self.enabled, "sample_rate": self.sample_rate,
+                "path_prefix": self.path_prefix, "interval_ms": self.interval * 1000,
+                "keep": self.profiles.maxlen, "pid": os.getpid()}
+
+    def configure(self, *, enabled=None, sample_rate=None, path_prefix=None) -> dict:
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if path_prefix is not None:
+            self.path_prefix = path_prefix
+        if enabled is not None:
+            self.enabled = enabled
+        return self.settings()
+
+    def get(self, profile_id):
+        return next((p for p in self.profiles if p.id == profile_id), None)
+
+    # ── tokens ──────────────────────────────────────────────
+    @staticmethod
+    def _serializer():
+        return URLSafeTimedSerializer(current_app.config["JWT_SECRET_KEY"], salt=_SALT)
+
+    def make_token(self, admin_id) -> str:
+        return self._serializer().dumps({"by": admin_id})
+
+    def _token_owner(self, token):
+        try:
+            return self._serializer().loads(
+                token, max_age=current_app.config.get("PROFILING_TOKEN_SECONDS", 900))["by"]
+        except (BadSignature, KeyError, TypeError):
+            return None
+
+    # ── wiring ──────────────────────────────────────────────
+    def init_app(self, app) -> None:
+        self.interval = app.config.get("PROFILING_INTERVAL_MS", 5) / 1000
+        keep = app.config.get("PROFILING_KEEP", 50)
+        if keep != self.profiles.maxlen:
+            self.profiles = deque(self.profiles, maxlen=keep)
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, "before_cursor_execute", self._before_sql):
+            event.listen(engine, "before_cursor_execute", self._before_sql)
+            event.listen(engine, "after_cursor_execute", self._after_sql)
+
+    def _wanted(self):
+        """``(profile?, requested_by)`` for the current request."""
+        token = request.headers.get(HEADER)
+        if token:
+            owner = self._token_owner(token)
+            return owner is not None, owner
+        return (self.enabled and request.path.startswith(self.path_prefix)
+                and not request.path.startswith(_SKIP)
+                and random.random() < self.sample_rate), None
+
+    def _before(self):
+        wanted, owner = self._wanted()
+        if not wanted:
+            return
+        profile = Profile(f"{os.getpid()}-{next(self._ids)}", request.method,
+                          request.path, owner)
+        g._profile = profile
+        entry = (profile, _current_greenlet(), _native("_thread", "get_ident")())
+        with self._lock:
+            self._active[threading.get_ident()] = entry
+            if self._idle:
+                self._idle = False
+                self._wakeup.release()
+            start, self._started = not self._started, True
+        if start:
+            # a real OS thread even under monkey‑patching (daemonic: never joined)
+            _native("_thread", "start_new_thread")(self._sample_loop, ())
+
+    def _after(self, response):
+        profile = g.get("_profile")
+        if profile is not None:
+            profile.status = response.status_code
+            response.headers[ID_HEADER] = profile.id
+        return response
+
+    def _teardown(self, exc):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+        profile.duration_ms = round((time.perf_counter() - profile.started) * 1000, 3)
+        if exc is not None:
+            profile.status, profile.error = 500, repr(exc)
+        self.profiles.append(profile)
+
+    def _sample_loop(self):
+        sleep = _native("time", "sleep")
+        while True:
+            with self._lock:
+                self._idle = not self._active
+            if self._idle:
+                self._wakeup.acquire()          # until _before has work again
+                continue
+            sleep(self.interval)
+            frames, now = sys._current_frames(), time.perf_counter()
+            with self._lock:
+                for profile, glet, os_thread in self._active.values():
+                    frame = None
+                    if glet is not None:
+                        if glet.dead:
+                            continue
+                        frame = glet.gr_frame       # None while it is the one running
+                    if frame is None:
+                        frame = frames.get(os_thread)
+                    if frame is not None:
+                        profile.sample(frame, now)
+            del frames
+
+    def _before_sql(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() in self._active:
+            conn.info.setdefault("profile_t0", []).append(time.perf_counter())
+
+    def _after_sql(self, conn, cursor, statement, parameters, context, executemany):
+        entry = self._active.get(threading.get_ident())
+        started = conn.info.get("profile_t0")
+        if entry is None or not started:
+            return
+        profile = entry[0]
+        t0 = started.pop()
+        profile.sql.append((round((t0 - profile.started) * 1000, 3),
+                            round((time.perf_counter() - t0) * 1000, 3),
+                            " ".join(statement.split())[:_SQL_MAX], executemany))
+
+
+profiler = Profiler()
@@ -1,11 +1,12 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from ..extensions import db
 from ..models.answer import Answer
-from ..utils import sanitize_html
 
 class AnswerSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = Answer
         load_instance = True
+        sqla_session = db.session
         include_fk = True
 
-    content = sanitize_html
\ No newline at end of file
+    # content arrives already sanitized by services.content.render_post
\ No newline at end of file
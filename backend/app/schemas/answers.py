@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..extensions import db
 from ..models.answer import Answer
 from ..schemas.answer import AnswerSchema
+from ..services.content import ContentTooLarge, render_post
 from ..utils import error_response
 
 answers_bp = Blueprint("answers", __name__)
@@ -17,7 +18,11 @@ def post_answer(q_id):
     errors = aschema.validate(data)
     if errors:
         return error_response(errors, 400)
-    ans = Answer(content=data["content"], question_id=q_id, user_id=user_id)
+    try:
+        content, content_text = render_post(data["content"])
+    except ContentTooLarge:
+        return error_response("Content is too large", 413)
+    ans = Answer(content=content, content_text=content_text, question_id=q_id, user_id=user_id)
     db.session.add(ans)
     db.session.commit()
     return aschema.jsonify(ans), 201
@@ -1,7 +1,6 @@
 from marshmallow import fields
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from ..models.question import Question
-from ..utils import sanitize_html
 
 class QuestionSchema(SQLAlchemyAutoSchema):
     class Meta:
@@ -9,10 +8,5 @@ class QuestionSchema(SQLAlchemyAutoSchema):
         load_instance = True
         include_fk = True
 
-    content = fields.Method("load_content", deserialize="dump_content")
-
-    def load_content(self, obj):
-        return obj.content
-
-    def dump_content(self, value):
-        return sanitize_html(value)
\ No newline at end of file
+    # Stored sanitized (services.content.render_post); never re‑cleaned on read
+    content = fields.String(required=True)
\ No newline at end of file
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..extensions import db
 from ..models.question import Question
 from ..schemas.question import QuestionSchema
+from ..services.content import ContentTooLarge, render_post
 from ..utils import error_response
 
 questions_bp = Blueprint("questions", __name__)
@@ -17,7 +18,11 @@ def create_question():
     errors = qschema.validate(data)
     if errors:
         return error_response(errors, 400)
-    q = Question(title=data["title"], content=data["content"], user_id=user_id)
+    try:
+        content, content_text = render_post(data["content"])
+    except ContentTooLarge:
+        return error_response("Content is too large", 413)
+    q = Question(title=data["title"], content=content, content_text=content_text, user_id=user_id)
     db.session.add(q)
     db.session.commit()
     return qschema.jsonify(q), 201
@@ -0,0 +1,153 @@
+"""Precompiled row serializers for list endpoints.
+
+``to_dict()`` and ``SQLAlchemyAutoSchema(many=True)`` walk model attributes
+object by object. A ``RowSerializer`` instead selects a fixed column list and
+turns each result tuple into a dict with a function generated once per shape.
+"""
+from flask import current_app, stream_with_context
+
+from .extensions import db
+from .models.answer import Answer
+from .models.notification import Notification
+from .models.question import Question
+from .models.user import User
+from .models.vote import Vote
+
+
+def iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def enum_value(value):
+    return value.value if value is not None else None
+
+
+class RowSerializer:
+    """Serialize ``(name, column[, converter])`` shaped rows by position."""
+
+    def __init__(self, *fields):
+        self.fields  = fields
+        self.names   = [f[0] for f in fields]
+        self.columns = [f[1] for f in fields]
+
+        namespace, items = {}, []
+        for i, field in enumerate(fields):
+            converter = field[2] if len(field) > 2 else None
+            if converter is None:
+                items.append(f"{field[0]!r}: row[{i}]")
+            else:
+                namespace[f"_c{i}"] = converter
+                items.append(f"{field[0]!r}: _c{i}(row[{i}])")
+        source = "def serialize(row):\n    return {" + ", ".join(items) + "}\n"
+        exec(source, namespace)
+        self._serialize = namespace["serialize"]
+
+    def __call__(self, row) -> dict:
+        return self._serialize(row)
+
+    def many(self, rows) -> list:
+        serialize = self._serialize
+        return [serialize(row) for row in rows]
+
+    def obj(self, instance) -> dict:
+        """Serialize an ORM instance (all columns must be mapped attributes)."""
+        return self._serialize(tuple(getattr(instance, c.key) for c in self.columns))
+
+    def select(self):
+        return db.select(*self.columns)
+
+    def only(self, names):
+        """Projection keeping the given field names (unknown names ignored)."""
+        wanted = set(names)
+        return RowSerializer(*(f for f in self.fields if f[0] in wanted))
+
+
+def stream_json_array(rows, serialize, key=None, chunk_size=500):
+    """Stream *rows* as a JSON array, optionally wrapped as ``{key: [...]}``.
+
+    Rows are encoded in chunks so memory stays flat however large the page;
+    pass a result created with ``yield_per`` to stream from the DB as well.
+    """
+    provider = current_app.json
+    dumps = getattr(provider, "dumps_bytes", None) or (lambda o: provider.dumps(o).encode())
+    head, tail = (b"[", b"]") if key is None else (dumps({key: []})[:-2], b"]}")
+
+    def generate():
+        yield head
+        batch, sep = [], b""
+        for row in rows:
+            batch.append(serialize(row))
+            if len(batch) >= chunk_size:
+                yield sep + dumps(batch)[1:-1]
+                batch, sep = [], b","
+        if batch:
+            yield sep + dumps(batch)[1:-1]
+        yield tail
+
+    return current_app.response_class(stream_with_context(generate()),
+                                      mimetype="application/json")
+
+
+# ── Model serializers ────────────────────────────────────────
+question_vote_count = (
+    db.select(db.func.count(Vote.id))
+    .where(Vote.question_id == Question.id)
+    .correlate(Question)
+    .scalar_subquery()
+)
+
+# list views: stored excerpt instead of the body (full content on detail routes)
+QUESTION = RowSerializer(
+    ("id",             Question.id),
+    ("title",          Question.title),
+    ("excerpt",        Question.excerpt),
+    ("content_length", Question.content_length),
+    ("user_id",        Question.user_id),
+    ("created_at",     Question.created_at, iso),
+    ("votes",          question_vote_count),
+    ("views",          Question.view_count),
+    ("unique_viewers", Question.unique_viewers),
+)
+
+QUESTION_DETAIL = RowSerializer(
+    ("id",         Question.id),
+    ("title",      Question.title),
+    ("content",    Question.content),
+    ("user_id",    Question.user_id),
+    ("created_at", Question.created_at, iso),
+    ("views",      Question.view_count),
+)
+
+ANSWER = RowSerializer(
+    ("id",          Answer.id),
+    ("content",     Answer.content),
+    ("question_id", Answer.question_id),
+    ("user_id",     Answer.user_id),
+    ("created_at",  Answer.created_at, iso),
+)
+
+VOTE = RowSerializer(
+    ("id",          Vote.id),
+    ("vote_type",   Vote.vote_type, enum_value),
+    ("user_id",     Vote.user_id),
+    ("question_id", Vote.question_id),
+    ("answer_id",   Vote.answer_id),
+    ("created_at",  Vote.created_at, iso),
+)
+
+NOTIFICATION = RowSerializer(
+    ("id",         Notification.id),
+    ("message",    Notification.message),
+    ("is_read",    Notification.is_read),
+    ("created_at", Notification.created_at, iso),
+)
+
+# never includes password_hash
+USER = RowSerializer(
+    ("id",         User.id),
+    ("username",   User.username),
+    ("email",      User.email),
+    ("role",       User.role),
+    ("reputation", User.reputation),
+    ("is_active",  User.is_active),
+)
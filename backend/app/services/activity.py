@@ -0,0 +1,135 @@
+"""Per‑user activity feed assembled on read.
+
+A user's questions, answers and the votes their posts received live in
+separate tables. Each source is read newest‑first with its own indexed
+``LIMIT`` query and the sorted streams are combined with ``heapq.merge``,
+so a page costs ``len(STREAMS)`` small queries however active the user is.
+
+Items are ordered by ``(created_at, stream, id)`` descending; the opaque
+cursor is that key of the last item returned. Legacy rows with a NULL
+``created_at`` have no place in that order and are left out. The cursorless first page is
+cached briefly (``ACTIVITY_CACHE_TTL``) since profile views hit it most.
+"""
+import base64
+import heapq
+import json
+from datetime import datetime
+
+from ..extensions import db
+from ..models.answer import Answer
+from ..models.question import Question
+from ..models.vote import Vote
+from .summaries import SummaryCache
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT     = 100
+
+
+def _questions(user_id):
+    return (db.select(Question.created_at, Question.id, Question.title)
+            .where(Question.user_id == user_id, Question.deleted_at.is_(None)),
+            Question.created_at, Question.id)
+
+
+def _answers(user_id):
+    return (db.select(Answer.created_at, Answer.id, Answer.question_id)
+            .where(Answer.user_id == user_id, Answer.deleted_at.is_(None)),
+            Answer.created_at, Answer.id)
+
+
+# votes are found by their denormalised recipient, so both streams walk
+# ix_votes_recipient_created_at in order; the join only drops deleted posts
+def _question_votes(user_id):
+    return (db.select(Vote.created_at, Vote.id, Vote.vote_type, Vote.question_id)
+            .join(Question, Question.id == Vote.question_id)
+            .where(Vote.recipient_id == user_id, Vote.question_id.is_not(None),
+                   Question.deleted_at.is_(None)),
+            Vote.created_at, Vote.id)
+
+
+def _answer_votes(user_id):
+    return (db.select(Vote.created_at, Vote.id, Vote.vote_type, Answer.question_id, Vote.answer_id)
+            .join(Answer, Answer.id == Vote.answer_id)
+            .where(Vote.recipient_id == user_id, Vote.answer_id.is_not(None),
+                   Answer.deleted_at.is_(None)),
+            Vote.created_at, Vote.id)
+
+
+# (name, query builder, row -> item) – position is the tie‑break rank
+STREAMS = [
+    ("question", _questions,
+     lambda r: {"type": "question", "id": r[1], "title": r[2]}),
+    ("answer", _answers,
+     lambda r: {"type": "answer", "id": r[1], "question_id": r[2]}),
+    ("question_vote", _question_votes,
+     lambda r: {"type": "vote", "id": r[1], "vote_type": r[2].value, "question_id": r[3]}),
+    ("answer_vote", _answer_votes,
+     lambda r: {"type": "vote", "id": r[1], "vote_type": r[2].value,
+                "question_id": r[3], "answer_id": r[4]}),
+]
+
+
+# ── cursor ────────────────────────────────────────────────
+def encode_cursor(key) -> str:
+    created_at, rank, id_ = key
+    raw = json.dumps([created_at.isoformat(), rank, id_]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """``(created_at, rank, id)``; raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, rank, id_ = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(rank), int(id_)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def _after(created_col, id_col, rank, cursor):
+    """Rows of stream *rank* that sort strictly after *cursor* (descending)."""
+    ts, c_rank, c_id = cursor
+    if rank < c_rank:
+        return created_col <= ts
+    if rank > c_rank:
+        return created_col < ts
+    return db.or_(created_col < ts, db.and_(created_col == ts, id_col < c_id))
+
+
+# ── feed ──────────────────────────────────────────────────
+def _stream(rank, user_id, limit, cursor):
+    name, build, to_item = STREAMS[rank]
+    stmt, created_col, id_col = build(user_id)
+    stmt = stmt.where(created_col.is_not(None))
+    if cursor is not None:
+        stmt = stmt.where(_after(created_col, id_col, rank, cursor))
+    rows = db.session.execute(
+        stmt.order_by(created_col.desc(), id_col.desc()).limit(limit)
+    ).all()
+    for row in rows:
+        yield (row[0], rank, row[1]), row, to_item
+
+
+def activity_page(user_id, limit=DEFAULT_LIMIT, cursor=None) -> dict:
+    """``{"items": [...], "next_cursor": str | None}`` for one page."""
+    # each stream can contribute the whole page, plus one row to detect more
+    streams = [_stream(rank, user_id, limit + 1, cursor) for rank in range(len(STREAMS))]
+    merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=True)
+
+    items, last_key = [], None
+    for key, row, to_item in merged:
+        if len(items) == limit:
+            return {"items": items, "next_cursor": encode_cursor(last_key)}
+        item = to_item(row)
+        item["created_at"] = key[0].isoformat()
+        items.append(item)
+        last_key = key
+    return {"items": items, "next_cursor": None}
+
+
+def _load_first_pages(user_ids) -> dict:
+    return {uid: activity_page(uid) for uid in user_ids}
+
+
+first_pages = SummaryCache("activity", _load_first_pages,
+                           "ACTIVITY_CACHE_SIZE", "ACTIVITY_CACHE_TTL")
@@ -0,0 +1,31 @@
+"""Sanitize‑on‑write pipeline for posted question / answer bodies.
+
+Content is cleaned exactly once, when it is written; the row stores both the
+safe HTML and a plain‑text rendering, and read paths serve them as stored.
+"""
+from flask import current_app
+
+from ..utils import html_to_text, run_blocking, sanitize_html
+
+
+class ContentTooLarge(ValueError):
+    """Posted body exceeds POST_MAX_CHARS."""
+
+
+def _render(raw: str) -> tuple:
+    html = sanitize_html(raw)
+    return html, html_to_text(html)
+
+
+def render_post(raw: str) -> tuple:
+    """Return ``(safe_html, plain_text)`` for a posted body.
+
+    Bodies over POST_OFFLOAD_CHARS are sanitized on the native thread pool so
+    a large post does not stall the green‑thread hub while html5lib parses it.
+    """
+    raw = raw or ""
+    if len(raw) > current_app.config.get("POST_MAX_CHARS", 100_000):
+        raise ContentTooLarge("content too large")
+    if len(raw) > current_app.config.get("POST_OFFLOAD_CHARS", 20_000):
+        return run_blocking(_render, raw)
+    return _render(raw)
@@ -0,0 +1,263 @@
+"""Vote score and reputation counters, optionally write‑behind.
+
+Every vote moves two counters: the target's ``score`` and its author's
+``reputation``. Written inline, a burst on one popular question makes every
+``cast_vote`` transaction queue on the same question and author rows.
+
+With ``VOTE_WRITE_BEHIND`` the vote's counter deltas are inserted into the
+``vote_deltas`` ledger in the vote's own transaction – an append, not an
+update of the hot row. A flusher thread in every web process claims ledger
+rows (``FOR UPDATE SKIP LOCKED`` on PostgreSQL), sums them per counter row
+and, in the same transaction, deletes them and applies one
+``UPDATE … SET x = x + :delta`` per row, in table / id order. It runs every
+``VOTE_BUFFER_FLUSH_MS`` and early once ``VOTE_BUFFER_MAX_DELTAS`` deltas
+were recorded by this process; requests never flush inline.
+
+A delta is therefore applied exactly once, whichever process flushes it,
+and nothing is lost with a crashed process. :func:`reconcile` recomputes
+scores and reputation from votes *minus the deltas still in the ledger*,
+after locking the rows it rewrites, so a flush landing after it adds those
+deltas onto the right total. The job re‑queues itself every
+``VOTE_RECONCILE_SECONDS`` as a safety net.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.answer import Answer
+from ..models.question import Question
+from ..models.user import User
+from ..models.vote import Vote, VoteType
+from ..models.vote_delta import VoteDelta
+from . import summaries
+from .jobs import enqueue, job
+from .reputation import recalculate
+
+log = logging.getLogger(__name__)
+
+_RECORDED = "vote_deltas_recorded"   # db.session.info key: ledger rows in this transaction
+
+# one executemany statement per counter column
+_TARGETS = {
+    "questions": (Question.__table__, "score"),
+    "answers":   (Answer.__table__,   "score"),
+    "users":     (User.__table__,     "reputation"),
+}
+
+
+def _increment(table, column):
+    return (db.update(table)
+            .where(table.c.id == db.bindparam("row_id"))
+            .values({column: table.c[column] + db.bindparam("delta")}))
+
+
+_STATEMENTS = {name: _increment(*target) for name, target in _TARGETS.items()}
+
+
+def score_change(old_type, new_type) -> int:
+    """Score delta for a vote going from *old_type* to *new_type* (None = no vote)."""
+    value = {VoteType.UP: 1, VoteType.DOWN: -1, None: 0}
+    return value[new_type] - value[old_type]
+
+
+def write_behind() -> bool:
+    return current_app.config.get("VOTE_WRITE_BEHIND", False)
+
+
+# ── request side ──────────────────────────────────────────
+def record(*, question_id=None, answer_id=None, author_id=None, score=0, reputation=0):
+    """Apply a vote's counter deltas inline, or add them to the ledger."""
+    deltas = [(name, row_id, delta) for name, row_id, delta in (
+        ("questions", question_id, score),
+        ("answers",   answer_id,   score),
+        ("users",     author_id,   reputation),
+    ) if row_id is not None and delta]
+    if write_behind():
+        if deltas:
+            db.session.execute(db.insert(VoteDelta), [
+                {"target": name, "row_id": row_id, "delta": delta}
+                for name, row_id, delta in deltas])
+            db.session.info[_RECORDED] = db.session.info.get(_RECORDED, 0) + len(deltas)
+        return
+    for name, row_id, delta in deltas:
+        db.session.execute(_STATEMENTS[name], [{"row_id": row_id, "delta": delta}])
+
+
+def commit() -> None:
+    """Commit the vote, then nudge the flusher; never flushes in the request."""
+    recorded = db.session.info.pop(_RECORDED, 0)
+    db.session.commit()
+    if not recorded:
+        return
+    try:                                     # the vote is committed: never fail it now
+        buffer.ensure_started(current_app._get_current_object())
+        buffer.note(recorded, current_app.config.get("VOTE_BUFFER_MAX_DELTAS", 500))
+    except Exception:
+        db.session.rollback()
+        log.exception("starting the vote counter flusher failed; deltas stay in the ledger")
+
+
+# ── flusher ───────────────────────────────────────────────
+class DeltaBuffer:
+    """Flushes the ``vote_deltas`` ledger onto the counter rows."""
+
+    def __init__(self):
+        self._lock       = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._app        = None              # set by the first write‑behind commit
+        self._stop       = None
+        self._wake       = threading.Event()
+        self.reset()
+
+    def reset(self) -> None:
+        """Stop the flusher thread and zero the metrics (tests)."""
+        with self._lock:
+            if self._stop is not None:
+                self._stop.set()
+                self._wake.set()
+            self._app = self._stop = None
+            self._wake = threading.Event()
+            self.recorded = 0                # deltas this process added since the last flush
+            self.flushes = self.rows_written = self.deltas_applied = 0
+
+    def note(self, count, limit) -> None:
+        with self._lock:
+            self.recorded += count
+            if self.recorded >= limit:
+                self._wake.set()
+
+    def flush(self, batch=5000) -> int:
+        """Apply up to *batch* ledger rows; returns counter rows written."""
+        with self._flush_lock:               # one flusher per process at a time
+            with self._lock:
+                self.recorded = 0
+            try:
+                claimed = db.session.execute(
+                    db.select(VoteDelta.id, VoteDelta.target, VoteDelta.row_id, VoteDelta.delta)
+                    .order_by(VoteDelta.id)
+                    .limit(batch)
+                    .with_for_update(skip_locked=True)   # other processes take the rest
+                ).all()
+                if not claimed:
+                    db.session.rollback()
+                    return 0
+                sums = Counter()
+                for _, name, row_id, delta in claimed:
+                    sums[name, row_id] += delta
+                per_table = {}
+                for (name, row_id), delta in sorted(sums.items()):
+                    if delta:
+                        per_table.setdefault(name, []).append({"row_id": row_id, "delta": delta})
+                db.session.execute(db.delete(VoteDelta).where(
+                    VoteDelta.id.in_([row.id for row in claimed])))
+                for name in _TARGETS:        # same table order in every process
+                    if name in per_table:
+                        db.session.execute(_STATEMENTS[name], per_table[name])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()        # the ledger rows stay for the next flush
+                raise
+            summaries.questions.invalidate(*(p["row_id"] for p in per_table.get("questions", ())))
+            summaries.users.invalidate(*(p["row_id"] for p in per_table.get("users", ())))
+            written = sum(map(len, per_table.values()))
+            self.flushes += 1
+            self.rows_written += written
+            self.deltas_applied += len(claimed)
+            return written
+
+    def ensure_started(self, app) -> None:
+        with self._lock:
+            if self._app is not None:
+                return
+            self._app, stop = app, threading.Event()
+            self._stop = stop
+        with app.app_context():
+            period = max(app.config.get("VOTE_RECONCILE_SECONDS", 3600), 1)
+            # starts the periodic reconcile cycle (one job per period)
+            enqueue("votes.reconcile", key=f"votes:reconcile:{int(time.time() // period)}")
+        threading.Thread(target=self._run, args=(app, stop, self._wake), name="vote-buffer",
+                         daemon=True).start()
+
+    def _run(self, app, stop, wake) -> None:
+        interval = app.config.get("VOTE_BUFFER_FLUSH_MS", 200) / 1000
+        while True:
+            wake.wait(interval)
+            wake.clear()
+            if stop.is_set():
+                return
+            try:
+                with app.app_context():
+                    self.flush()
+            except Exception:
+                log.exception("vote counter flush failed; deltas kept for the next one")
+
+    def metrics(self) -> dict:
+        pending = db.session.scalar(db.select(db.func.count()).select_from(VoteDelta))
+        with self._lock:
+            return {"pending": pending, "recorded": self.recorded,
+                    "flushes": self.flushes, "rows_written": self.rows_written,
+                    "deltas_applied": self.deltas_applied}
+
+
+buffer = DeltaBuffer()
+
+
+# ── reconciliation ────────────────────────────────────────
+def _vote_total(target_column, model):
+    return (db.select(db.func.coalesce(db.func.sum(
+                db.case((Vote.vote_type == VoteType.UP, 1), else_=-1)), 0))
+            .where(target_column == model.id)
+            .correlate(model)
+            .scalar_subquery())
+
+
+def _id_batches(model, batch):
+    """Primary‑key ranges of *model*, *batch* ids at a time."""
+    last = 0
+    while True:
+        ids = db.session.scalars(db.select(model.id).where(model.id > last)
+                                 .order_by(model.id).limit(batch)).all()
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+def reconcile(batch=1000) -> int:
+    """Recompute scores and reputation from votes; returns rows updated.
+
+    Works in primary‑key batches, committing each, so no long lock is held.
+    Each batch locks its rows first – a flush touching them waits, or is
+    waited for – and subtracts the deltas still in the ledger, which that
+    flush then applies.
+    """
+    updated = 0
+    for model, target_column, name in ((Question, Vote.question_id, "questions"),
+                                       (Answer, Vote.answer_id, "answers")):
+        total = _vote_total(target_column, model) - VoteDelta.pending_for(name, model)
+        for ids in _id_batches(model, batch):
+            db.session.execute(db.select(model.id).where(model.id.in_(ids))
+                               .order_by(model.id).with_for_update())
+            updated += db.session.execute(
+                db.update(model).where(model.id.in_(ids)).values(score=total),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            db.session.commit()
+    for ids in _id_batches(User, batch):
+        updated += recalculate(ids)
+    summaries.questions.clear()
+    summaries.users.clear()
+    return updated
+
+
+@job("votes.reconcile", concurrency=1, max_attempts=3)
+def reconcile_job():
+    reconcile()
+    period = current_app.config.get("VOTE_RECONCILE_SECONDS", 3600)
+    if write_behind() and period > 0:
+        enqueue("votes.reconcile", key=f"votes:reconcile:{int(time.time() // period) + 1}",
+                delay=period)
@@ -0,0 +1,52 @@
+"""NDJSON table exports for analytics (admin endpoints and ``flask export``).
+
+Rows are read in primary‑key order through ``yield_per`` (a server‑side
+cursor on PostgreSQL) as plain column tuples, so nothing accumulates in the
+session and memory stays flat however large the table. Every line carries
+its ``id``; pass the last one back as ``since_id`` to resume or to export
+only rows added since the previous run.
+"""
+import zlib
+
+from ..extensions import db
+from ..serializers import ANSWER, QUESTION_DETAIL, USER, VOTE
+
+EXPORTS = {
+    "questions": QUESTION_DETAIL,
+    "answers":   ANSWER,
+    "votes":     VOTE,
+    "users":     USER,
+}
+
+CHUNK_ROWS = 1000
+
+
+def export_statement(table, since_id=None, limit=None):
+    serializer = EXPORTS[table]
+    pk = serializer.columns[0]
+    stmt = serializer.select().order_by(pk)
+    if since_id is not None:
+        stmt = stmt.where(pk > since_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def iter_ndjson(table, dumps, since_id=None, limit=None, chunk_rows=CHUNK_ROWS):
+    """Yield NDJSON byte chunks of *chunk_rows* lines each."""
+    serialize = EXPORTS[table]
+    rows = db.session.execute(
+        export_statement(table, since_id, limit).execution_options(yield_per=chunk_rows)
+    )
+    for partition in rows.partitions():
+        yield b"".join(dumps(serialize(row)) + b"\n" for row in partition)
+
+
+def gzip_chunks(chunks, level=6):
+    """Incrementally gzip a byte stream (one member, flushed at the end)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)     # 31 = gzip wrapper
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
@@ -0,0 +1,213 @@
+"""``Idempotency-Key`` support for write endpoints.
+
+Clients that retry a POST on timeout send the same ``Idempotency-Key``
+header each time. :func:`idempotent` runs the view once per (caller, route,
+key) and answers repeats with the stored response – marked
+``Idempotent-Replayed: true`` – without touching the handler or the database.
+
+* Scope – keys are per caller (JWT identity, else address) and per path,
+  so two users can't collide and one key can't be replayed elsewhere.
+* Mismatch – reusing a key with a different body is a client bug: 422.
+* Coalescing – the first request claims the key (``pending``); concurrent
+  duplicates wait up to ``IDEMPOTENCY_WAIT_SECONDS`` for its response
+  (same process: an event; other processes: polling the store) and get
+  409 if it's still running.
+* What is stored – 2xx and 4xx responses, for ``IDEMPOTENCY_TTL`` seconds.
+  On 5xx or an exception the claim is released so a retry runs again.
+
+The store is chosen by ``IDEMPOTENCY_STORAGE_URI``: ``memory://`` (a
+bounded per‑process LRU, fine for one worker or sticky clients) or a
+``redis://`` URL shared by every worker.
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+from .ratelimit import rate_limit_key
+
+HEADER     = "Idempotency-Key"
+REPLAYED   = "Idempotent-Replayed"
+MAX_KEY    = 255
+_POLL      = 0.05
+PENDING    = "pending"
+
+
+# ── stores ────────────────────────────────────────────────
+class LocalStore:
+    """Bounded LRU of ``scope -> (expires_at, record)``."""
+
+    def __init__(self, maxsize=10_000):
+        self.maxsize  = maxsize
+        self._entries = OrderedDict()
+        self._lock    = threading.Lock()
+
+    def _live(self, scope, now):
+        entry = self._entries.get(scope)
+        if entry is None or entry[0] <= now:
+            self._entries.pop(scope, None)
+            return None
+        self._entries.move_to_end(scope)
+        return entry[1]
+
+    def claim(self, scope, fingerprint, ttl) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._live(scope, now) is not None:
+                return False
+            self._set(scope, {"state": PENDING, "fp": fingerprint}, ttl, now)
+            return True
+
+    def get(self, scope):
+        with self._lock:
+            return self._live(scope, time.monotonic())
+
+    def put(self, scope, record, ttl) -> None:
+        with self._lock:
+            self._set(scope, record, ttl, time.monotonic())
+
+    def release(self, scope) -> None:
+        with self._lock:
+            self._entries.pop(scope, None)
+
+    def _set(self, scope, record, ttl, now):
+        self._entries[scope] = (now + ttl, record)
+        self._entries.move_to_end(scope)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class RedisStore:
+    """Records as JSON under ``idem:<scope>``; claims use ``SET NX``."""
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _key(scope):
+        return f"idem:{scope}"
+
+    def claim(self, scope, fingerprint, ttl) -> bool:
+        record = json.dumps({"state": PENDING, "fp": fingerprint})
+        return bool(self.client.set(self._key(scope), record, nx=True, ex=max(int(ttl), 1)))
+
+    def get(self, scope):
+        raw = self.client.get(self._key(scope))
+        return json.loads(raw) if raw else None
+
+    def put(self, scope, record, ttl) -> None:
+        self.client.set(self._key(scope), json.dumps(record), ex=max(int(ttl), 1))
+
+    def release(self, scope) -> None:
+        self.client.delete(self._key(scope))
+
+
+def get_store():
+    store = current_app.extensions.get("idempotency")
+    if store is None:
+        uri = current_app.config.get("IDEMPOTENCY_STORAGE_URI", "memory://")
+        if uri.startswith(("redis://", "rediss://")):
+            store = RedisStore(uri)
+        else:
+            store = LocalStore(current_app.config.get("IDEMPOTENCY_CACHE_SIZE", 10_000))
+        current_app.extensions["idempotency"] = store
+    return store
+
+
+# ── coordination ──────────────────────────────────────────
+class KeyInProgress(Exception):
+    pass
+
+
+class KeyMismatch(Exception):
+    pass
+
+
+_inflight = {}                     # scope -> Event, for duplicates in this process
+_inflight_lock = threading.Lock()
+
+
+def _to_record(response, fingerprint):
+    return {"state": "done", "fp": fingerprint, "status": response.status_code,
+            "content_type": response.content_type,
+            "body": base64.b64encode(response.get_data()).decode()}
+
+
+def _from_record(record):
+    response = current_app.response_class(base64.b64decode(record["body"]),
+                                          status=record["status"],
+                                          content_type=record["content_type"])
+    response.headers[REPLAYED] = "true"
+    return response
+
+
+def run_once(scope, fingerprint, handler):
+    """Response of *handler* for *scope*, executing it at most once."""
+    config = current_app.config
+    store, ttl = get_store(), config.get("IDEMPOTENCY_TTL", 24 * 3600)
+    deadline = time.monotonic() + config.get("IDEMPOTENCY_WAIT_SECONDS", 10)
+
+    while True:
+        if store.claim(scope, fingerprint, config.get("IDEMPOTENCY_LOCK_SECONDS", 30)):
+            done = threading.Event()
+            with _inflight_lock:
+                _inflight[scope] = done
+            break
+        record = store.get(scope)
+        if record is not None:
+            if record["fp"] != fingerprint:
+                raise KeyMismatch
+            if record["state"] != PENDING:
+                return _from_record(record)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise KeyInProgress
+        with _inflight_lock:
+            waiting_on = _inflight.get(scope)
+        if waiting_on is not None:
+            waiting_on.wait(remaining)
+        else:
+            time.sleep(min(_POLL, remaining))   # running in another process
+
+    try:
+        response = current_app.make_response(handler())
+        if response.status_code < 500:
+            store.put(scope, _to_record(response, fingerprint), ttl)
+        else:
+            store.release(scope)
+        return response
+    except BaseException:
+        store.release(scope)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(scope, None)
+        done.set()
+
+
+def idempotent(view):
+    """Honour ``Idempotency-Key`` on *view* (place it below ``jwt_required``)."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_KEY:
+            return jsonify({"error": f"{HEADER} must be 1–{MAX_KEY} characters"}), 400
+
+        scope = f"{rate_limit_key()}:{request.method}:{request.path}:{key}"
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        try:
+            return run_once(scope, fingerprint, lambda: view(*args, **kwargs))
+        except KeyMismatch:
+            return jsonify({"error": f"{HEADER} was already used with a different request"}), 422
+        except KeyInProgress:
+            return jsonify({"error": f"A request with this {HEADER} is still in progress"}), 409
+    return wrapper
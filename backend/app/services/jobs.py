@@ -0,0 +1,225 @@
+"""In‑app background jobs backed by the ``jobs`` table – no external broker.
+
+Register a handler with ``@job("type", concurrency=2)`` and queue work with
+``enqueue("type", {...}, key="...")`` from a request; ``flask jobs worker``
+claims due rows and runs them on a thread pool.
+
+* Idempotent keys – enqueueing an existing ``key`` returns the existing job.
+* Retries – a failing job is re‑queued with exponential backoff until
+  ``max_attempts``, then marked failed with the last error.
+* Concurrency – at most ``concurrency`` jobs of one type run at once per
+  worker process.
+* Crash safety – ``running`` rows whose lease expired are re‑queued. A live
+  worker renews the lease of the jobs it is running every third of
+  ``lease_seconds``, so only a dead worker's jobs expire however long they
+  take.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from importlib import import_module
+
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models.job import Job, _now
+
+log = logging.getLogger(__name__)
+
+# modules whose @job handlers the worker must import before polling
+JOB_MODULES = [
+    "app.services.reputation",
+    "app.services.notifications",
+    "app.services.purge",
+    "app.services.related",
+    "app.services.counters",
+    "app.services.partitions",
+]
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    fn: callable
+    concurrency: int
+    max_attempts: int
+    backoff: float
+
+
+_registry = {}
+
+
+def job(name, *, concurrency=1, max_attempts=5, backoff=2.0):
+    """Register ``fn(**payload)`` as the handler for job type *name*."""
+    def decorator(fn):
+        _registry[name] = JobType(name, fn, concurrency, max_attempts, backoff)
+        return fn
+    return decorator
+
+
+def enqueue(type_, payload=None, *, key=None, delay=0, commit=True):
+    """Queue a job; with *key*, a second enqueue returns the first job."""
+    spec = _registry.get(type_)
+    new = Job(
+        type=type_,
+        key=key,
+        payload=payload or {},
+        max_attempts=spec.max_attempts if spec else 5,
+        run_at=_now() + timedelta(seconds=delay),
+    )
+    try:
+        with db.session.begin_nested():
+            db.session.add(new)
+    except IntegrityError:
+        new = Job.query.filter_by(key=key).one()
+    if commit:
+        db.session.commit()
+    return new
+
+
+def retry_delay(spec, attempts):
+    """Exponential backoff with ±20% jitter so retries don't stampede."""
+    return spec.backoff ** attempts * random.uniform(0.8, 1.2)
+
+
+class Worker:
+    def __init__(self, app, threads=4, poll_interval=1.0, lease_seconds=300):
+        self.app           = app
+        self.threads       = threads
+        self.poll_interval = poll_interval
+        self.lease         = timedelta(seconds=lease_seconds)
+        self.worker_id     = f"{socket.gethostname()}:{os.getpid()}"
+        self._running      = {}          # type -> in‑flight count
+        self._inflight     = set()       # ids of jobs this worker has claimed
+        self._renewed_at   = 0.0
+        self._lock         = threading.Lock()
+        self._stop         = threading.Event()
+        for module in JOB_MODULES:
+            import_module(module)
+
+    # ── claiming ────────────────────────────────────────────
+    def _free_slots(self):
+        with self._lock:
+            return {name: spec.concurrency - self._running.get(name, 0)
+                    for name, spec in _registry.items()
+                    if spec.concurrency - self._running.get(name, 0) > 0}
+
+    def requeue_stale(self):
+        """Jobs left ``running`` by a crashed worker become due again."""
+        stale = db.session.execute(
+            db.update(Job)
+            .where(Job.status == Job.RUNNING, Job.locked_at < _now() - self.lease)
+            .values(status=Job.QUEUED, locked_at=None, locked_by=None)
+        ).rowcount
+        db.session.commit()
+        return stale
+
+    def claim(self):
+        """Atomically move due jobs to ``running``; returns ``[(id, type)]``."""
+        free = self._free_slots()
+        if not free:
+            return []
+        candidates = db.session.execute(
+            db.select(Job.id, Job.type)
+            .where(Job.status == Job.QUEUED, Job.run_at <= _now(), Job.type.in_(list(free)))
+            .order_by(Job.run_at)
+            .limit(sum(free.values()) * 2)
+        ).all()
+
+        claimed = []
+        for job_id, type_ in candidates:
+            if free.get(type_, 0) <= 0:
+                continue
+            # conditional UPDATE = optimistic lock; another worker may win
+            won = db.session.execute(
+                db.update(Job)
+                .where(Job.id == job_id, Job.status == Job.QUEUED)
+                .values(status=Job.RUNNING, locked_at=_now(),
+                        locked_by=self.worker_id, attempts=Job.attempts + 1)
+            ).rowcount
+            if won:
+                free[type_] -= 1
+                claimed.append((job_id, type_))
+        db.session.commit()
+        with self._lock:
+            self._inflight.update(job_id for job_id, _ in claimed)
+        return claimed
+
+    def heartbeat(self):
+        """Renew the lease of jobs this worker is still running."""
+        with self._lock:
+            ids = list(self._inflight)
+        if not ids:
+            return 0
+        renewed = db.session.execute(
+            db.update(Job)
+            .where(Job.id.in_(ids), Job.status == Job.RUNNING, Job.locked_by == self.worker_id)
+            .values(locked_at=_now())
+        ).rowcount
+        db.session.commit()
+        return renewed
+
+    def _maybe_heartbeat(self):
+        now = time.monotonic()
+        if now - self._renewed_at >= self.lease.total_seconds() / 3:
+            self._renewed_at = now
+            self.heartbeat()
+
+    # ── execution ───────────────────────────────────────────
+    def execute(self, job_id):
+        with self.app.app_context():
+            row = db.session.get(Job, job_id)
+            spec = _registry[row.type]
+            try:
+                spec.fn(**row.payload)
+            except Exception as exc:
+                db.session.rollback()
+                row = db.session.get(Job, job_id)
+                row.last_error = f"{type(exc).__name__}: {exc}"
+                row.locked_at = row.locked_by = None
+                if row.attempts >= row.max_attempts:
+                    row.status, row.finished_at = Job.FAILED, _now()
+                    log.error("job %s (%s) failed permanently: %s", job_id, row.type, exc)
+                else:
+                    row.status = Job.QUEUED
+                    row.run_at = _now() + timedelta(seconds=retry_delay(spec, row.attempts))
+            else:
+                row.status, row.finished_at = Job.DONE, _now()
+                row.last_error = None
+            db.session.commit()
+            db.session.remove()
+
+    def _run_one(self, job_id, type_):
+        try:
+            self.execute(job_id)
+        except Exception:
+            log.exception("job %s crashed the runner", job_id)
+        finally:
+            with self._lock:
+                self._running[type_] -= 1
+                self._inflight.discard(job_id)
+
+    def run(self, once=False):
+        with ThreadPoolExecutor(max_workers=self.threads) as pool, self.app.app_context():
+            self.requeue_stale()
+            while not self._stop.is_set():
+                claimed = self.claim()
+                for job_id, type_ in claimed:
+                    with self._lock:
+                        self._running[type_] = self._running.get(type_, 0) + 1
+                    pool.submit(self._run_one, job_id, type_)
+                if once:
+                    break
+                self._maybe_heartbeat()
+                if not claimed:
+                    self._stop.wait(self.poll_interval)
+                    self.requeue_stale()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,101 @@
+"""Live vote / answer counts pushed over Socket.IO.
+
+Clients viewing a question emit ``join_question`` / ``leave_question`` with
+``{"question_id": id}`` on the ``/questions`` namespace and receive
+``question_delta`` events in room ``question:<id>``.
+
+Write paths call :func:`publish`; deltas for the same room are merged and
+flushed once per ``LIVE_COALESCE_MS``, so a voting burst on one question
+emits a handful of messages per second instead of one per vote.
+"""
+import logging
+import threading
+
+from flask import current_app, request
+
+from .. import extensions
+
+log = logging.getLogger(__name__)
+
+NAMESPACE = "/questions"
+EVENT     = "question_delta"
+
+
+def room_for(question_id: int) -> str:
+    return f"question:{question_id}"
+
+
+class DeltaCoalescer:
+    """Merges per‑room deltas; the latest score for a target wins."""
+
+    def __init__(self):
+        self._pending = {}
+        self._lock    = threading.Lock()
+        self._started = False
+
+    def add(self, question_id: int, *, question_score=None, answer_id=None,
+            answer_score=None, new_answer_id=None, answer_count=None) -> None:
+        with self._lock:
+            delta = self._pending.setdefault(question_id, {"question_id": question_id})
+            if question_score is not None:
+                delta["score"] = question_score
+            if answer_score is not None:
+                delta.setdefault("answer_scores", {})[answer_id] = answer_score
+            if new_answer_id is not None:
+                delta.setdefault("new_answer_ids", []).append(new_answer_id)
+            if answer_count is not None:
+                delta["answer_count"] = answer_count
+
+    def drain(self) -> dict:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def flush(self, socketio) -> int:
+        pending = self.drain()
+        for question_id, delta in pending.items():
+            socketio.emit(EVENT, delta, namespace=NAMESPACE, to=room_for(question_id))
+        return len(pending)
+
+    def ensure_started(self, socketio, interval: float) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        socketio.start_background_task(self._run, socketio, interval)
+
+    def _run(self, socketio, interval: float) -> None:
+        while True:
+            socketio.sleep(interval)
+            try:
+                self.flush(socketio)
+            except Exception:
+                log.exception("live delta flush failed")
+
+
+coalescer = DeltaCoalescer()
+
+
+def publish(question_id: int, **delta) -> None:
+    """Queue a delta for everyone viewing *question_id* (no‑op without Socket.IO)."""
+    if "socketio" not in current_app.extensions:
+        return
+    coalescer.add(question_id, **delta)
+    coalescer.ensure_started(extensions.socketio,
+                             current_app.config.get("LIVE_COALESCE_MS", 250) / 1000)
+
+
+def register_handlers(socketio) -> None:
+    from flask_socketio import join_room, leave_room
+
+    @socketio.on("join_question", namespace=NAMESPACE)
+    def join_question(data):
+        question_id = (data or {}).get("question_id")
+        if isinstance(question_id, int):
+            join_room(room_for(question_id), sid=request.sid, namespace=NAMESPACE)
+
+    @socketio.on("leave_question", namespace=NAMESPACE)
+    def leave_question(data):
+        question_id = (data or {}).get("question_id")
+        if isinstance(question_id, int):
+            leave_room(room_for(question_id), sid=request.sid, namespace=NAMESPACE)
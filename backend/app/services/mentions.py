@@ -0,0 +1,203 @@
+"""``@username`` mentions in posted questions and answers.
+
+Usernames live in a per‑process trie (lower‑cased, like the unique index).
+Mentions are anchored at ``@``, so scanning a post is one trie walk per
+``@`` – the longest username that ends on a word boundary wins, which also
+handles names with spaces or dots that a token regex would cut short – and
+text that merely contains ``@`` costs nothing. Only names the trie knows
+reach the database: one ``IN`` over ``lower(username)`` resolves them to
+active users, and :func:`notifications.create_notifications` stores the
+whole batch with one INSERT.
+
+The trie is kept current like the similarity index: the first post with an
+``@`` starts a background load of every username (mentions are not resolved
+until it is ready), then :func:`add` from registration in this process, plus
+a catch‑up over ``id > last_id`` every ``MENTION_REFRESH_SECONDS`` for users
+other processes created.
+"""
+import logging
+import threading
+import time
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.user import User
+from . import summaries
+from .notifications import create_notifications
+
+log = logging.getLogger(__name__)
+
+_END = None                         # trie key marking the end of a username
+
+
+def _is_word(ch) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class UsernameTrie:
+    def __init__(self):
+        self._lock      = threading.RLock()
+        self._sync_lock = threading.Lock()                 # one catch‑up at a time
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._root      = {}
+            self.size       = 0
+            self.last_id    = 0
+            self.ready      = threading.Event()
+            self._building  = False
+            self._synced_at = 0.0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, username) -> None:
+        with self._lock:
+            node = self._root
+            for ch in username.lower():
+                node = node.setdefault(ch, {})
+            if _END not in node:
+                node[_END] = True
+                self.size += 1
+
+    def __contains__(self, username) -> bool:
+        node = self._root
+        for ch in username.lower():
+            node = node.get(ch)
+            if node is None:
+                return False
+        return _END in node
+
+    def match_at(self, text, start):
+        """Longest username at ``text[start:]`` followed by a non‑word char."""
+        node, best = self._root, None
+        for pos in range(start, len(text)):
+            node = node.get(text[pos].lower())
+            if node is None:
+                break
+            if _END in node and (pos + 1 == len(text) or not _is_word(text[pos + 1])):
+                best = pos + 1
+        return text[start:best].lower() if best else None
+
+    def scan(self, text, limit=None) -> list:
+        """Distinct mentioned usernames (lower‑cased) in order of appearance."""
+        found = {}
+        at = text.find("@")
+        while at != -1 and (limit is None or len(found) < limit):
+            if at == 0 or not _is_word(text[at - 1]):         # not an e‑mail address
+                name = self.match_at(text, at + 1)
+                if name:
+                    found.setdefault(name, None)
+            at = text.find("@", at + 1)
+        return list(found)
+
+    # ── freshness ───────────────────────────────────────────
+    def catch_up(self, batch=5000) -> int:
+        """Add users with ``id > last_id`` (one PK range scan)."""
+        added = 0
+        rows = db.session.execute(
+            db.select(User.id, User.username)
+            .where(User.id > self.last_id)
+            .order_by(User.id)
+            .execution_options(yield_per=batch)
+        )
+        for user_id, username in rows:
+            self.add(username)
+            self.last_id = user_id         # only advanced here, in id order
+            added += 1
+        self._synced_at = time.monotonic()
+        return added
+
+    def build(self) -> None:
+        """Load every username, then mark the trie ready."""
+        with self._sync_lock:
+            if not self.ready.is_set():
+                self.catch_up()
+                self.ready.set()
+
+    def start_build(self, app) -> None:
+        with self._lock:
+            if self._building or self.ready.is_set():
+                return
+            self._building = True
+        threading.Thread(target=self._build_in_background, args=(app,),
+                         name="mentions-build", daemon=True).start()
+
+    def _build_in_background(self, app) -> None:
+        try:
+            with app.app_context():
+                self.build()
+        except Exception:
+            log.exception("username trie build failed; the next post retries")
+        finally:
+            with self._lock:
+                self._building = False
+
+    def ensure_fresh(self) -> bool:
+        """Whether the trie is ready; starts the build or a due catch‑up."""
+        if not self.ready.is_set():
+            self.start_build(current_app._get_current_object())
+            return False
+        if (time.monotonic() - self._synced_at
+                >= current_app.config.get("MENTION_REFRESH_SECONDS", 5)
+                and self._sync_lock.acquire(blocking=False)):
+            try:
+                self.catch_up()
+            finally:
+                self._sync_lock.release()
+        return True
+
+
+index = UsernameTrie()
+
+
+def add(username) -> None:
+    """Make a just‑registered *username* mentionable in this process."""
+    index.add(username)
+
+
+def find_mentions(text) -> list:
+    """Mentioned usernames; none while the trie is still being built."""
+    if not index.ensure_fresh():
+        return []
+    return index.scan(text or "", current_app.config.get("MENTION_MAX_PER_POST", 20))
+
+
+def resolve(names, exclude=None) -> list:
+    """Ids of the active users called *names*, in one ``IN`` lookup."""
+    if not names:
+        return []
+    stmt = (db.select(User.id)
+            .where(db.func.lower(User.username).in_(names), User.is_active.is_(True))
+            .order_by(User.id))
+    if exclude is not None:
+        stmt = stmt.where(User.id != exclude)
+    return db.session.scalars(stmt).all()
+
+
+def notify_mentions(text, *, author_id, question_id) -> int:
+    """Notify everyone mentioned in *text*; returns how many were notified.
+
+    Called after the post is committed, so a failure here – including the
+    question having been deleted meanwhile – is logged and never fails the
+    post itself.
+    """
+    if not text or "@" not in text:
+        return 0
+    try:
+        user_ids = resolve(find_mentions(text), exclude=author_id)
+        if not user_ids:
+            return 0
+        author = summaries.users.get(author_id)
+        question = summaries.questions.get(question_id)
+        if author is None or question is None:
+            return 0
+        create_notifications(user_ids=user_ids,
+                             message=f'{author.username} mentioned you in "{question.title}"')
+        return len(user_ids)
+    except Exception:
+        db.session.rollback()
+        log.exception("mention notifications failed")
+        return 0
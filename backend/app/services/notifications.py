@@ -1,5 +1,45 @@
-from ..extensions import db, socketio
+from datetime import datetime, timezone
+
+from flask import current_app
+
+from .. import extensions
+from ..extensions import db
 from ..models.notification import Notification
+from .jobs import enqueue, job
+
+
+def _payload(notif: Notification) -> dict:
+    return {
+        "id": notif.id,
+        "message": notif.message,
+        "is_read": notif.is_read,
+        "created_at": notif.created_at.isoformat(),
+    }
+
+
+def _broadcast(payloads) -> None:
+    if "socketio" not in current_app.extensions:
+        return
+    for payload in payloads:
+        extensions.socketio.emit("notification", payload, namespace="/notifications")
+
+
+def emit_notification(notif: Notification) -> None:
+    """Broadcast *notif* on the ``/notifications`` namespace."""
+    _broadcast([_payload(notif)])
+
+
+@job("notifications.emit", concurrency=4, max_attempts=3)
+def emit_notification_job(notification_id):
+    notif = db.session.get(Notification, notification_id)
+    if notif is not None:
+        emit_notification(notif)
+
+
+@job("notifications.emit_many", concurrency=4, max_attempts=3)
+def emit_notifications_job(notification_ids):
+    _broadcast([_payload(n) for n in db.session.scalars(
+        db.select(Notification).where(Notification.id.in_(notification_ids)))])
 
 
 def create_notification(*, user_id: int, message: str) -> Notification:
@@ -13,17 +53,44 @@ def create_notification(*, user_id: int, message: str) -> Notification:
 
     notif = Notification(user_id=user_id, message=message.strip())
     db.session.add(notif)
-    db.session.commit()
-
-    # WebSocket broadcast
-    socketio.emit(
-        "notification",
-        {
-            "id": notif.id,
-            "message": notif.message,
-            "is_read": notif.is_read,
-            "created_at": notif.created_at.isoformat(),
-        },
-        namespace="/notifications",
-    )
+    db.session.flush()
+
+    # WebSocket broadcast – from the job worker when deferred (needs
+    # SOCKETIO_MESSAGE_QUEUE so its emits reach the web processes)
+    if current_app.config.get("DEFER_NOTIFICATIONS"):
+        enqueue("notifications.emit", {"notification_id": notif.id},
+                key=f"notification:{notif.id}", commit=False)
+        db.session.commit()
+    else:
+        db.session.commit()
+        emit_notification(notif)
     return notif
+
+
+def create_notifications(*, user_ids, message: str) -> list:
+    """Persist one notification per user with a single INSERT, then emit them."""
+    if not all(isinstance(u, int) and u > 0 for u in user_ids):
+        raise ValueError("user_ids must be positive integers")
+    if not (isinstance(message, str) and message.strip()):
+        raise ValueError("message must be a non‑empty string (≤255 chars)")
+    if not user_ids:
+        return []
+    message = message[:255].strip()
+
+    now = datetime.now(timezone.utc)
+    notifs = db.session.scalars(
+        db.insert(Notification).returning(Notification),
+        [{"user_id": u, "message": message, "is_read": False, "created_at": now}
+         for u in user_ids],
+    ).all()
+
+    if current_app.config.get("DEFER_NOTIFICATIONS"):
+        ids = [n.id for n in notifs]
+        enqueue("notifications.emit_many", {"notification_ids": ids},
+                key=f"notifications:{min(ids)}-{max(ids)}", commit=False)
+        db.session.commit()
+    else:
+        payloads = [_payload(n) for n in notifs]    # before commit expires them
+        db.session.commit()
+        _broadcast(payloads)
+    return notifs
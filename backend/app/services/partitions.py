@@ -0,0 +1,177 @@
+"""Monthly range partitions of ``votes`` and ``notifications`` (PostgreSQL).
+
+The partitioned parents are created by migration ``b81c6e2f7a93``; each
+month lives in ``<table>_pYYYYMM`` covering ``[first of month, first of next
+month)`` of ``created_at``. :func:`maintain` creates the current month and
+the next ``PARTITION_PREMAKE_MONTHS``, and detaches and drops months entirely
+older than the table's retention (``NOTIFICATION_RETENTION_MONTHS``,
+``VOTE_RETENTION_MONTHS``; 0 keeps everything). Dropping a month is a
+metadata operation instead of a DELETE over millions of rows.
+
+Rows for a month that does not exist yet (the job stopped running) land in
+``<table>_default`` (migration ``e7f3b9c20d15``) rather than failing the
+write; the next :func:`maintain` moves them into a new partition for their
+month and logs a warning.
+
+The ``partitions.maintain`` job runs it and re‑queues itself daily;
+``flask partitions maintain`` runs it now and queues the daily job, so
+running it on deploy is enough to keep the cycle going.
+On other databases the tables are plain and every call here is a no‑op.
+"""
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from flask import current_app
+
+from ..extensions import db
+from .jobs import enqueue, job
+
+log = logging.getLogger(__name__)
+
+# table -> config key of its retention in months
+PARTITIONED = {
+    "votes":         "VOTE_RETENTION_MONTHS",
+    "notifications": "NOTIFICATION_RETENTION_MONTHS",
+}
+
+_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})(?P<month>\d{2})$")
+
+
+def enabled() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+def month_start(day) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def retained_since(table, today=None):
+    """Oldest ``created_at`` :func:`maintain` keeps in *table* (naive UTC).
+
+    None when nothing is dropped – retention 0, or an unpartitioned database.
+    Readers bound their queries with it so PostgreSQL prunes the expired
+    months without hiding any row that retention keeps.
+    """
+    retention = current_app.config.get(PARTITIONED[table], 0)
+    if retention <= 0 or not enabled():
+        return None
+    this_month = month_start(today or datetime.now(timezone.utc).date())
+    return datetime.combine(add_months(this_month, -retention), datetime.min.time())
+
+
+def partitions(table) -> list:
+    """``[(month, name)]`` attached to *table*, oldest first."""
+    names = db.session.scalars(db.text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table"
+    ), {"table": table})
+    found = []
+    for name in names:
+        m = _NAME.match(name)
+        if m and m["table"] == table:
+            found.append((date(int(m["year"]), int(m["month"]), 1), name))
+    return sorted(found)
+
+
+def create_partition(table, month: date) -> str:
+    name = partition_name(table, month)
+    db.session.execute(db.text(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    return name
+
+
+def default_months(table) -> list:
+    """Months with rows in *table*'s default partition, oldest first."""
+    if db.session.scalar(db.text("SELECT to_regclass(:name)"),
+                         {"name": f"{table}_default"}) is None:
+        return []
+    return sorted(db.session.scalars(db.text(
+        f"SELECT DISTINCT date_trunc('month', created_at)::date FROM \"{table}_default\"")))
+
+
+def split_default(table, month: date) -> str:
+    """Move *month*'s rows out of the default partition into their own."""
+    name = partition_name(table, month)
+    bounds = {"lo": month, "hi": add_months(month, 1)}
+    # CREATE … PARTITION OF would fail while the default holds rows of the
+    # range, so fill a plain table first and attach it (indexes follow)
+    db.session.execute(db.text(
+        f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    db.session.execute(db.text(
+        f'WITH moved AS (DELETE FROM "{table}_default" '
+        f"WHERE created_at >= :lo AND created_at < :hi RETURNING *) "
+        f'INSERT INTO "{name}" SELECT * FROM moved'), bounds)
+    db.session.execute(db.text(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{bounds['hi'].isoformat()}')"))
+    return name
+
+
+def drop_partition(table, name) -> None:
+    # DETACH first: the DROP then only locks the detached table, not the parent
+    db.session.execute(db.text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+    db.session.execute(db.text(f'DROP TABLE "{name}"'))
+
+
+def maintain(today=None) -> dict:
+    """Create upcoming months and drop expired ones; ``{table: changes}``."""
+    if not enabled():
+        return {}
+    this_month = month_start(today or datetime.now(timezone.utc).date())
+    ahead = current_app.config.get("PARTITION_PREMAKE_MONTHS", 3)
+    changes = {}
+    for table, retention_key in PARTITIONED.items():
+        existing = dict((name, month) for month, name in partitions(table))
+        stray = default_months(table)
+        if stray:
+            log.warning("%s_default has rows for %s; moving them to their months",
+                        table, [f"{m:%Y-%m}" for m in stray])
+        created = []
+        for month in sorted({add_months(this_month, n) for n in range(ahead + 1)} | set(stray)):
+            name = partition_name(table, month)
+            if name not in existing:
+                (split_default if month in stray else create_partition)(table, month)
+                existing[name] = month
+                created.append(name)
+
+        dropped = []
+        retention = current_app.config.get(retention_key, 0)
+        if retention > 0:
+            cutoff = add_months(this_month, -retention)      # keep [cutoff, …)
+            for name, month in sorted(existing.items(), key=lambda item: item[1]):
+                if add_months(month, 1) <= cutoff:
+                    drop_partition(table, name)
+                    dropped.append(name)
+        db.session.commit()
+        changes[table] = {"created": created, "dropped": dropped,
+                          "moved": [partition_name(table, m) for m in stray]}
+        if created or dropped:
+            log.info("partitions of %s: created %s, dropped %s", table, created, dropped)
+    return changes
+
+
+def schedule_next():
+    """Queue tomorrow's run (one job per day, whoever asks first)."""
+    tomorrow = datetime.now(timezone.utc).date() + timedelta(days=1)
+    return enqueue("partitions.maintain", key=f"partitions:maintain:{tomorrow.isoformat()}",
+                   delay=24 * 3600)
+
+
+@job("partitions.maintain", concurrency=1, max_attempts=3)
+def maintain_job():
+    maintain()
+    schedule_next()
@@ -0,0 +1,53 @@
+"""Password hashing – configurable algorithm/cost, hashed off the event loop.
+
+The method string uses werkzeug's format, e.g. ``scrypt:32768:8:1`` or
+``pbkdf2:sha256:600000``, and is set per deployment through the
+``PASSWORD_HASH_METHOD`` config key.
+"""
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from ..utils import run_blocking
+
+DEFAULT_METHOD      = "scrypt:32768:8:1"
+DEFAULT_SALT_LENGTH = 16
+
+# werkzeug fills in these parameters when a method string omits them
+_IMPLICIT_PARAMS = {
+    "scrypt": ["32768", "8", "1"],
+    "pbkdf2": ["sha256", "600000"],
+}
+
+
+def _configured_method() -> str:
+    return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+
+def normalize_method(method: str) -> str:
+    """Expand a method string to the fully‑parameterised form werkzeug stores."""
+    name, *params = method.split(":")
+    defaults = _IMPLICIT_PARAMS.get(name)
+    if defaults is None:
+        return method
+    return ":".join([name, *params, *defaults[len(params):]])
+
+
+def hash_password(raw_password: str) -> str:
+    method = _configured_method()
+    salt_length = current_app.config.get("PASSWORD_SALT_LENGTH", DEFAULT_SALT_LENGTH)
+    return run_blocking(generate_password_hash, raw_password,
+                        method=method, salt_length=salt_length)
+
+
+def verify_password(pwhash: str, raw_password: str) -> bool:
+    if not pwhash:
+        return False
+    return run_blocking(check_password_hash, pwhash, raw_password)
+
+
+def needs_rehash(pwhash: str, method: str = None) -> bool:
+    """True when *pwhash* was produced with other parameters than configured."""
+    if not pwhash or "$" not in pwhash:
+        return True
+    stored = pwhash.split("$", 1)[0]
+    return normalize_method(stored) != normalize_method(method or _configured_method())
@@ -0,0 +1,140 @@
+"""Soft delete of questions/answers and the background hard purge.
+
+Deleting only stamps ``deleted_at`` (listings filter it out through partial
+indexes) and queues a purge job after ``PURGE_DELAY_SECONDS``. The purge
+removes votes, answers, tag links and related‑question rows with set‑based
+DELETEs of at most ``PURGE_CHUNK_ROWS`` rows, committing per chunk so locks stay short and a
+crash resumes where it stopped. Each vote chunk takes back the reputation
+those votes gave, one UPDATE per affected author.
+"""
+from collections import Counter
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.answer import Answer
+from ..models.job import _now
+from ..models.question import Question
+from ..models.related import RelatedQuestion
+from ..models.tag import question_tags
+from ..models.user import User
+from ..models.vote import Vote, VoteType
+from . import summaries
+from .jobs import enqueue, job
+from .reputation import DOWNVOTE_REPUTATION, UPVOTE_REPUTATION
+
+_vote_points = db.case((Vote.vote_type == VoteType.UP, UPVOTE_REPUTATION),
+                       else_=DOWNVOTE_REPUTATION)
+
+_take_back = (
+    db.update(User.__table__)
+    .where(User.__table__.c.id == db.bindparam("author_id"))
+    .values(reputation=User.__table__.c.reputation - db.bindparam("points"))
+)
+
+
+# ── soft delete ───────────────────────────────────────────
+def soft_delete_question(question):
+    return _soft_delete(question, "question")
+
+
+def soft_delete_answer(answer):
+    return _soft_delete(answer, "answer")
+
+
+def _soft_delete(row, kind):
+    row.deleted_at = _now()
+    purge = enqueue(f"content.purge_{kind}", {f"{kind}_id": row.id},
+                    key=f"purge:{kind}:{row.id}",
+                    delay=current_app.config.get("PURGE_DELAY_SECONDS", 0), commit=False)
+    db.session.commit()
+    return purge
+
+
+# ── hard purge ────────────────────────────────────────────
+def _chunk_size():
+    return current_app.config.get("PURGE_CHUNK_ROWS", 1000)
+
+
+def _purge_votes(author_column, join_target, where) -> set:
+    """Delete matching votes chunk by chunk, reverting their reputation."""
+    authors, chunk = set(), _chunk_size()
+    while True:
+        rows = db.session.execute(
+            db.select(Vote.id, author_column, _vote_points)
+            .join(join_target)
+            .where(where)
+            .limit(chunk)
+        ).all()
+        if not rows:
+            return authors
+        per_author = Counter()
+        for _, author_id, points in rows:
+            per_author[author_id] += points
+        params = [{"author_id": a, "points": p} for a, p in per_author.items() if p]
+        if params:
+            db.session.execute(_take_back, params)
+        db.session.execute(db.delete(Vote).where(Vote.id.in_([r[0] for r in rows])))
+        db.session.commit()
+        authors.update(per_author)
+
+
+def _delete_in_chunks(model, where) -> int:
+    total, chunk = 0, _chunk_size()
+    while True:
+        ids = db.session.scalars(db.select(model.id).where(where).limit(chunk)).all()
+        if not ids:
+            return total
+        db.session.execute(db.delete(model).where(model.id.in_(ids)))
+        db.session.commit()
+        total += len(ids)
+
+
+def _delete_tag_links(question_id) -> None:
+    db.session.execute(db.delete(question_tags).where(question_tags.c.question_id == question_id))
+
+
+def purge_question(question_id) -> bool:
+    """Hard‑delete a soft‑deleted question with its answers, votes and tags."""
+    question = db.session.get(Question, question_id)
+    if question is None or question.deleted_at is None:
+        return False
+    answers_of_question = Answer.question_id == question_id
+
+    authors = _purge_votes(Answer.user_id, Answer, answers_of_question)
+    authors |= _purge_votes(Question.user_id, Question, Vote.question_id == question_id)
+    _delete_in_chunks(Answer, answers_of_question)
+    _delete_tag_links(question_id)
+    db.session.execute(db.delete(RelatedQuestion).where(db.or_(
+        RelatedQuestion.question_id == question_id, RelatedQuestion.related_id == question_id)))
+    db.session.execute(db.delete(Question).where(Question.id == question_id))
+    db.session.commit()
+
+    summaries.questions.invalidate(question_id)
+    summaries.users.invalidate(*authors)
+    return True
+
+
+def purge_answer(answer_id) -> bool:
+    answer = db.session.get(Answer, answer_id)
+    if answer is None or answer.deleted_at is None:
+        return False
+    question_id = answer.question_id
+
+    authors = _purge_votes(Answer.user_id, Answer, Vote.answer_id == answer_id)
+    db.session.execute(db.delete(Answer).where(Answer.id == answer_id))
+    db.session.commit()
+
+    summaries.questions.invalidate(question_id)
+    summaries.users.invalidate(*authors)
+    return True
+
+
+@job("content.purge_question", concurrency=1)
+def purge_question_job(question_id):
+    purge_question(question_id)
+
+
+@job("content.purge_answer", concurrency=2)
+def purge_answer_job(answer_id):
+    purge_answer(answer_id)
@@ -0,0 +1,146 @@
+"""Rate‑limit keying and the per‑process pre‑check in front of shared storage.
+
+Counters live in the storage named by ``RATELIMIT_STORAGE_URI`` (redis:// in
+production, memory:// for tests) so limits hold across workers. To spare a
+storage round trip per request, every process keeps a small token bucket per
+client and endpoint (``RATELIMIT_LOCAL_BURST`` tokens, refilled at
+``RATELIMIT_LOCAL_RATE``/s): while it holds tokens the request is let through
+locally.
+
+Local admission is a deferral, not extra allowance. It only starts after a
+shared check for that client and endpoint has passed, and each locally
+admitted hit is owed to the limits that check saw; :func:`settle_local_hits`
+charges the owed hits to shared storage on the client's next checked request.
+A breached limit turns local admission off until a shared check passes
+again, so a client can run at most the burst ahead of a limit, and pays it
+back. Set the burst to 0 to disable it.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_limiter.util import get_remote_address
+
+
+def rate_limit_key() -> str:
+    """JWT identity for authenticated callers, remote address otherwise.
+
+    Keying by user keeps clients behind one NAT from throttling each other.
+    """
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None          # bad / expired token – the view will reject it
+    if identity is not None:
+        return f"user:{identity}"
+    return f"ip:{get_remote_address()}"
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "stamp", "passed", "owed")
+
+    def __init__(self, tokens: float, stamp: float):
+        self.tokens = tokens
+        self.stamp  = stamp
+        self.passed = False         # whether the last shared check passed
+        self.owed   = 0             # locally admitted hits not yet charged
+
+
+class LocalPreCheck:
+    """Bounded LRU of per‑client token buckets (one instance per process)."""
+
+    def __init__(self, max_keys: int = 10_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, key, burst, rate, now, create=True):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if not create:
+                return None
+            bucket = self._buckets[key] = TokenBucket(burst, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.stamp) * rate)
+            bucket.stamp  = now
+        return bucket
+
+    def allow(self, key: str, burst: float, rate: float, now: float = None) -> bool:
+        """Take one token for *key*; False once the local budget is spent."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._bucket(key, burst, rate, now)
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return True
+            return False
+
+    def admit(self, key: str, burst: float, rate: float, now: float = None) -> bool:
+        """:meth:`allow` for a *key* whose last shared check passed; the hit is owed."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._bucket(key, burst, rate, now, create=False)
+            if bucket is None or not bucket.passed or bucket.tokens < 1:
+                return False
+            bucket.tokens -= 1
+            bucket.owed   += 1
+            return True
+
+    def settle(self, key: str, passed: bool, burst: float, now: float = None) -> int:
+        """Record a shared check for *key*; returns the hits owed until now."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if not passed:
+                    return 0
+                bucket = self._bucket(key, burst, 0.0, now)
+            owed, bucket.owed = bucket.owed, 0
+            bucket.passed = passed
+            return owed
+
+
+local_precheck = LocalPreCheck()
+
+
+def _precheck_key() -> str:
+    return f"{rate_limit_key()}|{request.endpoint}"
+
+
+def under_local_budget() -> bool:
+    """Limiter request filter: True skips the shared‑storage check.
+
+    Flask-Limiter runs filters once per check and a decorated route is
+    checked twice, so the decision is kept for the rest of the request.
+    """
+    if "ratelimit_local" not in g:
+        burst = current_app.config.get("RATELIMIT_LOCAL_BURST", 0)
+        rate = current_app.config.get("RATELIMIT_LOCAL_RATE", 0.0)
+        g.ratelimit_local = (burst > 0 and request.endpoint is not None
+                             and local_precheck.admit(_precheck_key(), burst, rate))
+    return g.ratelimit_local
+
+
+def settle_local_hits(response):
+    """after_request: charge locally admitted hits to the limits just checked."""
+    from ..extensions import limiter
+
+    checked = limiter.current_limits
+    burst = current_app.config.get("RATELIMIT_LOCAL_BURST", 0)
+    if not checked or burst <= 0:
+        return response            # unlimited route, or admitted locally
+    passed = not any(lim.breached for lim in checked)
+    owed = local_precheck.settle(_precheck_key(), passed, burst)
+    if owed:
+        try:
+            for lim in checked:
+                limiter.limiter.hit(lim.limit, *lim.request_args, cost=owed)
+        except Exception:
+            current_app.logger.exception("could not charge %d locally admitted hits", owed)
+    return response
@@ -1,6 +1,7 @@
 from functools import wraps
 from flask import jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from ..extensions import db
 from ..models.user import User
 
 def role_required(*allowed_roles):
@@ -17,9 +18,12 @@ def role_required(*allowed_roles):
                 if user_role not in allowed_roles:
                     return jsonify({'error': 'Insufficient permissions'}), 403
                 
-                # Additional check: verify user is still active
-                user = User.query.get(current_user_id)
-                if not user or not user.is_active:
+                # Additional check: verify user is still active. Read fresh,
+                # not from the per-process summary cache: a deactivation on
+                # another worker must take effect here at once.
+                is_active = db.session.scalar(
+                    db.select(User.is_active).where(User.id == current_user_id))
+                if not is_active:
                     return jsonify({'error': 'User account is inactive'}), 401
                 
                 return f(*args, **kwargs)
@@ -39,3 +43,7 @@ def moderator_or_admin_required(f):
 def user_or_admin_required(f):
     """Decorator for user and admin access"""
     return role_required('user', 'admin')(f)
+
+def can_delete(owner_id):
+    """Authors may delete their own posts; moderators and admins any post"""
+    return get_jwt_identity() == owner_id or get_jwt().get('role') in ('moderator', 'admin')
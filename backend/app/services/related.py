@@ -0,0 +1,314 @@
+"""Related questions from tag and co‑vote similarity, precomputed.
+
+``rebuild()`` loads two sparse matrices over live questions –
+
+* tags:   question × tag, IDF‑weighted (tags on more than
+  ``RELATED_MAX_TAG_SHARE`` of a large corpus are dropped as noise),
+* votes:  question × voter, one entry per user who voted on the question or
+  one of its answers, weighted down for users who vote on everything,
+
+– L2‑normalises the rows and scores pairs by cosine similarity,
+``RELATED_TAG_WEIGHT · tags + RELATED_VOTE_WEIGHT · votes``. Products are
+taken ``BLOCK_ROWS`` questions at a time and only the top ``RELATED_TOP_K``
+per row are kept, then written to ``related_questions``.
+
+A new question gets ``update(question_id)``: its vectors are scored against
+the matrices cached in the worker, its own top‑k is written, and it is
+merged into the lists of the neighbours it outranks – no full rebuild.
+
+The full rebuild still runs every ``RELATED_REBUILD_SECONDS`` to pick up new
+votes and tags: the ``related.rebuild`` job re‑queues itself for the next
+period. The first question posted by each web process queues the current
+period's run (one job per period, whoever asks first), and
+``flask related rebuild`` queues the next one, so the cycle restarts on its
+own if the queue is ever cleared.
+
+NumPy / SciPy are imported inside the job functions only; the web process
+just reads the table (:func:`related_for`).
+"""
+import threading
+import time
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.answer import Answer
+from ..models.question import Question
+from ..models.related import RelatedQuestion
+from ..models.tag import question_tags
+from ..models.vote import Vote
+from .jobs import enqueue, job
+
+BLOCK_ROWS = 2000
+COMMON_TAG_MIN_DF = 100    # the share cut‑off only applies to tags at least this common
+
+
+def _config(key, default):
+    return current_app.config.get(key, default)
+
+
+# ── read path ─────────────────────────────────────────────
+def related_for(question_id) -> list:
+    """Stored neighbours of *question_id*, best first (one indexed read)."""
+    rows = db.session.execute(
+        db.select(RelatedQuestion.related_id, Question.title, RelatedQuestion.score)
+        .join(Question, Question.id == RelatedQuestion.related_id)
+        .where(RelatedQuestion.question_id == question_id, Question.deleted_at.is_(None))
+        .order_by(RelatedQuestion.rank)
+    )
+    return [{"id": rid, "title": title, "score": round(score, 4)} for rid, title, score in rows]
+
+
+# ── matrices ──────────────────────────────────────────────
+class Matrices:
+    """Row‑normalised tag and vote matrices over the live question ids."""
+
+    def __init__(self, ids, tag_ids, idf, tags, voter_ids, iuf, votes):
+        self.ids, self.tag_ids, self.idf, self.tags = ids, tag_ids, idf, tags
+        self.voter_ids, self.iuf, self.votes = voter_ids, iuf, votes
+        self.built_at = time.monotonic()
+
+
+def _normalize_rows(m):
+    import numpy as np
+    from scipy import sparse
+
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (sparse.diags(1.0 / norms) @ m).tocsr()
+
+
+def _positions(sorted_ids, values):
+    """Index of each value in *sorted_ids* and a mask of the ones present."""
+    import numpy as np
+
+    pos = np.searchsorted(sorted_ids, values)
+    if not len(sorted_ids):
+        return pos, np.zeros(len(values), dtype=bool)
+    found = sorted_ids[np.minimum(pos, len(sorted_ids) - 1)] == values
+    return pos, found & (pos < len(sorted_ids))
+
+
+def _split(pairs):
+    import numpy as np
+
+    if not len(pairs):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.asarray(pairs, dtype=np.int64).T
+
+
+def _incidence(pairs, ids):
+    """``(question_id, key)`` pairs -> binary question × key CSR and key ids."""
+    import numpy as np
+    from scipy import sparse
+
+    q, k = _split(pairs)
+    rows, live = _positions(ids, q)
+    keys, cols = np.unique(k[live], return_inverse=True)
+    m = sparse.csr_matrix((np.ones(len(cols)), (rows[live], cols)),
+                          shape=(len(ids), len(keys)))
+    m.data[:] = 1.0                      # duplicate pairs collapse to 1
+    return m, keys
+
+
+def _vote_pairs(question_ids=None):
+    """``(question_id, user_id)`` for votes on questions or their answers."""
+    on_questions = db.select(Vote.question_id, Vote.user_id).where(Vote.question_id.is_not(None))
+    on_answers = (db.select(Answer.question_id, Vote.user_id)
+                  .join(Answer, Answer.id == Vote.answer_id))
+    if question_ids is not None:
+        on_questions = on_questions.where(Vote.question_id.in_(question_ids))
+        on_answers = on_answers.where(Answer.question_id.in_(question_ids))
+    return db.session.execute(db.union(on_questions, on_answers)).all()
+
+
+def _tag_pairs(question_ids=None):
+    stmt = db.select(question_tags.c.question_id, question_tags.c.tag_id)
+    if question_ids is not None:
+        stmt = stmt.where(question_tags.c.question_id.in_(question_ids))
+    return db.session.execute(stmt).all()
+
+
+def load_matrices() -> Matrices:
+    import numpy as np
+    from scipy import sparse
+
+    # walks the partial live index; ids are sorted here for searchsorted
+    ids = np.sort(np.fromiter(
+        db.session.scalars(db.select(Question.id)
+                           .where(Question.deleted_at.is_(None)).order_by(Question.created_at)),
+        dtype=np.int64,
+    ))
+    n = max(len(ids), 1)
+
+    tags, tag_ids = _incidence(_tag_pairs(), ids)
+    df = np.asarray(tags.sum(axis=0)).ravel()
+    idf = np.log(n / np.maximum(df, 1))
+    common = df > max(_config("RELATED_MAX_TAG_SHARE", 0.05) * n, COMMON_TAG_MIN_DF)
+    idf[common] = 0.0                                            # near‑universal tags
+    tags = _normalize_rows(tags @ sparse.diags(idf))
+
+    votes, voter_ids = _incidence(_vote_pairs(), ids)
+    activity = np.asarray(votes.sum(axis=0)).ravel()
+    iuf = 1.0 / np.log1p(np.maximum(activity, 1))                # dampen prolific voters
+    votes = _normalize_rows(votes @ sparse.diags(iuf))
+    return Matrices(ids, tag_ids, idf, tags, voter_ids, iuf, votes)
+
+
+def _scores(m, tag_rows, vote_rows):
+    """Similarity of the given row vectors to every live question (sparse)."""
+    return (_config("RELATED_TAG_WEIGHT", 0.7) * (tag_rows @ m.tags.T)
+            + _config("RELATED_VOTE_WEIGHT", 0.3) * (vote_rows @ m.votes.T)).tocsr()
+
+
+def _top_k(scores_row, k, exclude):
+    """``[(question_id_index, score)]`` best first from one CSR row."""
+    import numpy as np
+
+    cols, vals = scores_row.indices, scores_row.data
+    keep = (cols != exclude) & (vals > 0)
+    cols, vals = cols[keep], vals[keep]
+    if len(vals) > k:
+        part = np.argpartition(-vals, k)[:k]
+        cols, vals = cols[part], vals[part]
+    order = np.lexsort((cols, -vals))
+    return list(zip(cols[order].tolist(), vals[order].tolist()))
+
+
+def _write_lists(lists, replace=True) -> None:
+    """Store neighbour lists ``{question_id: [(related_id, score)]}``."""
+    if not lists:
+        return
+    source_ids = list(lists)
+    for start in range(0, len(source_ids) if replace else 0, 5000):
+        chunk = source_ids[start:start + 5000]
+        db.session.execute(db.delete(RelatedQuestion)
+                           .where(RelatedQuestion.question_id.in_(chunk)))
+    rows = [{"question_id": qid, "rank": rank, "related_id": rid, "score": float(score)}
+            for qid, neighbours in lists.items()
+            for rank, (rid, score) in enumerate(neighbours)]
+    for start in range(0, len(rows), 5000):
+        db.session.execute(db.insert(RelatedQuestion), rows[start:start + 5000])
+
+
+# ── jobs ──────────────────────────────────────────────────
+_cache = {"matrices": None}
+_cache_lock = threading.Lock()
+
+
+def reset_cache() -> None:
+    with _cache_lock:
+        _cache["matrices"] = None
+    _scheduled.clear()
+
+
+def cached_matrices() -> Matrices:
+    with _cache_lock:
+        m = _cache["matrices"]
+        if m is None or time.monotonic() - m.built_at > _config("RELATED_MATRIX_TTL", 3600):
+            m = _cache["matrices"] = load_matrices()
+        return m
+
+
+def rebuild() -> int:
+    """Recompute every list; returns the number of questions written."""
+    m = load_matrices()
+    with _cache_lock:
+        _cache["matrices"] = m
+    k = _config("RELATED_TOP_K", 10)
+
+    db.session.execute(db.delete(RelatedQuestion))
+    for start in range(0, len(m.ids), BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        scores = _scores(m, m.tags[block], m.votes[block])
+        lists = {}
+        for offset in range(scores.shape[0]):
+            row = start + offset
+            top = _top_k(scores.getrow(offset), k, exclude=row)
+            if top:
+                lists[int(m.ids[row])] = [(int(m.ids[c]), s) for c, s in top]
+        _write_lists(lists, replace=False)      # table emptied above
+    db.session.commit()
+    return len(m.ids)
+
+
+def _vector(pairs, key_ids, weights):
+    """One normalised row for a question from its ``(question_id, key)`` pairs."""
+    import numpy as np
+    from scipy import sparse
+
+    _, keys = _split(pairs)
+    cols, known = _positions(key_ids, keys)
+    cols = np.unique(cols[known])
+    row = sparse.csr_matrix((weights[cols], (np.zeros(len(cols), dtype=np.int64), cols)),
+                            shape=(1, len(key_ids)))
+    return _normalize_rows(row)
+
+
+def update(question_id) -> int:
+    """Compute one new question's list and merge it into its neighbours'."""
+    m = cached_matrices()
+    k = _config("RELATED_TOP_K", 10)
+
+    tag_row = _vector(_tag_pairs([question_id]), m.tag_ids, m.idf)
+    vote_row = _vector(_vote_pairs([question_id]), m.voter_ids, m.iuf)
+    scores = _scores(m, tag_row, vote_row)
+
+    pos = int(m.ids.searchsorted(question_id))
+    self_col = pos if pos < len(m.ids) and m.ids[pos] == question_id else -1
+    top = [(int(m.ids[c]), s) for c, s in _top_k(scores.getrow(0), k, exclude=self_col)]
+
+    lists = {question_id: top}
+    current = {}
+    for qid, rid, score in db.session.execute(
+        db.select(RelatedQuestion.question_id, RelatedQuestion.related_id, RelatedQuestion.score)
+        .where(RelatedQuestion.question_id.in_([rid for rid, _ in top]))
+        .order_by(RelatedQuestion.question_id, RelatedQuestion.rank)
+    ):
+        current.setdefault(qid, []).append((rid, score))
+    for neighbour, score in top:
+        existing = [p for p in current.get(neighbour, []) if p[0] != question_id]
+        if len(existing) < k or score > existing[-1][1]:
+            merged = sorted(existing + [(question_id, score)], key=lambda p: (-p[1], p[0]))
+            lists[neighbour] = merged[:k]
+    _write_lists(lists)
+    db.session.commit()
+    return len(lists)
+
+
+# ── periodic rebuild ──────────────────────────────────────
+_scheduled = threading.Event()      # this process has queued the current period
+
+
+def _period():
+    return _config("RELATED_REBUILD_SECONDS", 6 * 3600)
+
+
+def ensure_scheduled(commit=True) -> None:
+    """Queue this period's rebuild, once per process (0 seconds: never)."""
+    period = _period()
+    if period <= 0 or _scheduled.is_set():
+        return
+    enqueue("related.rebuild", key=f"related:rebuild:{int(time.time() // period)}",
+            commit=commit)
+    _scheduled.set()
+
+
+def schedule_next():
+    """Queue the next period's rebuild; None when periodic rebuilds are off."""
+    period = _period()
+    if period <= 0:
+        return None
+    return enqueue("related.rebuild", key=f"related:rebuild:{int(time.time() // period) + 1}",
+                   delay=period)
+
+
+@job("related.rebuild", concurrency=1, max_attempts=2)
+def rebuild_job():
+    rebuild()
+    schedule_next()
+
+
+@job("related.update", concurrency=1)
+def update_job(question_id):
+    update(question_id)
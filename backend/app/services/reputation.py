@@ -0,0 +1,50 @@
+"""Reputation bookkeeping derived from the votes table."""
+from ..extensions import db
+from ..models.answer import Answer
+from ..models.question import Question
+from ..models.user import User
+from ..models.vote import Vote, VoteType
+from ..models.vote_delta import VoteDelta
+from .jobs import job
+
+# must agree with blueprints.votes.calculate_reputation_change
+UPVOTE_REPUTATION   = 10
+DOWNVOTE_REPUTATION = -2
+
+
+def _received_vote_points(model, target_column):
+    """Points from votes on *model* rows authored by the outer ``User``."""
+    points = db.case((Vote.vote_type == VoteType.UP, UPVOTE_REPUTATION),
+                     else_=DOWNVOTE_REPUTATION)
+    # correlated per author: (user_id, …) index, then votes by target
+    return (db.select(db.func.coalesce(db.func.sum(points), 0))
+            .select_from(model)
+            .join(Vote, target_column == model.id)
+            .where(model.user_id == User.id)
+            .correlate(User)
+            .scalar_subquery())
+
+
+def recalculate(user_ids=None) -> int:
+    """Recompute reputation from votes in one set‑based UPDATE; returns rows.
+
+    Write‑behind deltas still in the ledger are left out (their flush adds
+    them), and the rows are locked first so a flush can't interleave.
+    """
+    total = (_received_vote_points(Question, Vote.question_id)
+             + _received_vote_points(Answer, Vote.answer_id)
+             - VoteDelta.pending_for("users", User))
+    lock = db.select(User.id).order_by(User.id).with_for_update()
+    stmt = db.update(User).values(reputation=total)
+    if user_ids is not None:
+        lock = lock.where(User.id.in_(user_ids))
+        stmt = stmt.where(User.id.in_(user_ids))
+    db.session.execute(lock)
+    updated = db.session.execute(stmt, execution_options={"synchronize_session": False}).rowcount
+    db.session.commit()
+    return updated
+
+
+@job("reputation.recalculate", concurrency=1)
+def recalculate_job(user_ids=None):
+    recalculate(user_ids)
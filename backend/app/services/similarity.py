@@ -0,0 +1,292 @@
+"""Near‑duplicate question lookup with an in‑memory MinHash / LSH index.
+
+Each question is reduced to a set of shingles – character trigrams of its
+title words plus the first few excerpt words – and a ``NUM_PERM`` MinHash
+signature. Signatures are split into ``BANDS`` bands of ``ROWS`` values; a
+query only compares against questions sharing at least one band bucket, so
+a lookup is ``BANDS`` dict probes plus a handful of signature comparisons
+instead of a text scan. With 32×4 bands, pairs above ~0.4 estimated Jaccard
+become candidates with high probability.
+
+The index lives in each process. The first lookup starts a background
+build (load the snapshot, then catch up) and lookups return nothing until it
+is ready, so no request waits on hashing every title. Hashing and bucketing
+run batch by batch through ``utils.run_blocking``, so under eventlet / gevent
+workers they happen on the native thread pool instead of stalling the hub. After that it is kept
+current incrementally: ``add`` / ``remove`` from this process's write paths,
+plus a catch‑up over ``id > last_id`` every ``SIMILARITY_REFRESH_SECONDS``
+for rows other processes wrote, skipped while another request is already
+catching up. It is pickled to ``instance/<SIMILARITY_SNAPSHOT>`` every
+``SIMILARITY_SNAPSHOT_SECONDS`` so a restart loads the snapshot and only
+catches up, rather than rehashing every title.
+"""
+import logging
+import os
+import pickle
+import random
+import re
+import threading
+import time
+import zlib
+from array import array
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.question import Question
+from ..utils import run_blocking
+from . import summaries
+
+log = logging.getLogger(__name__)
+
+NUM_PERM      = 128
+BANDS, ROWS   = 32, 4
+EXCERPT_WORDS = 8
+_PRIME        = 4294967311          # smallest prime above 2**32
+_MASK         = 0xFFFFFFFF
+FORMAT        = 1                   # bump when shingling / hashing changes
+
+_rng  = random.Random(20260101)     # fixed: signatures must match across processes
+_PERM = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it my of on or "
+    "the to what when where which why with you".split()
+)
+
+
+def shingles(title: str, excerpt: str = "") -> set:
+    words = [w for w in _WORD.findall(title.lower()) if w not in STOP_WORDS]
+    grams = {w[i:i + 3] for w in words for i in range(max(len(w) - 2, 1))}
+    body = [w for w in _WORD.findall(excerpt.lower()) if w not in STOP_WORDS]
+    grams.update("w:" + w for w in body[:EXCERPT_WORDS])
+    return grams
+
+
+def signature(grams) -> array:
+    hashes = [zlib.crc32(g.encode()) for g in grams] or [0]
+    return array("I", [min((a * h + b) % _PRIME for h in hashes) & _MASK for a, b in _PERM])
+
+
+def _band_keys(sig):
+    return [hash(tuple(sig[i * ROWS:(i + 1) * ROWS])) for i in range(BANDS)]
+
+
+def estimate(sig_a, sig_b) -> float:
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def _signatures(rows) -> list:
+    """``[(question_id, signature)]`` for ``(id, title, excerpt)`` rows."""
+    return [(question_id, signature(shingles(title, excerpt or "")))
+            for question_id, title, excerpt in rows]
+
+
+def _bucketize(sigs) -> list:
+    """Band buckets for ``{question_id: signature bytes}``."""
+    buckets = [{} for _ in range(BANDS)]
+    for question_id, raw in sigs.items():
+        sig = array("I")
+        sig.frombytes(raw)
+        for band, key in enumerate(_band_keys(sig)):
+            buckets[band].setdefault(key, []).append(question_id)
+    return buckets
+
+
+class SimilarityIndex:
+    def __init__(self):
+        self._lock      = threading.RLock()
+        self._sync_lock = threading.Lock()                 # one catch‑up at a time
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sigs      = {}                           # id -> signature bytes
+            self._buckets   = [{} for _ in range(BANDS)]   # band key -> [ids]
+            self.last_id    = 0
+            self.ready      = threading.Event()
+            self._building  = False
+            self._synced_at = 0.0
+            self._saved_at  = time.monotonic()
+            self._dirty     = False
+
+    def __len__(self):
+        return len(self._sigs)
+
+    # ── maintenance ─────────────────────────────────────────
+    def add(self, question_id, title, excerpt="") -> None:
+        self._put(question_id, signature(shingles(title, excerpt or "")))
+
+    def _put(self, question_id, sig) -> None:
+        with self._lock:
+            if question_id in self._sigs:
+                self._unlink(question_id)
+            self._sigs[question_id] = sig.tobytes()
+            for band, key in enumerate(_band_keys(sig)):
+                self._buckets[band].setdefault(key, []).append(question_id)
+            self._dirty = True
+
+    def remove(self, question_id) -> None:
+        with self._lock:
+            if question_id in self._sigs:
+                self._unlink(question_id)
+                del self._sigs[question_id]
+                self._dirty = True
+
+    def _unlink(self, question_id):
+        sig = array("I")
+        sig.frombytes(self._sigs[question_id])
+        for band, key in enumerate(_band_keys(sig)):
+            ids = self._buckets[band].get(key)
+            if ids and question_id in ids:
+                ids.remove(question_id)
+                if not ids:
+                    del self._buckets[band][key]
+
+    def catch_up(self, batch=1000) -> int:
+        """Index live questions with ``id > last_id`` (one PK range scan)."""
+        added = 0
+        result = db.session.execute(
+            db.select(Question.id, Question.title, Question.excerpt)
+            .where(Question.id > self.last_id, Question.deleted_at.is_(None))
+            .order_by(Question.id)
+            .execution_options(yield_per=batch)
+        )
+        for rows in result.partitions():
+            for question_id, sig in run_blocking(_signatures, rows):
+                self._put(question_id, sig)
+            self.last_id = rows[-1][0]     # only advanced here, in id order
+            added += len(rows)
+        self._synced_at = time.monotonic()
+        return added
+
+    # ── snapshots ───────────────────────────────────────────
+    @staticmethod
+    def snapshot_path():
+        name = current_app.config.get("SIMILARITY_SNAPSHOT")
+        return os.path.join(current_app.instance_path, name) if name else None
+
+    def save(self, path=None) -> bool:
+        path = path or self.snapshot_path()
+        if not path:
+            return False
+        with self._lock:
+            state = (FORMAT, NUM_PERM, BANDS, self.last_id, dict(self._sigs))
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)           # readers never see a partial file
+        return True
+
+    def load(self, path=None) -> bool:
+        path = path or self.snapshot_path()
+        if not path or not os.path.exists(path):
+            return False
+        with open(path, "rb") as fh:    # written by save() above; trusted
+            fmt, num_perm, bands, last_id, sigs = pickle.load(fh)
+        if (fmt, num_perm, bands) != (FORMAT, NUM_PERM, BANDS):
+            log.info("similarity snapshot %s has an old format, rebuilding", path)
+            return False
+        buckets = run_blocking(_bucketize, sigs)
+        with self._lock:
+            self._sigs, self._buckets = sigs, buckets
+            self.last_id = last_id
+        return True
+
+    def _maybe_snapshot(self):
+        interval = current_app.config.get("SIMILARITY_SNAPSHOT_SECONDS", 300)
+        if self._dirty and time.monotonic() - self._saved_at >= interval:
+            try:
+                self.save()
+            except OSError:
+                log.exception("similarity snapshot failed")
+
+    def build(self) -> None:
+        """Load the snapshot and catch up, then mark the index ready."""
+        with self._sync_lock:
+            if self.ready.is_set():
+                return
+            try:
+                self.load()
+            except (OSError, pickle.UnpicklingError, ValueError):
+                log.exception("similarity snapshot unreadable, rebuilding")
+            self.catch_up()
+            self.ready.set()
+
+    def start_build(self, app) -> None:
+        with self._lock:
+            if self._building or self.ready.is_set():
+                return
+            self._building = True
+        threading.Thread(target=self._build_in_background, args=(app,),
+                         name="similarity-build", daemon=True).start()
+
+    def _build_in_background(self, app) -> None:
+        started = time.monotonic()
+        try:
+            with app.app_context():
+                self.build()
+            log.info("similarity index ready: %d questions in %.1fs",
+                     len(self), time.monotonic() - started)
+        except Exception:
+            log.exception("similarity index build failed; the next lookup retries")
+        finally:
+            with self._lock:
+                self._building = False
+
+    def ensure_fresh(self) -> bool:
+        """Whether the index is ready; starts the build or a due catch‑up."""
+        if not self.ready.is_set():
+            self.start_build(current_app._get_current_object())
+            return False
+        if (time.monotonic() - self._synced_at
+                >= current_app.config.get("SIMILARITY_REFRESH_SECONDS", 5)
+                and self._sync_lock.acquire(blocking=False)):
+            try:
+                self.catch_up()
+            finally:
+                self._sync_lock.release()
+        self._maybe_snapshot()
+        return True
+
+    # ── lookup ──────────────────────────────────────────────
+    def query(self, title, excerpt="", limit=5, min_score=None, exclude=()):
+        """``[(question_id, score)]`` best first, scores in [0, 1]."""
+        if min_score is None:
+            min_score = current_app.config.get("SIMILARITY_MIN_SCORE", 0.3)
+        sig = signature(shingles(title, excerpt or ""))
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(_band_keys(sig)):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.difference_update(exclude)
+            scored = []
+            for question_id in candidates:
+                other = array("I")
+                other.frombytes(self._sigs[question_id])
+                score = estimate(sig, other)
+                if score >= min_score:
+                    scored.append((question_id, score))
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored[:limit]
+
+
+index = SimilarityIndex()
+
+
+def similar_questions(title, excerpt="", limit=5, exclude=()):
+    """Live near‑duplicates as ``[{"id", "title", "score"}]``; none until the
+    index has been built."""
+    if not index.ensure_fresh():
+        return []
+    # over‑fetch: the index may still hold questions deleted elsewhere
+    hits = index.query(title, excerpt, limit=limit * 2, exclude=exclude)
+    found = summaries.questions.get_many([question_id for question_id, _ in hits])
+    return [
+        {"id": question_id, "title": found[question_id].title, "score": round(score, 3)}
+        for question_id, score in hits if question_id in found
+    ][:limit]
@@ -0,0 +1,165 @@
+"""Process‑local hot‑set cache of question and user summaries.
+
+Popular questions and their authors are embedded in many responses; instead
+of ``Question.query.get`` / ``User.query.get`` per request, callers read
+compact ``__slots__`` records from a bounded LRU with a TTL::
+
+    summaries.questions.get(question_id)        # -> QuestionSummary | None
+    summaries.users.get_many(author_ids)        # -> {id: UserSummary}
+
+Misses for a ``get_many`` are loaded in one ``IN`` query. Write paths call
+``invalidate(id)`` after commit; the TTL bounds staleness for writes made
+by other processes. ``metrics()`` reports hits, misses and hit rate.
+
+A cache is just a loader ``fn(ids) -> {id: record}`` plus bounds, so other
+hot entities can be plugged in the same way.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.answer import Answer
+from ..models.question import Question
+from ..models.user import User
+
+
+class QuestionSummary:
+    __slots__ = ("id", "title", "author_id", "author_username", "score", "answer_count",
+                 "created_at")
+
+    def __init__(self, id, title, author_id, author_username, score, answer_count,
+                 created_at):
+        self.id              = id
+        self.title           = title
+        self.author_id       = author_id
+        self.author_username = author_username
+        self.score           = score
+        self.answer_count    = answer_count
+        self.created_at      = created_at     # lower bound for vote queries
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class UserSummary:
+    __slots__ = ("id", "username", "role", "is_active", "reputation")
+
+    def __init__(self, id, username, role, is_active, reputation):
+        self.id         = id
+        self.username   = username
+        self.role       = role
+        self.is_active  = is_active
+        self.reputation = reputation
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SummaryCache:
+    """Bounded LRU of ``id -> record`` with a per‑entry TTL."""
+
+    def __init__(self, name, loader, maxsize_key, ttl_key):
+        self.name        = name
+        self.loader      = loader
+        self.maxsize_key = maxsize_key
+        self.ttl_key     = ttl_key
+        self._entries    = OrderedDict()          # id -> (expires_at, record)
+        self._lock       = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def _bounds(self):
+        config = current_app.config
+        return config.get(self.maxsize_key, 1024), config.get(self.ttl_key, 30)
+
+    def get(self, id_):
+        return self.get_many((id_,)).get(id_)
+
+    def get_many(self, ids) -> dict:
+        """``{id: record}`` for *ids* that exist; misses cost one query."""
+        maxsize, ttl = self._bounds()
+        now, found, missing = time.monotonic(), {}, []
+        with self._lock:
+            for id_ in set(ids):
+                entry = self._entries.get(id_)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(id_)
+                    found[id_] = entry[1]
+                else:
+                    missing.append(id_)
+            self.hits   += len(found)
+            self.misses += len(missing)
+        if not missing:
+            return found
+
+        loaded = self.loader(missing)
+        found.update(loaded)
+        if maxsize <= 0:                      # cache disabled
+            return found
+        expires = time.monotonic() + ttl
+        with self._lock:
+            for id_, record in loaded.items():
+                self._entries[id_] = (expires, record)
+                self._entries.move_to_end(id_)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return found
+
+    def invalidate(self, *ids) -> None:
+        with self._lock:
+            for id_ in ids:
+                self._entries.pop(id_, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+# ── loaders ───────────────────────────────────────────────
+def _load_questions(ids) -> dict:
+    answer_count = (
+        db.select(db.func.count(Answer.id))
+        .where(Answer.question_id == Question.id, Answer.deleted_at.is_(None))
+        .correlate(Question)
+        .scalar_subquery()
+    )
+    rows = db.session.execute(
+        db.select(Question.id, Question.title, Question.user_id, User.username,
+                  Question.score, answer_count, Question.created_at)
+        .outerjoin(User, User.id == Question.user_id)
+        .where(Question.id.in_(ids), Question.deleted_at.is_(None))
+    )
+    return {row[0]: QuestionSummary(*row) for row in rows}
+
+
+def _load_users(ids) -> dict:
+    rows = db.session.execute(
+        db.select(User.id, User.username, User.role, User.is_active, User.reputation)
+        .where(User.id.in_(ids))
+    )
+    return {row[0]: UserSummary(*row) for row in rows}
+
+
+questions = SummaryCache("questions", _load_questions,
+                         "SUMMARY_CACHE_SIZE", "SUMMARY_CACHE_TTL")
+users     = SummaryCache("users", _load_users,
+                         "SUMMARY_CACHE_SIZE", "SUMMARY_CACHE_TTL")
+
+
+def metrics() -> dict:
+    return {"questions": questions.metrics(), "users": users.metrics()}
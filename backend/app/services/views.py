@@ -0,0 +1,208 @@
+"""Question view counts and approximate unique viewers, flushed in bulk.
+
+Reading a question calls :func:`record`, which only touches this process's
+:class:`ViewBuffer`: a per‑question counter plus a HyperLogLog of the
+viewers seen since the last flush. Every ``VIEW_FLUSH_SECONDS`` (or as soon
+as ``VIEW_BUFFER_MAX`` views are waiting) the flusher thread writes it with one
+``SELECT … FOR UPDATE`` of the stored sketches and one executemany
+``UPDATE`` that adds the counts and stores the merged sketches – so a read
+never becomes a write, and a hot question costs one row update per flush.
+
+Sketches use ``2**PRECISION`` one‑byte registers (≈3% standard error) and
+are stored sparse while few registers are set, so a rarely viewed question
+keeps a few bytes rather than a kilobyte. ``unique_viewers`` holds the
+estimate so listings can sort on it without decoding sketches.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import Counter
+
+from flask import current_app
+
+from ..extensions import db
+from ..models.question import Question
+
+log = logging.getLogger(__name__)
+
+PRECISION = 10                      # changing it invalidates stored sketches
+_M        = 1 << PRECISION
+_REST     = 64 - PRECISION
+_DENSE, _SPARSE = b"\x01", b"\x02"
+
+
+class HyperLogLog:
+    __slots__ = ("registers",)
+
+    def __init__(self, registers=None):
+        self.registers = registers if registers is not None else bytearray(_M)
+
+    def add(self, key: str) -> None:
+        h = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+        index, rest = h >> _REST, h & ((1 << _REST) - 1)
+        rank = _REST - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / _M)
+        raw = alpha * _M * _M / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * _M and zeros:
+            return round(_M * math.log(_M / zeros))     # linear counting
+        return round(raw)
+
+    def to_bytes(self) -> bytes:
+        """Sparse ``(index, rank)`` pairs while shorter, else the dense registers."""
+        nonzero = [(i, r) for i, r in enumerate(self.registers) if r]
+        if 3 * len(nonzero) < _M:
+            return _SPARSE + b"".join(i.to_bytes(2, "big") + bytes((r,)) for i, r in nonzero)
+        return _DENSE + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, raw) -> "HyperLogLog":
+        if not raw:
+            return cls()
+        kind, body = raw[:1], raw[1:]
+        if kind == _DENSE:
+            return cls(bytearray(body))
+        registers = bytearray(_M)
+        for pos in range(0, len(body), 3):
+            registers[int.from_bytes(body[pos:pos + 2], "big")] = body[pos + 2]
+        return cls(registers)
+
+
+class ViewBuffer:
+    """Views since the last flush: ``{question_id: count}`` and sketches."""
+
+    def __init__(self):
+        self._lock       = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._app        = None
+        self._stop       = None
+        self._wake       = threading.Event()
+        self.reset()
+
+    def reset(self) -> None:
+        """Stop the flusher thread and forget buffered views (tests)."""
+        with self._lock:
+            if self._stop is not None:
+                self._stop.set()
+                self._wake.set()
+            self._app = self._stop = None
+            self._wake = threading.Event()
+            self._counts, self._sketches, self.pending = Counter(), {}, 0
+            self.flushes = self.rows_written = 0
+
+    def add(self, question_id, viewer) -> int:
+        with self._lock:
+            self._counts[question_id] += 1
+            sketch = self._sketches.get(question_id)
+            if sketch is None:
+                sketch = self._sketches[question_id] = HyperLogLog()
+            sketch.add(viewer)
+            self.pending += 1
+            return self.pending
+
+    def wake(self) -> None:
+        """Have the flusher thread write now instead of at its next tick."""
+        self._wake.set()
+
+    def drain(self):
+        with self._lock:
+            counts, sketches = self._counts, self._sketches
+            self._counts, self._sketches, self.pending = Counter(), {}, 0
+        return counts, sketches
+
+    def flush(self) -> int:
+        """Add buffered counts and merge sketches; returns questions written."""
+        with self._flush_lock:
+            counts, sketches = self.drain()
+            if not counts:
+                return 0
+            ids = sorted(counts)
+            try:
+                stored = dict(db.session.execute(
+                    db.select(Question.id, Question.viewers_hll)
+                    .where(Question.id.in_(ids))
+                    .order_by(Question.id)
+                    .with_for_update()          # sketches are read‑modify‑write
+                ).all())
+                params = []
+                for question_id in ids:
+                    if question_id not in stored:       # purged meanwhile
+                        continue
+                    sketch = HyperLogLog.from_bytes(stored[question_id]).merge(sketches[question_id])
+                    params.append({"row_id": question_id, "views": counts[question_id],
+                                   "hll": sketch.to_bytes(), "unique": sketch.estimate()})
+                if params:
+                    db.session.execute(_add_views, params)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                with self._lock:                # keep the views for the next flush
+                    for question_id in ids:
+                        self._counts[question_id] += counts[question_id]
+                        mine = self._sketches.get(question_id)
+                        self._sketches[question_id] = (
+                            mine.merge(sketches[question_id]) if mine else sketches[question_id])
+                        self.pending += counts[question_id]
+                raise
+            self.flushes += 1
+            self.rows_written += len(params)
+            return len(params)
+
+    def ensure_started(self, app) -> None:
+        with self._lock:
+            if self._app is not None:
+                return
+            self._app, stop = app, threading.Event()
+            self._stop = stop
+        threading.Thread(target=self._run, args=(app, stop, self._wake), name="view-buffer",
+                         daemon=True).start()
+
+    def _run(self, app, stop, wake) -> None:
+        while True:
+            wake.wait(app.config.get("VIEW_FLUSH_SECONDS", 10))
+            wake.clear()
+            if stop.is_set():
+                return
+            try:
+                with app.app_context():
+                    self.flush()
+            except Exception:
+                log.exception("view count flush failed; views kept for the next one")
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"pending": self.pending, "questions": len(self._counts),
+                    "flushes": self.flushes, "rows_written": self.rows_written}
+
+
+_table = Question.__table__
+_add_views = (
+    db.update(_table)
+    .where(_table.c.id == db.bindparam("row_id"))
+    .values(view_count=_table.c.view_count + db.bindparam("views"),
+            viewers_hll=db.bindparam("hll"),
+            unique_viewers=db.bindparam("unique"))
+)
+
+buffer = ViewBuffer()
+
+
+def record(question_id, viewer) -> None:
+    """Count one view of *question_id* by *viewer* (an opaque, stable key).
+
+    Never writes: a full buffer only wakes the flusher thread, so a failing
+    flush cannot turn a read into an error.
+    """
+    buffer.ensure_started(current_app._get_current_object())
+    if buffer.add(question_id, viewer) >= current_app.config.get("VIEW_BUFFER_MAX", 5000):
+        buffer.wake()
@@ -1,16 +1,76 @@
+import html as html_lib
+import re
+import sys
+import threading
+
 from flask import jsonify
-import bleach
 
 ALLOWED_TAGS = [
     "p", "b", "i", "u", "pre", "code", "ul", "ol", "li", "blockquote", "a", "h1", "h2", "h3"
 ]
 
+_local = threading.local()
+
+
+def _cleaner(tags: tuple):
+    """One Cleaner per thread and tag set – bleach.clean() rebuilds it on
+    every call, and a Cleaner is not thread‑safe to share.
+
+    bleach (and html5lib) are imported here, on the first post, not at startup.
+    """
+    cleaners = getattr(_local, "cleaners", None)
+    if cleaners is None:
+        cleaners = _local.cleaners = {}
+    cleaner = cleaners.get(tags)
+    if cleaner is None:
+        from bleach.sanitizer import Cleaner
+        cleaner = cleaners[tags] = Cleaner(tags=list(tags), strip=True)
+    return cleaner
+
+_BLOCK_BREAK = re.compile(r"</(?:p|li|pre|blockquote|h[1-3])>|<br\s*/?>", re.I)
+_WHITESPACE  = re.compile(r"\s+")
+
 def sanitize_html(html: str) -> str:
     """Remove dangerous tags / attrs from rich‑text input."""
-    return bleach.clean(html, tags=ALLOWED_TAGS, strip=True)
+    return _cleaner(tuple(ALLOWED_TAGS)).clean(html)
+
+
+def html_to_text(html: str) -> str:
+    """Plain‑text rendering of (already sanitized) HTML."""
+    text = _cleaner(()).clean(_BLOCK_BREAK.sub(" ", html))
+    return _WHITESPACE.sub(" ", html_lib.unescape(text)).strip()
+
+
+def excerpt(text: str, length: int = 200) -> str:
+    """First *length* chars of plain text, cut at a word boundary."""
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    space = cut.rfind(" ")
+    if space > length // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def run_blocking(fn, *args, **kwargs):
+    """Run a CPU‑bound call without stalling the green‑thread hub.
+
+    Under eventlet / gevent the call is handed to the hub's native thread
+    pool so other greenlets keep being served; with plain OS threads it
+    simply runs inline.
+    """
+    if "eventlet" in sys.modules:
+        from eventlet import patcher, tpool
+        if patcher.is_monkey_patched("thread"):
+            return tpool.execute(fn, *args, **kwargs)
+    if "gevent" in sys.modules:
+        from gevent import get_hub, monkey
+        if monkey.is_module_patched("threading"):
+            return get_hub().threadpool.apply(fn, args, kwargs)
+    return fn(*args, **kwargs)
 
 
 def error_response(message, status_code):
     response = jsonify({"error": message})
     response.status_code = status_code
-    return response
\ No newline at end of file
+    return response
@@ -0,0 +1,87 @@
+"""Bytes and query time per page of GET /api/questions, full body vs excerpt.
+
+Usage:
+    python benchmarks/bench_list_payload.py [--rows 2000] [--body-chars 8000] [--repeat 20]
+
+Seeds an in-memory SQLite DB with long posts, then for the newest --page
+questions measures:
+  * full content: the old list select (every body read and shipped)
+  * excerpt: the stored excerpt + content_length columns
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URI", "sqlite://")
+
+from app import create_app                      # noqa: E402
+from app.extensions import db                   # noqa: E402
+from app.models import Question, User           # noqa: E402
+from app.serializers import (                   # noqa: E402
+    QUESTION, RowSerializer, iso, question_vote_count,
+)
+
+FULL = RowSerializer(
+    ("id",         Question.id),
+    ("title",      Question.title),
+    ("content",    Question.content),
+    ("user_id",    Question.user_id),
+    ("created_at", Question.created_at, iso),
+    ("votes",      question_vote_count),
+)
+
+
+def seed(rows, body_chars):
+    user = User(username="bench", email="bench@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    text = ("lorem ipsum dolor sit amet " * (body_chars // 27 + 1))[:body_chars]
+    db.session.add_all([
+        Question(title=f"Question {i}", content=f"<p>{text}</p>",
+                 content_text=text, user_id=user.id)
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def measure(app, serializer, page, repeat):
+    stmt = (serializer.select()
+            .where(Question.deleted_at.is_(None))
+            .order_by(Question.created_at.desc())
+            .limit(page))
+    query_s = encode_s = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = db.session.execute(stmt).all()
+        mid = time.perf_counter()
+        body = app.json.dumps_bytes({"questions": serializer.many(rows)})
+        query_s += mid - start
+        encode_s += time.perf_counter() - mid
+    return len(body), query_s / repeat, encode_s / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--body-chars", type=int, default=8000)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.rows, args.body_chars)
+        results = [
+            ("full content", measure(app, FULL, args.page, args.repeat)),
+            ("excerpt", measure(app, QUESTION, args.page, args.repeat)),
+        ]
+    print(f"{'payload':<16}{'bytes/page':>12}{'query ms':>10}{'encode ms':>11}")
+    for name, (size, query_s, encode_s) in results:
+        print(f"{name:<16}{size:>12}{query_s * 1000:>10.2f}{encode_s * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
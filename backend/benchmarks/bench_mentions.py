@@ -0,0 +1,140 @@
+"""Mention handling for posts with many ``@username`` mentions.
+
+Usage:
+    python benchmarks/bench_mentions.py [--users 20000] [--posts 200]
+        [--mentions 20] [--database-uri postgresql://.../bench]
+
+Compares, per post:
+
+* naive – a regex over ``@\\w+``, one ``User.query.filter_by(username=…)``
+  per token and one ``create_notification`` (INSERT + commit) per user;
+* trie  – :mod:`app.services.mentions`: trie scan, one ``IN`` lookup and
+  one bulk INSERT.
+
+Half the mentions in each post name real users, the rest are near misses
+(``@<user>x``) that the naive path still looks up. Reports posts/s, p50 /
+p99 latency, statements per post and checks both paths stored the same
+notifications. The default database is a temporary SQLite file; the tables
+are dropped and recreated.
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{_tmp.name}/bench.db")
+os.environ["SOCKETIO_ENABLED"] = "0"
+
+from sqlalchemy import event                          # noqa: E402
+
+from app import create_app                            # noqa: E402
+from app.extensions import db                         # noqa: E402
+from app.models import Notification, User             # noqa: E402
+from app.services import mentions                     # noqa: E402
+from app.services.notifications import create_notification  # noqa: E402
+
+_TOKEN = re.compile(r"@(\w+)")
+
+
+def seed(users):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(db.insert(User), [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x"}
+        for i in range(users)])
+    db.session.commit()
+
+
+def make_posts(args):
+    rng = random.Random(42)
+    posts = []
+    for _ in range(args.posts):
+        names = [f"user{rng.randrange(1, args.users)}" for _ in range(args.mentions)]
+        words = [f"@{n}" if i % 2 else f"@{n}x" for i, n in enumerate(names)]
+        posts.append(" lorem ipsum ".join(words))
+    return posts
+
+
+def naive(text):
+    seen = set()
+    for token in _TOKEN.findall(text):
+        user = User.query.filter_by(username=token).first()
+        if user is not None and user.id != 0 and user.id not in seen:
+            seen.add(user.id)
+            create_notification(user_id=user.id, message='user0 mentioned you in "Q"')
+
+
+def trie(text):
+    mentions.notify_mentions(text, author_id=0, author_name="user0", title="Q")
+
+
+def run(app, name, fn, posts, args):
+    with app.app_context():
+        seed(args.users)
+        mentions.index.reset()
+        mentions.index.build()                # build outside the timing
+        statements = [0]
+
+        def count(*_):
+            statements[0] += 1
+
+        event.listen(db.engine, "before_cursor_execute", count)
+        latencies = []
+        try:
+            for text in posts:
+                start = time.perf_counter()
+                fn(text)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        stored = sorted(db.session.scalars(db.select(Notification.user_id)))
+    latencies.sort()
+    return {
+        "posts/s": len(latencies) / sum(latencies),
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "stmts/post": statements[0] / len(posts),
+    }, stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--mentions", type=int, default=20)
+    parser.add_argument("--database-uri")
+    args = parser.parse_args()
+    if args.database_uri:
+        os.environ["DATABASE_URI"] = args.database_uri
+
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = os.environ["DATABASE_URI"]
+        RATELIMIT_ENABLED = False
+        SOCKETIO_ENABLED = False
+        MENTION_MAX_PER_POST = args.mentions
+
+    app = create_app(BenchConfig)
+    posts = make_posts(args)
+    results = [(name, *run(app, name, fn, posts, args))
+               for name, fn in (("naive", naive), ("trie", trie))]
+
+    print(f"{args.posts} posts × {args.mentions} mentions, {args.users} users, "
+          f"{BenchConfig.SQLALCHEMY_DATABASE_URI}")
+    print(f"{'path':<8}{'posts/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'stmts/post':>12}")
+    for name, r, _ in results:
+        print(f"{name:<8}{r['posts/s']:>9.0f}{r['p50 ms']:>9.2f}{r['p99 ms']:>9.2f}"
+              f"{r['stmts/post']:>12.1f}")
+    print("same notifications:", results[0][2] == results[1][2])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Login throughput per core for different password hash settings.
+
+Usage:
+    python benchmarks/bench_password_hashing.py [--seconds 3] [--threads N]
+        [--method pbkdf2:sha256:600000 --method scrypt:32768:8:1]
+
+Each method is measured twice: verifying on one thread, and verifying on
+N threads at once. hashlib releases the GIL while hashing, so the threaded
+figure shows how far login scales once hashing runs on a native thread pool
+rather than on the event loop.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+BEFORE = "pbkdf2:sha256:600000"   # werkzeug 2.3 default (pre‑change)
+AFTER  = "scrypt:32768:8:1"       # PASSWORD_HASH_METHOD default
+
+
+def _verify_loop(pwhash, password, deadline):
+    n = 0
+    while time.perf_counter() < deadline:
+        check_password_hash(pwhash, password)
+        n += 1
+    return n
+
+
+def measure(method, seconds, threads):
+    password = "Correct-Horse-9"
+    pwhash = generate_password_hash(password, method=method)
+    deadline = time.perf_counter() + seconds
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        done = sum(pool.map(lambda _: _verify_loop(pwhash, password, deadline),
+                            range(threads)))
+    return done / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--method", action="append")
+    args = parser.parse_args()
+
+    methods = args.method or [BEFORE, AFTER]
+    cores = os.cpu_count() or 1
+    print(f"{'method':<26}{'threads':>8}{'logins/s':>12}{'per core':>12}")
+    for method in methods:
+        for threads in sorted({1, args.threads}):
+            rate = measure(method, args.seconds, threads)
+            per_core = rate / min(threads, cores)
+            print(f"{method:<26}{threads:>8}{rate:>12.1f}{per_core:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
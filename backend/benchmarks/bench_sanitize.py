@@ -0,0 +1,54 @@
+"""Sanitize cost per post for a range of content sizes.
+
+Usage:
+    python benchmarks/bench_sanitize.py [--repeat 20]
+
+Compares the old per-call ``bleach.clean`` with the prebuilt cleaners that
+``services.content.render_post`` uses (sanitized HTML + plain text).
+"""
+import argparse
+import os
+import sys
+import time
+
+import bleach
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from app.utils import ALLOWED_TAGS, html_to_text, sanitize_html  # noqa: E402
+
+SIZES = [256, 1024, 8 * 1024, 64 * 1024, 256 * 1024]
+
+PARAGRAPH = (
+    "<p>How do I <b>join</b> two tables in <code>SQLAlchemy</code>?</p>"
+    "<pre>session.query(A).join(B)</pre><script>alert('x')</script>"
+    "<ul><li>one</li><li><a href='#' onclick='x()'>two</a></li></ul>"
+)
+
+
+def make_post(size):
+    return (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':>8}{'bleach.clean ms':>18}{'Cleaner ms':>14}{'+text ms':>12}")
+    for size in SIZES:
+        post = make_post(size)
+        old = timed(lambda: bleach.clean(post, tags=ALLOWED_TAGS, strip=True), args.repeat)
+        new = timed(lambda: sanitize_html(post), args.repeat)
+        both = timed(lambda: html_to_text(sanitize_html(post)), args.repeat)
+        print(f"{size:>8}{old:>18.3f}{new:>14.3f}{both:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
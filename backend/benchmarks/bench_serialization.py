@@ -0,0 +1,84 @@
+"""Serialization throughput for 1k-row list payloads.
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 1000] [--repeat 20]
+
+Seeds an in-memory SQLite DB, then times query + encode per page for:
+  * to_dict() per ORM object + stdlib json (the old list path)
+  * marshmallow SQLAlchemyAutoSchema(many=True) + stdlib json
+  * RowSerializer over column tuples + FastJSONProvider (orjson)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URI", "sqlite://")
+
+from app import create_app                      # noqa: E402
+from app.extensions import db                   # noqa: E402
+from app.models import Question, User           # noqa: E402
+from app.schemas.question import QuestionSchema  # noqa: E402
+from app.serializers import QUESTION            # noqa: E402
+
+
+def seed(rows):
+    user = User(username="bench", email="bench@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    db.session.bulk_save_objects([
+        Question(title=f"Question {i}", content="<p>body</p>" * 20,
+                 content_text="body " * 20, user_id=user.id)
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def old_path():
+    questions = Question.query.order_by(Question.created_at.desc()).all()
+    return json.dumps({"questions": [q.to_dict() for q in questions]})
+
+
+def schema_path(schema):
+    questions = Question.query.order_by(Question.created_at.desc()).all()
+    return json.dumps({"questions": schema.dump(questions)}, default=str)
+
+
+def new_path(app):
+    rows = db.session.execute(QUESTION.select().order_by(Question.created_at.desc())).all()
+    return app.json.dumps_bytes({"questions": QUESTION.many(rows)})
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+        db.session.expire_all()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+        schema = QuestionSchema(many=True)
+        results = [
+            ("to_dict + json", timed(old_path, args.repeat)),
+            ("marshmallow many", timed(lambda: schema_path(schema), args.repeat)),
+            ("RowSerializer + orjson", timed(lambda: new_path(app), args.repeat)),
+        ]
+    print(f"{'path':<26}{'ms/page':>10}{'rows/s':>12}")
+    for name, secs in results:
+        print(f"{name:<26}{secs * 1000:>10.2f}{args.rows / secs:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Concurrent votes on one question: inline counters vs write‑behind buffer.
+
+Usage:
+    python benchmarks/bench_vote_contention.py [--threads 16] [--votes 2000]
+        [--database-uri postgresql://.../bench]
+
+Every vote comes from a different user and targets the same question, so in
+inline mode each request updates the same question and author rows. For
+each mode the script reports throughput, p50 / p99 latency and failed
+requests, then checks the stored score against the votes table.
+
+The default database is a temporary SQLite file, where writers are
+serialised by the file lock anyway; point --database-uri at a scratch
+PostgreSQL database to see row‑lock waits. The tables are dropped and
+recreated there.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{_tmp.name}/bench.db")
+os.environ["SOCKETIO_ENABLED"] = "0"
+
+from flask_jwt_extended import create_access_token   # noqa: E402
+
+from app import create_app                            # noqa: E402
+from app.extensions import db                         # noqa: E402
+from app.models import Question, User                 # noqa: E402
+from app.services import counters                     # noqa: E402
+
+
+def seed(voters):
+    db.drop_all()
+    db.create_all()
+    db.session.add(User(username="author", email="author@example.com", password_hash="x"))
+    db.session.add_all([User(username=f"v{i}", email=f"v{i}@example.com", password_hash="x")
+                        for i in range(voters)])
+    db.session.add(Question(title="Viral", content="c", content_text="c", user_id=1))
+    db.session.commit()
+    return [create_access_token(identity=i) for i in range(2, voters + 2)]
+
+
+def fire(app, tokens, threads):
+    latencies, failures, lock = [], [0], threading.Lock()
+
+    def worker(batch):
+        client = app.test_client()
+        for token in batch:
+            start = time.perf_counter()
+            resp = client.post("/api/votes/", json={"question_id": 1, "vote_type": "up"},
+                               headers={"Authorization": f"Bearer {token}"})
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                failures[0] += resp.status_code != 200
+
+    pool = [threading.Thread(target=worker, args=(tokens[i::threads],)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, sorted(latencies), failures[0]
+
+
+def run(app, mode, args):
+    app.config["VOTE_WRITE_BEHIND"] = mode == "write-behind"
+    with app.app_context():
+        tokens = seed(args.votes)
+    wall, latencies, failed = fire(app, tokens, args.threads)
+    with app.app_context():
+        counters.buffer.flush()
+        counters.buffer.reset()
+        stored = db.session.get(Question, 1).score
+    return {
+        "votes/s": len(latencies) / wall,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "failed": failed,
+        "score ok": stored == len(latencies) - failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--votes", type=int, default=2000)
+    parser.add_argument("--database-uri")
+    parser.add_argument("--flush-ms", type=int, default=200)
+    args = parser.parse_args()
+    if args.database_uri:
+        os.environ["DATABASE_URI"] = args.database_uri
+
+    from app.config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = os.environ["DATABASE_URI"]
+        RATELIMIT_ENABLED = False
+        SOCKETIO_ENABLED = False
+        VOTE_BUFFER_FLUSH_MS = args.flush_ms
+
+    app = create_app(BenchConfig)
+    results = [(mode, run(app, mode, args)) for mode in ("inline", "write-behind")]
+
+    print(f"{args.votes} votes, {args.threads} threads, {BenchConfig.SQLALCHEMY_DATABASE_URI}")
+    print(f"{'mode':<14}{'votes/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'failed':>8}{'score ok':>10}")
+    for mode, r in results:
+        print(f"{mode:<14}{r['votes/s']:>9.0f}{r['p50 ms']:>9.2f}{r['p99 ms']:>9.2f}"
+              f"{r['failed']:>8}{str(r['score ok']):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Mixed read / write / websocket load against each ASYNC_MODE under gunicorn.
+
+Usage:
+    python benchmarks/bench_worker_modes.py [--modes threading,gevent,eventlet]
+        [--clients 64] [--duration 20] [--write-ratio 0.2] [--ws-clients 50]
+        [--lock-votes-ms 0] --database-uri postgresql://.../bench
+
+For each mode the harness seeds the database, starts
+``gunicorn -c gunicorn.conf.py wsgi:app`` with that ASYNC_MODE (so worker
+class and DB pool come from the deployment config), then runs for
+``--duration`` seconds:
+
+* ``--clients`` HTTP clients on keep‑alive connections, each request a
+  read (question page, listing by views) or – with ``--write-ratio`` – a
+  write (vote toggle, answer);
+* ``--ws-clients`` Socket.IO clients in question rooms, timing how long a
+  posted answer takes to arrive as a live ``question_delta``
+  (includes ``LIVE_COALESCE_MS``, set to 50 here).
+
+``--lock-votes-ms`` holds an exclusive lock on ``votes`` for that long once a
+second from a separate connection: votes wait on it, and with a blocking
+driver a green worker's reads wait with them. Reports requests/s, p50 / p99
+for reads and writes, errors, and websocket delivery p50 / p99.
+
+Use a scratch PostgreSQL database – its tables are dropped and recreated.
+SQLite serialises writers and cannot show pool behaviour. Modes whose
+library is not installed are skipped, as is the websocket part without
+``python-socketio[client]``.
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+HERE = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, HERE)
+os.environ["SOCKETIO_ENABLED"] = "0"          # seeding only; gunicorn gets its own env
+
+from flask_jwt_extended import create_access_token   # noqa: E402
+
+from app import create_app                            # noqa: E402
+from app.config import Config                         # noqa: E402
+from app.extensions import db                         # noqa: E402
+from app.models import Question, User                 # noqa: E402
+
+MODE_LIBRARIES = {"threading": None, "gevent": "gevent", "eventlet": "eventlet"}
+QUESTIONS = 200
+
+
+def seed(database_uri, users):
+    class SeedConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SOCKETIO_ENABLED = False
+
+    app = create_app(SeedConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(db.insert(User), [
+            {"username": f"u{i}", "email": f"u{i}@example.com", "password_hash": "x"}
+            for i in range(1, users + 1)])
+        db.session.execute(db.insert(Question), [
+            {"title": f"Question {i}", "content": "c", "content_text": "c",
+             "user_id": i % users + 1}
+            for i in range(QUESTIONS)])
+        db.session.commit()
+        tokens = [create_access_token(identity=i) for i in range(1, users + 1)]
+        db.engine.dispose()
+    return tokens
+
+
+def start_server(mode, args):
+    env = {**os.environ, "ASYNC_MODE": mode, "DATABASE_URI": args.database_uri,
+           "PORT": str(args.port), "SOCKETIO_ENABLED": "1", "RATELIMIT_ENABLED": "0",
+           "LIVE_COALESCE_MS": "50", "WEB_CONCURRENCY": "1"}
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+                             "--log-level", "warning", "--access-logfile", "",
+                             "wsgi:app"],
+                            cwd=HERE, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", args.port, timeout=2)
+            conn.request("GET", "/api/questions/1")
+            conn.getresponse().read()
+            return proc
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("gunicorn did not come up")
+
+
+def stop_server(proc):
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+class Load:
+    def __init__(self, args, tokens):
+        self.args, self.tokens = args, tokens
+        self.lock = threading.Lock()
+        self.reads, self.writes, self.errors = [], [], 0
+        self.posted = {}                    # answer id -> perf_counter at request start
+        self.arrivals = []                  # (answer id, perf_counter) per client
+        self.stop = threading.Event()
+
+    def request(self, conn, method, path, body=None, token=None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                     headers=headers)
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+
+    def client(self, seed_):
+        rng = random.Random(seed_)
+        conn = http.client.HTTPConnection("127.0.0.1", self.args.port, timeout=30)
+        while not self.stop.is_set():
+            question_id = rng.randrange(1, QUESTIONS + 1)
+            token = rng.choice(self.tokens)
+            write = rng.random() < self.args.write_ratio
+            start = time.perf_counter()
+            try:
+                if not write:
+                    path = (f"/api/questions/{question_id}/full" if rng.random() < 0.8
+                            else "/api/questions?sort=views")
+                    status, _ = self.request(conn, "GET", path)
+                elif rng.random() < 0.7:
+                    status, _ = self.request(conn, "POST", "/api/votes/",
+                                             {"question_id": question_id, "vote_type": "up"}, token)
+                else:
+                    status, body = self.request(
+                        conn, "POST", f"/api/questions/{question_id}/answers",
+                        {"content": "benchmark answer"}, token)
+                    if status == 201:
+                        with self.lock:
+                            self.posted[json.loads(body)["id"]] = start
+            except (OSError, http.client.HTTPException):
+                status = 0
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", self.args.port, timeout=30)
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                (self.writes if write else self.reads).append(elapsed)
+                self.errors += not 200 <= status < 300
+
+    def lock_votes(self):
+        from sqlalchemy import create_engine
+
+        engine = create_engine(self.args.database_uri)
+        while not self.stop.wait(1):
+            with engine.begin() as conn:
+                conn.exec_driver_sql("LOCK TABLE votes IN ACCESS EXCLUSIVE MODE")
+                time.sleep(self.args.lock_votes_ms / 1000)
+        engine.dispose()
+
+    def ws_clients(self):
+        import socketio
+
+        clients = []
+        for i in range(self.args.ws_clients):
+            sio = socketio.Client(reconnection=False)
+
+            @sio.on("question_delta", namespace="/questions")
+            def on_delta(delta):
+                now = time.perf_counter()
+                with self.lock:
+                    self.arrivals.extend((answer_id, now)
+                                         for answer_id in delta.get("new_answer_ids", ()))
+
+            sio.connect(f"http://127.0.0.1:{self.args.port}", namespaces=["/questions"],
+                        transports=["websocket"])
+            sio.emit("join_question", {"question_id": i % QUESTIONS + 1}, namespace="/questions")
+            clients.append(sio)
+        return clients
+
+
+def pct(values, q):
+    return values[min(int(len(values) * q), len(values) - 1)] * 1000 if values else float("nan")
+
+
+def run(mode, args):
+    tokens = seed(args.database_uri, args.users)
+    proc = start_server(mode, args)
+    load, ws = Load(args, tokens), []
+    try:
+        if args.ws_clients and importlib.util.find_spec("socketio") is not None:
+            ws = load.ws_clients()
+        threads = [threading.Thread(target=load.client, args=(i,)) for i in range(args.clients)]
+        if args.lock_votes_ms:
+            threads.append(threading.Thread(target=load.lock_votes))
+        for t in threads:
+            t.start()
+        time.sleep(args.duration)
+        load.stop.set()
+        for t in threads:
+            t.join()
+        time.sleep(0.5)                       # last coalesced deltas
+    finally:
+        for sio in ws:
+            sio.disconnect()
+        stop_server(proc)
+    reads, writes = sorted(load.reads), sorted(load.writes)
+    lags = sorted(at - load.posted[answer_id] for answer_id, at in load.arrivals
+                  if answer_id in load.posted)
+    return {
+        "req/s": (len(reads) + len(writes)) / args.duration,
+        "read p50": pct(reads, 0.5), "read p99": pct(reads, 0.99),
+        "write p50": pct(writes, 0.5), "write p99": pct(writes, 0.99),
+        "errors": load.errors,
+        "ws p50": pct(lags, 0.5), "ws p99": pct(lags, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default="threading,gevent,eventlet")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--ws-clients", type=int, default=50)
+    parser.add_argument("--lock-votes-ms", type=int, default=0)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--database-uri", default=os.getenv("DATABASE_URI"))
+    args = parser.parse_args()
+    if not args.database_uri:
+        parser.error("--database-uri (a scratch PostgreSQL database) is required")
+
+    results = []
+    for mode in args.modes.split(","):
+        library = MODE_LIBRARIES[mode]
+        if library and importlib.util.find_spec(library) is None:
+            print(f"skipping {mode}: {library} is not installed")
+            continue
+        results.append((mode, run(mode, args)))
+
+    print(f"{args.clients} clients, {args.write_ratio:.0%} writes, "
+          f"{args.ws_clients} websocket clients, {args.duration:.0f}s per mode")
+    columns = ["req/s", "read p50", "read p99", "write p50", "write p99", "errors",
+               "ws p50", "ws p99"]
+    print(f"{'mode':<11}" + "".join(f"{c:>11}" for c in columns))
+    for mode, r in results:
+        print(f"{mode:<11}" + "".join(f"{r[c]:>11.1f}" for c in columns))
+    print("latencies in ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""gunicorn settings derived from ASYNC_MODE (see app/concurrency.py).
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Kept free of app imports: the master must not load Flask before a gevent /
+eventlet worker patches the standard library.
+
+Socket.IO sessions live in one process, so keep WEB_CONCURRENCY=1 unless
+the load balancer is sticky and SOCKETIO_MESSAGE_QUEUE is set.
+"""
+import os
+
+_WORKER_CLASSES = {"threading": "gthread", "gevent": "gevent", "eventlet": "eventlet"}
+
+mode = os.environ.setdefault("ASYNC_MODE", "eventlet")     # same default as wsgi.py
+if mode not in _WORKER_CLASSES:
+    raise RuntimeError(f"ASYNC_MODE must be one of {sorted(_WORKER_CLASSES)}, not {mode!r}")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = _WORKER_CLASSES[mode]
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+threads = int(os.getenv("WORKER_THREADS", 8))                # gthread only
+worker_connections = int(os.getenv("WORKER_CONNECTIONS", 1000))  # green workers only
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
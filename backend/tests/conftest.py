@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.profiling import profiler
+from app.services import activity, counters, mentions, related, similarity, summaries, views
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URI", "sqlite://")
+    SOCKETIO_ENABLED = False
+    RATELIMIT_ENABLED = False
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"   # keep tests fast
+    INDEX_ADVISOR = os.getenv("INDEX_ADVISOR", "1") == "1"
+    SIMILARITY_SNAPSHOT = ""                      # no files from tests
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        similarity.index.build()        # empty; no background build threads in tests
+        mentions.index.build()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    # ids are reused by the next test's fresh database
+    summaries.questions.clear()
+    summaries.users.clear()
+    activity.first_pages.clear()
+    similarity.index.reset()
+    mentions.index.reset()
+    related.reset_cache()
+    counters.buffer.reset()
+    views.buffer.reset()
+    profiler.reset()
+
+
+def pytest_terminal_summary(terminalreporter):
+    from app.index_advisor import advisor
+    if advisor.findings:
+        terminalreporter.section("index advisor: full scans on large tables")
+        for line in advisor.report():
+            terminalreporter.write_line(line)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # INDEX_ADVISOR_STRICT=1 turns findings into a failed run (CI gate)
+    from app.index_advisor import advisor
+    if os.getenv("INDEX_ADVISOR_STRICT") == "1" and advisor.findings and exitstatus == 0:
+        session.exitstatus = 1
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Answer, Question, User, Vote, VoteType
+from app.services.activity import activity_page, decode_cursor
+
+
+def test_activity_merges_sources_and_paginates_by_cursor(app):
+    t0 = datetime(2026, 1, 1)
+    db.session.add_all([User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x")
+                        for i in (1, 2)])
+    db.session.flush()
+    q1 = Question(title="Q1", content="c", user_id=1, created_at=t0)
+    q2 = Question(title="Q2", content="c", user_id=2, created_at=t0 + timedelta(minutes=1))
+    db.session.add_all([q1, q2])
+    db.session.flush()
+    a1 = Answer(content="a", question_id=q2.id, user_id=1, created_at=t0 + timedelta(minutes=2))
+    db.session.add(a1)
+    db.session.flush()
+    db.session.add_all([
+        Vote(user_id=2, question_id=q1.id, recipient_id=1, vote_type=VoteType.UP,
+             created_at=t0 + timedelta(minutes=3)),
+        Vote(user_id=2, answer_id=a1.id, recipient_id=1, vote_type=VoteType.DOWN,
+             created_at=t0 + timedelta(minutes=2)),        # ties with the answer
+    ])
+    db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = activity_page(1, limit=2, cursor=cursor)
+        seen += [(i["type"], i["id"]) for i in page["items"]]
+        if page["next_cursor"] is None:
+            break
+        cursor = decode_cursor(page["next_cursor"])
+    assert seen == [("vote", 1), ("vote", 2), ("answer", 1), ("question", 1)]
+
+
+def test_activity_endpoint_rejects_bad_cursor(app):
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.commit()
+    client = app.test_client()
+    assert client.get("/api/users/1/activity").get_json() == {"items": [], "next_cursor": None}
+    assert client.get("/api/users/1/activity?cursor=zzz").status_code == 400
+    assert client.get("/api/users/9/activity").status_code == 404
+
+
+def test_activity_skips_rows_without_timestamp(app):
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.flush()
+    q1 = Question(title="Q1", content="c", user_id=1, created_at=datetime(2026, 1, 1))
+    q2 = Question(title="Q2", content="c", user_id=1)
+    db.session.add_all([q1, q2])
+    db.session.flush()
+    a1 = Answer(content="a", question_id=q1.id, user_id=1)
+    db.session.add(a1)
+    db.session.commit()
+    # rows from before created_at had a default
+    db.session.execute(db.update(Question).where(Question.id == q2.id).values(created_at=None))
+    db.session.execute(db.update(Answer).where(Answer.id == a1.id).values(created_at=None))
+    db.session.commit()
+
+    page = activity_page(1, limit=1)
+    assert [(i["type"], i["id"]) for i in page["items"]] == [("question", q1.id)]
+    assert page["next_cursor"] is None
+    assert app.test_client().get("/api/users/1/activity").status_code == 200
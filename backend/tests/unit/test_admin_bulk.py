@@ -0,0 +1,77 @@
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import AdminAudit, User
+
+
+def test_bulk_update_skips_caller_and_writes_one_audit_row(app):
+    db.session.add(User(username="root", email="root@example.com", password_hash="x", role="admin"))
+    db.session.add_all([User(username=f"spam{i}", email=f"s{i}@spam.biz", password_hash="x")
+                        for i in range(3)])
+    db.session.commit()
+    token = create_access_token(identity=1, additional_claims={"role": "admin"})
+
+    resp = app.test_client().put(
+        "/api/admin/users/bulk",
+        json={"ids": [1, 2, 3, 4], "set": {"is_active": False}},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code == 200
+    assert sorted(resp.get_json()["user_ids"]) == [2, 3, 4]
+    assert [db.session.get(User, i).is_active for i in (1, 2, 3, 4)] == [True, False, False, False]
+    assert [a.affected_ids for a in AdminAudit.query] == [resp.get_json()["user_ids"]]
+
+
+def test_bulk_update_requires_json_booleans(app):
+    db.session.add(User(username="root", email="root@example.com", password_hash="x", role="admin"))
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(
+        identity=1, additional_claims={"role": "admin"})}
+    client = app.test_client()
+
+    for body in ({"ids": [2], "set": {"is_active": "false"}},
+                 {"ids": [2], "set": {"is_active": 0}},
+                 {"filter": {"is_active": "false"}, "set": {"role": "admin"}}):
+        resp = client.put("/api/admin/users/bulk", json=body, headers=headers)
+        assert resp.status_code == 400, body
+        assert resp.get_json()["error"] == "is_active must be true or false"
+    assert db.session.get(User, 2).is_active is True
+    assert AdminAudit.query.count() == 0
+
+
+def test_bulk_update_requires_string_patterns(app):
+    db.session.add(User(username="root", email="root@example.com", password_hash="x", role="admin"))
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(
+        identity=1, additional_claims={"role": "admin"})}
+    client = app.test_client()
+
+    for key, value in (("username_prefix", 5), ("username_prefix", ["u"]),
+                       ("email_domain", {"d": 1}), ("email_domain", True)):
+        resp = client.put("/api/admin/users/bulk", headers=headers,
+                          json={"filter": {key: value}, "set": {"is_active": False}})
+        assert resp.status_code == 400, (key, value)
+        assert resp.get_json()["error"] == f"{key} must be a string"
+    assert db.session.get(User, 2).is_active is True
+    assert AdminAudit.query.count() == 0
+
+
+def test_deactivated_admin_is_refused_despite_a_cached_summary(app):
+    from app.services import summaries
+
+    db.session.add(User(username="root", email="root@example.com", password_hash="x", role="admin"))
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(
+        identity=1, additional_claims={"role": "admin"})}
+    body = {"ids": [2], "set": {"is_active": False}}
+    assert summaries.users.get(1).is_active            # cached in this process
+
+    # deactivated by another worker: this process' cache is not invalidated
+    db.session.execute(db.update(User).where(User.id == 1).values(is_active=False))
+    db.session.commit()
+    resp = app.test_client().put("/api/admin/users/bulk", json=body, headers=headers)
+    assert resp.status_code == 401
+    assert db.session.get(User, 2).is_active is True
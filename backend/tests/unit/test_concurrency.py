@@ -0,0 +1,27 @@
+import pytest
+
+from app.concurrency import check_driver, engine_options
+
+PG = "postgresql+psycopg2://u:p@db/stackit"
+
+
+def _config(mode, uri=PG, **overrides):
+    return {"ASYNC_MODE": mode, "SQLALCHEMY_DATABASE_URI": uri, "WORKER_THREADS": 8,
+            "DB_POOL_SIZE": None, "DB_MAX_OVERFLOW": None, "DB_POOL_TIMEOUT": 10, **overrides}
+
+
+def test_pool_follows_worker_model():
+    threaded = engine_options(_config("threading"))
+    assert (threaded["pool_size"], threaded["max_overflow"]) == (10, 0)   # 8 threads + flushers
+    green = engine_options(_config("gevent"))
+    assert (green["pool_size"], green["max_overflow"]) == (10, 10)
+    tuned = engine_options(_config("eventlet", DB_POOL_SIZE=4, DB_MAX_OVERFLOW=0))
+    assert (tuned["pool_size"], tuned["max_overflow"]) == (4, 0)
+
+    assert engine_options(_config("gevent", uri="sqlite://")) == {}
+    with pytest.raises(ValueError):
+        engine_options(_config("asyncio"))
+
+
+def test_unpatched_process_may_use_blocking_driver():
+    check_driver(_config("gevent"))        # CLI / tests: nothing patched, no psycopg2 needed
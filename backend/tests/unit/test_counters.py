@@ -0,0 +1,95 @@
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import Job, Question, User, Vote
+from app.services import counters
+
+
+def _seed():
+    db.session.add_all([User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x")
+                        for i in range(1, 5)])
+    db.session.add(Question(title="Hot", content="c", content_text="c", user_id=1))
+    db.session.commit()
+
+
+def _vote(client, user_id, vote_type="up"):
+    token = create_access_token(identity=user_id)
+    return client.post("/api/votes/", json={"question_id": 1, "vote_type": vote_type},
+                       headers={"Authorization": f"Bearer {token}"})
+
+
+def test_inline_counters_follow_vote_changes(app):
+    _seed()
+    client = app.test_client()
+    for user_id in (2, 3):
+        assert _vote(client, user_id).status_code == 200
+    _vote(client, 4, "down")
+    _vote(client, 3, "down")          # up -> down
+    _vote(client, 2)                  # toggled off
+
+    db.session.expire_all()
+    assert db.session.get(Question, 1).score == -2
+    assert db.session.get(User, 1).reputation == -4
+
+
+def test_write_behind_buffers_until_flush(app):
+    _seed()
+    app.config.update(VOTE_WRITE_BEHIND=True, VOTE_BUFFER_FLUSH_MS=60_000)
+    client = app.test_client()
+    for user_id in (2, 3, 4):
+        assert _vote(client, user_id).status_code == 200
+
+    db.session.expire_all()
+    assert db.session.get(Question, 1).score == 0
+    assert counters.buffer.metrics()["pending"] == 6
+    assert Job.query.filter_by(type="votes.reconcile").count() == 1
+
+    assert counters.buffer.flush() == 2            # one UPDATE per row
+    db.session.expire_all()
+    assert db.session.get(Question, 1).score == 3
+    assert db.session.get(User, 1).reputation == 30
+
+
+def test_ledger_survives_a_crashed_process(app):
+    _seed()
+    app.config.update(VOTE_WRITE_BEHIND=True, VOTE_BUFFER_FLUSH_MS=60_000)
+    client = app.test_client()
+    _vote(client, 2)
+    _vote(client, 3, "down")
+    counters.buffer.reset()                        # the process "crashed"
+
+    counters.reconcile()                           # leaves pending deltas alone
+    counters.buffer.flush()                        # another process applies them
+    db.session.expire_all()
+    assert db.session.get(Question, 1).score == 0
+    assert db.session.get(User, 1).reputation == 8
+
+
+def test_reconcile_between_commit_and_flush_counts_once(app):
+    _seed()
+    app.config.update(VOTE_WRITE_BEHIND=True, VOTE_BUFFER_FLUSH_MS=60_000)
+    client = app.test_client()
+    _vote(client, 2)
+    _vote(client, 3)                               # committed, not yet flushed
+
+    counters.reconcile()                           # e.g. the jobs worker
+    db.session.expire_all()
+    assert db.session.get(Question, 1).score == 0  # the flush still owes +2
+    counters.buffer.flush()                        # the web process
+    counters.reconcile()
+    db.session.expire_all()
+    assert db.session.get(Question, 1).score == 2
+    assert db.session.get(User, 1).reputation == 20
+    assert counters.buffer.metrics()["pending"] == 0
+
+
+def test_vote_is_not_failed_after_its_commit(app, monkeypatch):
+    _seed()
+    app.config.update(VOTE_WRITE_BEHIND=True)
+
+    def broken(_app):
+        raise RuntimeError("flusher unavailable")
+
+    monkeypatch.setattr(counters.buffer, "ensure_started", broken)
+    assert _vote(app.test_client(), 2).status_code == 200
+    assert Vote.query.count() == 1 and counters.buffer.metrics()["pending"] == 2
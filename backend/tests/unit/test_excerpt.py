@@ -0,0 +1,20 @@
+from app.extensions import db
+from app.models import Question, User
+from app.utils import excerpt
+
+
+def test_excerpt_cuts_at_word_boundary():
+    assert excerpt("short", 10) == "short"
+    assert excerpt("alpha beta gamma delta", 13) == "alpha beta…"
+
+
+def test_list_endpoint_ships_excerpt_not_body(app):
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    body = "word " * 500
+    db.session.add(Question(title="T", content=f"<p>{body}</p>", content_text=body.strip(), user_id=1))
+    db.session.commit()
+
+    item = app.test_client().get("/api/questions").get_json()["questions"][0]
+    assert "content" not in item
+    assert item["content_length"] == len(body.strip())
+    assert len(item["excerpt"]) <= 201 and item["excerpt"].endswith("…")
@@ -0,0 +1,23 @@
+import gzip
+import json
+
+from app.extensions import db
+from app.models import Question, User
+from app.services.export import gzip_chunks, iter_ndjson
+
+
+def test_ndjson_export_resumes_from_since_id(app):
+    db.session.add(User(username="ann", email="ann@example.com", password_hash="x"))
+    db.session.add_all([Question(title=f"Q{i}", content="c", user_id=1) for i in range(5)])
+    db.session.commit()
+
+    chunks = iter_ndjson("questions", app.json.dumps_bytes, since_id=2, chunk_rows=2)
+    data = gzip.decompress(b"".join(gzip_chunks(chunks)))
+    assert [json.loads(line)["id"] for line in data.splitlines()] == [3, 4, 5]
+
+
+def test_user_export_omits_password_hash(app):
+    db.session.add(User(username="ann", email="ann@example.com", password_hash="secret"))
+    db.session.commit()
+    line = b"".join(iter_ndjson("users", app.json.dumps_bytes, since_id=0))
+    assert b"secret" not in line and json.loads(line)["username"] == "ann"
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import Question, User, Vote
+from app.services.idempotency import run_once
+
+
+def _vote(client, key, vote_type="up"):
+    token = create_access_token(identity=2)
+    return client.post("/api/votes/", json={"question_id": 1, "vote_type": vote_type},
+                       headers={"Authorization": f"Bearer {token}", "Idempotency-Key": key})
+
+
+def test_retried_vote_is_replayed_not_toggled(app):
+    db.session.add_all([User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x")
+                        for i in (1, 2)])
+    db.session.add(Question(title="Q", content="c", content_text="c", user_id=1))
+    db.session.commit()
+    client = app.test_client()
+
+    first, retry = _vote(client, "k1"), _vote(client, "k1")
+    assert retry.status_code == first.status_code == 200
+    assert retry.get_json() == first.get_json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert Vote.query.count() == 1                 # not toggled off again
+
+    assert _vote(client, "k1", "down").status_code == 422
+    assert _vote(client, "k2").get_json()["action"] == "removed"   # a new key runs
+
+
+def test_concurrent_duplicates_run_once(app):
+    calls, results = [], []
+
+    def handler():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"n": len(calls)}, 201
+
+    def request_copy():
+        with app.test_request_context():
+            results.append(run_once("user:1:POST:/x:k", "fp", handler).get_json())
+
+    threads = [threading.Thread(target=request_copy) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and results == [{"n": 1}] * 5
@@ -0,0 +1,44 @@
+import pytest
+import sqlalchemy as sa
+
+from app.extensions import db
+from app.index_advisor import IndexAdvisor
+from app.models import Answer, Notification, Question, Vote
+
+
+def test_listing_queries_use_indexes(app):
+    advisor = IndexAdvisor()
+    advisor.install(db.engine)
+
+    Question.query.filter_by(user_id=1).order_by(Question.created_at.desc()).all()
+    Answer.query.filter_by(question_id=1).order_by(Answer.created_at.asc()).all()
+    Vote.query.filter_by(answer_id=1).all()
+    Notification.query.filter_by(user_id=1).order_by(Notification.created_at.desc()).all()
+
+    assert advisor.findings == []
+
+
+def test_flags_full_scan_on_large_table():
+    # separate engine so the deliberate scan stays out of the suite report
+    engine = sa.create_engine("sqlite://")
+    db.metadata.create_all(engine)
+    advisor = IndexAdvisor()
+    advisor.install(engine)
+
+    with engine.connect() as conn:
+        conn.execute(sa.select(Question.id).where(Question.title == "unindexed")).all()
+
+    assert [f.table for f in advisor.findings] == ["questions"]
+
+
+def test_failed_explain_leaves_transaction_usable(app):
+    if db.engine.dialect.name != "postgresql":
+        pytest.skip("savepoints around EXPLAIN only matter on PostgreSQL (TEST_DATABASE_URI)")
+    advisor = IndexAdvisor()
+    conn = db.session.connection()
+    conn.exec_driver_sql("SELECT 1")
+
+    advisor._after_execute(conn, None, "SELECT * FROM no_such_table", {}, None, False)
+
+    assert conn.exec_driver_sql("SHOW enable_seqscan").scalar() == "on"
+    assert Question.query.count() == 0          # transaction not aborted
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from app.extensions import db
+from app.models import Job
+from app.models.job import _now
+from app.services import jobs
+
+calls = []
+
+
+@jobs.job("test.flaky", concurrency=1, max_attempts=2, backoff=0)
+def flaky(n):
+    calls.append(n)
+    if n < 0:
+        raise RuntimeError("boom")
+
+
+def test_enqueue_key_is_idempotent(app):
+    with app.app_context():
+        first = jobs.enqueue("test.flaky", {"n": 1}, key="k1")
+        again = jobs.enqueue("test.flaky", {"n": 2}, key="k1")
+        assert again.id == first.id
+        assert Job.query.count() == 1
+
+
+def test_worker_runs_and_retries_until_failed(app):
+    with app.app_context():
+        ok  = jobs.enqueue("test.flaky", {"n": 1}).id
+        bad = jobs.enqueue("test.flaky", {"n": -1}).id
+        worker = jobs.Worker(app, threads=1)
+        for _ in range(4):                 # concurrency=1: one job per batch
+            worker.run(once=True)
+        db.session.expire_all()
+        assert db.session.get(Job, ok).status == Job.DONE
+        failed = db.session.get(Job, bad)
+        assert failed.status == Job.FAILED
+        assert failed.attempts == 2 and "boom" in failed.last_error
+
+
+def test_heartbeat_keeps_a_long_job_leased(app):
+    with app.app_context():
+        mine   = jobs.enqueue("test.flaky", {"n": 1}).id
+        theirs = jobs.enqueue("test.flaky", {"n": 2}).id
+        worker, crashed = jobs.Worker(app, lease_seconds=60), jobs.Worker(app, lease_seconds=60)
+        crashed.worker_id = "crashed:1"
+        assert worker.claim() == [(mine, "test.flaky")]
+        assert crashed.claim() == [(theirs, "test.flaky")]
+        # both have been running for longer than the lease
+        db.session.execute(db.update(Job).values(locked_at=_now() - timedelta(seconds=120)))
+        db.session.commit()
+
+        assert worker.heartbeat() == 1
+        assert worker.requeue_stale() == 1
+        db.session.expire_all()
+        assert db.session.get(Job, mine).status == Job.RUNNING
+        assert db.session.get(Job, theirs).status == Job.QUEUED
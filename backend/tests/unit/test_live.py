@@ -0,0 +1,29 @@
+from app.services.live import DeltaCoalescer, NAMESPACE, room_for
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, event, data, namespace, to):
+        self.sent.append((event, data, namespace, to))
+
+
+def test_burst_is_coalesced_into_one_message_per_room():
+    coalescer = DeltaCoalescer()
+    for score in range(1, 51):
+        coalescer.add(7, question_score=score)
+    coalescer.add(7, answer_id=3, answer_score=2)
+    coalescer.add(7, new_answer_id=9, answer_count=4)
+    coalescer.add(8, question_score=-1)
+
+    sio = FakeSocketIO()
+    assert coalescer.flush(sio) == 2
+
+    by_room = {to: data for _, data, _, to in sio.sent}
+    assert by_room[room_for(7)] == {
+        "question_id": 7, "score": 50, "answer_scores": {3: 2},
+        "new_answer_ids": [9], "answer_count": 4,
+    }
+    assert all(ns == NAMESPACE for _, _, ns, _ in sio.sent)
+    assert coalescer.flush(sio) == 0
@@ -0,0 +1,49 @@
+from app.extensions import db
+from app.models import User
+
+
+def test_find_by_login_falls_back_to_legacy_username_with_at(app):
+    db.session.add_all([User(username="Ann", email="ann@example.com", password_hash="x"),
+                        User(username="bob@home", email="bob@example.com", password_hash="x")])
+    db.session.commit()
+
+    assert User.find_by_login(" ANN ").id == 1
+    assert User.find_by_login("Ann@Example.com").id == 1
+    assert User.find_by_login("Bob@Home").id == 2          # predates the no‑"@" rule
+    assert User.find_by_login("bob@example.com").id == 2
+    assert User.find_by_login("nobody@example.com") is None
+
+
+def test_login_with_legacy_username(app):
+    user = User(username="bob@home", email="bob@example.com")
+    user.set_password("s3cret-pass")
+    db.session.add(user)
+    db.session.commit()
+
+    resp = app.test_client().post("/api/auth/login",
+                                  json={"identifier": "bob@home", "password": "s3cret-pass"})
+    assert resp.status_code == 200
+    assert resp.get_json()["user"]["username"] == "bob@home"
+
+
+def test_register_maps_only_username_and_email_conflicts(app, monkeypatch):
+    from sqlalchemy.exc import IntegrityError
+
+    db.session.add(User(username="Ann", email="ann@example.com", password_hash="x"))
+    db.session.commit()
+    client = app.test_client()
+
+    def register(username, email):
+        return client.post("/api/auth/register", json={
+            "username": username, "email": email, "password": "Secret123!"})
+
+    taken = register("ANN", "other@example.com")
+    assert (taken.status_code, taken.get_json()["error"]) == (409, "Username already taken")
+    taken = register("carol", "Ann@Example.com")
+    assert (taken.status_code, taken.get_json()["error"]) == (409, "Email already registered")
+
+    def failing_commit():
+        raise IntegrityError("INSERT INTO users", {}, Exception("NOT NULL constraint failed: users.role"))
+
+    monkeypatch.setattr(db.session, "commit", failing_commit)
+    assert register("dave", "dave@example.com").status_code == 500
@@ -0,0 +1,63 @@
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import Notification, Question, User
+from app.services import mentions
+
+
+def test_scan_takes_longest_name_on_a_word_boundary():
+    trie = mentions.UsernameTrie()
+    for name in ("ann", "Anna", "mary jane", "bob"):
+        trie.add(name)
+
+    text = "thanks @ANNA and @ann, cc @Mary Jane – @annabel, mail bob@ann.io, @bobby @bob"
+    assert trie.scan(text) == ["anna", "ann", "mary jane", "bob"]
+    assert trie.scan(text, limit=2) == ["anna", "ann"]
+    assert "ANN" in trie and "an" not in trie and len(trie) == 4
+
+
+def test_mentions_notify_each_user_once(app):
+    db.session.add_all([User(username=n, email=f"{n}@example.com", password_hash="x")
+                        for n in ("author", "ann", "bob", "gone")])
+    db.session.add(Question(title="Q", content="c", content_text="c", user_id=1))
+    db.session.commit()
+    db.session.get(User, 4).is_active = False
+    db.session.commit()
+    client = app.test_client()
+
+    # registered after the trie was built: picked up without a reload
+    mentions.index.catch_up()
+    assert client.post("/api/auth/register", json={
+        "username": "Carol", "email": "carol@example.com", "password": "Secret123!"}
+    ).status_code == 201
+    assert "carol" in mentions.index
+
+    token = create_access_token(identity=1)
+    resp = client.post("/api/questions/1/answers",
+                       json={"content": "@ann @bob @ann @gone @author @carol @nobody"},
+                       headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+
+    notified = db.session.scalars(db.select(Notification.user_id).order_by(Notification.user_id))
+    assert notified.all() == [2, 3, 5]
+    assert db.session.get(Notification, 1).message == 'author mentioned you in "Q"'
+
+
+def test_mentions_skip_deleted_question_and_wait_for_trie(app):
+    db.session.add_all([User(username=n, email=f"{n}@example.com", password_hash="x")
+                        for n in ("author", "ann")])
+    db.session.add(Question(title="Q", content="c", content_text="c", user_id=1))
+    db.session.commit()
+    mentions.index.catch_up()
+    db.session.get(Question, 1).deleted_at = db.func.now()
+    db.session.commit()
+    assert mentions.notify_mentions("hi @ann", author_id=1, question_id=1) == 0
+    assert mentions.notify_mentions("no mentions here", author_id=1, question_id=None) == 0
+
+    db.session.get(Question, 1).deleted_at = None
+    db.session.commit()
+    mentions.index.reset()                          # a fresh process
+    assert mentions.notify_mentions("hi @ann", author_id=1, question_id=1) == 0
+    assert mentions.index.ready.wait(5)
+    assert mentions.notify_mentions("hi @ann", author_id=1, question_id=1) == 1
+    assert Notification.query.count() == 1
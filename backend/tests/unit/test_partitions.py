@@ -0,0 +1,96 @@
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Notification, Question, User, Vote
+from app.models.vote import VoteType
+from app.services import partitions
+
+# a scratch PostgreSQL database: the migration test wipes its public schema
+PG_URI = os.getenv("MIGRATION_TEST_DATABASE_URI")
+MIGRATIONS = os.path.join(os.path.dirname(__file__), "..", "..", "..", "migrations")
+
+
+def test_month_arithmetic_and_names():
+    assert partitions.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert partitions.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partitions.partition_name("votes", date(2026, 3, 1)) == "votes_p202603"
+
+
+def test_sqlite_stays_unpartitioned(app):
+    assert not partitions.enabled()
+    assert partitions.maintain() == {}
+
+
+def test_notifications_read_every_retained_row(app, monkeypatch):
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    now = datetime.utcnow()
+    db.session.add_all([Notification(user_id=1, message="new"),
+                        Notification(user_id=1, message="kept", created_at=now - timedelta(days=100)),
+                        Notification(user_id=1, message="expired", created_at=now - timedelta(days=250))])
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=1)}"}
+    client = app.test_client()
+
+    def listed():
+        return [n["message"] for n in
+                client.get("/api/notifications/", headers=headers).get_json()["data"]]
+
+    monkeypatch.setattr(partitions, "enabled", lambda: False)
+    assert listed() == ["new", "kept", "expired"]     # nothing is ever dropped
+
+    # partitioned: the bound is the oldest month maintain() keeps
+    monkeypatch.setattr(partitions, "enabled", lambda: True)
+    assert app.config["NOTIFICATION_RETENTION_MONTHS"] == 6
+    assert listed() == ["new", "kept"]
+    assert client.get("/api/notifications/unread_count", headers=headers).get_json()["data"] == {"unread": 2}
+    assert client.post("/api/notifications/mark_read/2", headers=headers).status_code == 200
+    assert client.post("/api/notifications/mark_read/3", headers=headers).status_code == 404
+
+
+@pytest.mark.skipif(not PG_URI, reason="MIGRATION_TEST_DATABASE_URI (PostgreSQL) not set")
+def test_postgres_migrations_and_default_partition():
+    from flask_migrate import Migrate, downgrade, upgrade
+
+    class PGConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = PG_URI
+        SOCKETIO_ENABLED = False
+        RATELIMIT_ENABLED = False
+        INDEX_ADVISOR = False
+
+    app = create_app(PGConfig)
+    Migrate(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("DROP SCHEMA public CASCADE; CREATE SCHEMA public")
+        upgrade()
+        try:
+            this_month = partitions.month_start(date.today())
+            assert [m for m, _ in partitions.partitions("votes")][-1] == \
+                partitions.add_months(this_month, 3)
+
+            # the maintain job stopped long ago: a month with no partition
+            lost = datetime(2001, 1, 15)
+            db.session.add_all([User(username="u", email="u@example.com", password_hash="x"),
+                                Question(title="t", content="c", content_text="c", user_id=1)])
+            db.session.flush()
+            db.session.add_all([Vote(vote_type=VoteType.UP, user_id=1, question_id=1,
+                                     created_at=lost),
+                                Notification(user_id=1, message="m", created_at=lost)])
+            db.session.commit()
+
+            changes = partitions.maintain()
+            assert changes["votes"]["moved"] == ["votes_p200101"]
+            assert changes["notifications"]["moved"] == ["notifications_p200101"]
+            assert partitions.default_months("votes") == []
+            assert db.session.scalar(db.text("SELECT count(*) FROM votes_p200101")) == 1
+            assert partitions.maintain()["votes"] == {"created": [], "dropped": [], "moved": []}
+        finally:
+            db.session.rollback()
+            downgrade(revision="base")
@@ -0,0 +1,21 @@
+from werkzeug.security import generate_password_hash
+
+from app.services.passwords import needs_rehash, normalize_method
+
+
+def test_normalize_method_fills_werkzeug_defaults():
+    assert normalize_method("scrypt") == "scrypt:32768:8:1"
+    assert normalize_method("pbkdf2") == "pbkdf2:sha256:600000"
+    assert normalize_method("pbkdf2:sha512") == "pbkdf2:sha512:600000"
+
+
+def test_needs_rehash_only_for_outdated_parameters():
+    current = generate_password_hash("pw", method="pbkdf2:sha256:1000")
+    assert not needs_rehash(current, method="pbkdf2:sha256:1000")
+    assert needs_rehash(current, method="pbkdf2:sha256:2000")
+    assert needs_rehash(current, method="scrypt")
+
+
+def test_needs_rehash_for_empty_or_legacy_hash():
+    assert needs_rehash("", method="scrypt")
+    assert needs_rehash("not-a-werkzeug-hash", method="scrypt")
@@ -0,0 +1,123 @@
+import importlib.util
+import json
+import os
+import pstats
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import AdminAudit, Question, User
+from app.profiling import profiler
+
+
+def _admin(app):
+    db.session.add(User(username="root", email="root@example.com", password_hash="x", role="admin"))
+    db.session.add(Question(title="Q", content="c", content_text="c", user_id=1))
+    db.session.commit()
+    token = create_access_token(identity=1, additional_claims={"role": "admin"})
+    return app.test_client(), {"Authorization": f"Bearer {token}"}
+
+
+def test_toggle_samples_requests_with_their_sql(app, tmp_path):
+    client, auth = _admin(app)
+    assert client.put("/api/admin/profiling", json={"sample_rate": 2}, headers=auth).status_code == 400
+    resp = client.put("/api/admin/profiling", headers=auth,
+                      json={"enabled": True, "sample_rate": 1, "path_prefix": "/api/questions"})
+    assert resp.get_json()["settings"]["enabled"] is True
+    assert AdminAudit.query.filter_by(action="profiling.update").count() == 1
+
+    assert "X-Profile-Id" not in client.get("/api/tags").headers
+    profile_id = client.get("/api/questions/1/full").headers["X-Profile-Id"]
+
+    listed = client.get("/api/admin/profiling", headers=auth).get_json()["profiles"]
+    assert [p["id"] for p in listed] == [profile_id]        # admin calls aren't profiled
+    detail = client.get(f"/api/admin/profiling/{profile_id}", headers=auth).get_json()
+    assert detail["status"] == 200 and detail["sql_count"] > 0
+    assert any("FROM questions" in s["statement"] for s in detail["sql"])
+
+    scope = client.get(f"/api/admin/profiling/{profile_id}?format=speedscope", headers=auth)
+    assert scope.get_json()["profiles"][-1]["name"] == "SQL"
+    profiler.get(profile_id).sample(sys._getframe())       # a fast request may have none
+    raw = client.get(f"/api/admin/profiling/{profile_id}?format=pstats", headers=auth)
+    path = tmp_path / "p.pstats"
+    path.write_bytes(raw.data)
+    stats = pstats.Stats(str(path)).stats
+    assert any(name == "test_toggle_samples_requests_with_their_sql" for _, _, name in stats)
+
+
+def test_signed_header_profiles_one_request(app):
+    client, auth = _admin(app)
+    token = client.post("/api/admin/profiling/token", headers=auth).get_json()["token"]
+
+    assert "X-Profile-Id" not in client.get("/api/questions/1/full").headers
+    assert "X-Profile-Id" not in client.get("/api/questions/1/full",
+                                            headers={"X-Profile-Token": token + "x"}).headers
+    resp = client.get("/api/questions/1/full", headers={"X-Profile-Token": token})
+    assert profiler.get(resp.headers["X-Profile-Id"]).requested_by == 1
+
+
+GREEN_SCRIPT = textwrap.dedent("""
+    import json, os, sys, time
+    mode = sys.argv[1]
+    if mode == "eventlet":
+        import eventlet
+        eventlet.monkey_patch()
+        spawn = eventlet.spawn
+    else:
+        from gevent import monkey, spawn
+        monkey.patch_all()
+    os.environ.update(ASYNC_MODE=mode, DATABASE_URI="sqlite://", SOCKETIO_ENABLED="0",
+                      RATELIMIT_ENABLED="0", INDEX_ADVISOR="0")
+    from app import create_app
+    from app.profiling import profiler
+
+    app = create_app()
+
+    def busy(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    def spin_a():
+        for _ in range(150):
+            busy(0.001)
+            time.sleep(0)               # yield to the other request's greenlet
+
+    def spin_b():
+        for _ in range(150):
+            busy(0.001)
+            time.sleep(0)
+
+    app.add_url_rule("/a", "a", lambda: spin_a() or "a")
+    app.add_url_rule("/b", "b", lambda: spin_b() or "b")
+    with app.app_context():
+        token = profiler.make_token(1)
+    client = app.test_client()
+    ids = {}
+    def get(path):
+        ids[path] = client.get(path, headers={"X-Profile-Token": token}).headers["X-Profile-Id"]
+    for glet in [spawn(get, "/a"), spawn(get, "/b")]:
+        glet.wait() if mode == "eventlet" else glet.join()
+    # every function seen on a sampled stack
+    print(json.dumps({path: [name for _, _, name in profiler.get(pid).frames]
+                      for path, pid in ids.items()}))
+""")
+
+
+@pytest.mark.parametrize("mode", ["gevent", "eventlet"])
+def test_samples_request_greenlets_under_a_patched_hub(mode):
+    if importlib.util.find_spec(mode) is None:
+        pytest.skip(f"{mode} not installed")
+    backend = os.path.join(os.path.dirname(__file__), "..", "..")
+    out = subprocess.run([sys.executable, "-c", GREEN_SCRIPT, mode], cwd=backend,
+                         capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    hot = json.loads(out.stdout.strip().splitlines()[-1])
+    # each request's own frames, not the hub's or the other greenlet's
+    assert "spin_a" in hot["/a"] and "spin_b" not in hot["/a"]
+    assert "spin_b" in hot["/b"] and "spin_a" not in hot["/b"]
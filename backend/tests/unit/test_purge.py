@@ -0,0 +1,35 @@
+from app.extensions import db
+from app.models import Answer, Job, Question, User, Vote, VoteType
+from app.services import jobs
+from app.services.purge import purge_question, soft_delete_question
+
+
+def test_purge_removes_children_in_chunks_and_reverts_reputation(app):
+    app.config.update(PURGE_DELAY_SECONDS=0, PURGE_CHUNK_ROWS=2)
+    db.session.add_all([User(username=f"u{i}", email=f"u{i}@example.com",
+                             password_hash="x", reputation=100) for i in range(4)])
+    db.session.flush()
+    question = Question(title="Q", content="c", user_id=1)
+    db.session.add(question)
+    db.session.flush()
+    answer = Answer(content="a", question_id=question.id, user_id=2)
+    db.session.add(answer)
+    db.session.flush()
+    db.session.add_all([Vote(user_id=v, question_id=question.id, vote_type=VoteType.UP)
+                        for v in (2, 3, 4)])
+    db.session.add_all([Vote(user_id=v, answer_id=answer.id, vote_type=VoteType.DOWN)
+                        for v in (1, 3)])
+    db.session.commit()
+
+    question_id = question.id
+    job = soft_delete_question(question)
+    assert job.type == "content.purge_question"
+    assert Question.query.filter_by(deleted_at=None).count() == 0
+
+    jobs.Worker(app).run(once=True)
+    db.session.expire_all()
+    assert db.session.get(Job, job.id).status == Job.DONE
+    assert (Question.query.count(), Answer.query.count(), Vote.query.count()) == (0, 0, 0)
+    assert db.session.get(User, 1).reputation == 100 - 30
+    assert db.session.get(User, 2).reputation == 100 + 4
+    assert purge_question(question_id) is False
@@ -0,0 +1,78 @@
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import Answer, Question, User, Vote, VoteType
+
+
+def _seed():
+    db.session.add_all([User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x")
+                        for i in (1, 2)])
+    db.session.add(Question(title="Q", content="<p>body</p>", content_text="body", user_id=1))
+    db.session.flush()
+    db.session.add_all([Answer(content="a1", question_id=1, user_id=2),
+                        Answer(content="a2", question_id=1, user_id=1)])
+    db.session.flush()
+    db.session.add_all([Vote(vote_type=VoteType.UP, user_id=2, question_id=1),
+                        Vote(vote_type=VoteType.DOWN, user_id=2, answer_id=1),
+                        Vote(vote_type=VoteType.UP, user_id=1, answer_id=1)])
+    db.session.commit()
+
+
+def _auth(user_id):
+    return {"Authorization": f"Bearer {create_access_token(identity=user_id)}"}
+
+
+def test_full_returns_every_section_by_default(app):
+    _seed()
+    body = app.test_client().get("/api/questions/1/full").get_json()
+
+    assert set(body) == {"question", "answers", "votes", "my_votes", "authors"}
+    assert set(body["question"]) == {"id", "title", "content", "user_id", "created_at", "views"}
+    assert [a["content"] for a in body["answers"]["items"]] == ["a1", "a2"]
+    assert (body["answers"]["page"], body["answers"]["total"]) == (1, 2)
+    assert body["votes"] == {
+        "question": {"upvotes": 1, "downvotes": 0, "total": 1},
+        "answers": {"1": {"upvotes": 1, "downvotes": 1, "total": 0},
+                    "2": {"upvotes": 0, "downvotes": 0, "total": 0}},
+    }
+    assert body["my_votes"] is None                      # anonymous caller
+    assert body["authors"] == {"1": {"id": 1, "username": "u1"},
+                               "2": {"id": 2, "username": "u2"}}
+
+
+def test_full_my_votes_for_authenticated_caller(app):
+    _seed()
+    client = app.test_client()
+    mine = client.get("/api/questions/1/full?fields=my_votes", headers=_auth(2)).get_json()
+    assert mine == {"my_votes": {"question": "up", "answers": {"1": "down"}}}
+    other = client.get("/api/questions/1/full?fields=my_votes", headers=_auth(1)).get_json()
+    assert other == {"my_votes": {"question": None, "answers": {"1": "up"}}}
+
+
+def test_full_fields_projection(app):
+    _seed()
+    client = app.test_client()
+    body = client.get("/api/questions/1/full?fields=question.title,question.id,votes").get_json()
+    assert body == {"question": {"id": 1, "title": "Q"},
+                    "votes": {"question": {"upvotes": 1, "downvotes": 0, "total": 1},
+                              "answers": {"1": {"upvotes": 1, "downvotes": 1, "total": 0},
+                                          "2": {"upvotes": 0, "downvotes": 0, "total": 0}}}}
+
+    answers = client.get("/api/questions/1/full?fields=answers.content&per_page=1&page=2")
+    assert answers.get_json() == {"answers": {"items": [{"content": "a2"}], "page": 2,
+                                              "per_page": 1, "total": 2}}
+
+    for fields in ("nope", "question.password", "votes.total", "answers,"):
+        resp = client.get(f"/api/questions/1/full?fields={fields}")
+        assert resp.status_code == 400, fields
+        assert "unknown field" in resp.get_json()["error"]
+
+
+def test_full_404_for_missing_or_deleted_question(app):
+    _seed()
+    client = app.test_client()
+    assert client.get("/api/questions/9/full").status_code == 404
+
+    db.session.get(Question, 1).deleted_at = db.func.now()
+    db.session.commit()
+    assert client.get("/api/questions/1/full").status_code == 404
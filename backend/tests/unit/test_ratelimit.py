@@ -0,0 +1,43 @@
+from app import create_app
+from app.services import ratelimit
+from app.services.ratelimit import LocalPreCheck
+from tests.conftest import TestConfig
+
+
+def test_local_budget_spends_burst_then_refills():
+    check = LocalPreCheck()
+    assert check.allow("ip:1", burst=2, rate=1.0, now=0.0)
+    assert check.allow("ip:1", burst=2, rate=1.0, now=0.0)
+    assert not check.allow("ip:1", burst=2, rate=1.0, now=0.5)
+    assert check.allow("ip:1", burst=2, rate=1.0, now=1.5)
+
+
+def test_local_budget_is_per_key_and_bounded():
+    check = LocalPreCheck(max_keys=2)
+    assert check.allow("user:1", burst=1, rate=0.0, now=0.0)
+    assert not check.allow("user:1", burst=1, rate=0.0, now=0.0)
+    assert check.allow("user:2", burst=1, rate=0.0, now=0.0)
+    check.allow("user:3", burst=1, rate=0.0, now=0.0)
+    assert len(check._buckets) == 2
+
+
+def test_local_admission_waits_for_a_passed_check_and_is_settled():
+    check = LocalPreCheck()
+    assert not check.admit("ip:1|auth.register", burst=2, rate=0.0, now=0.0)
+    assert check.settle("ip:1|auth.register", True, burst=2, now=0.0) == 0
+    assert check.admit("ip:1|auth.register", burst=2, rate=0.0, now=0.0)
+    assert check.admit("ip:1|auth.register", burst=2, rate=0.0, now=0.0)
+    assert not check.admit("ip:1|auth.register", burst=2, rate=0.0, now=0.0)
+    assert check.settle("ip:1|auth.register", False, burst=2, now=0.0) == 2
+    assert not check.admit("ip:1|auth.register", burst=2, rate=1.0, now=5.0)   # breached
+
+
+def test_locally_admitted_requests_count_toward_the_route_limit(monkeypatch):
+    class LimitedConfig(TestConfig):
+        RATELIMIT_ENABLED = True
+        RATELIMIT_STORAGE_URI = "memory://"
+
+    monkeypatch.setattr(ratelimit, "local_precheck", LocalPreCheck())
+    client = create_app(LimitedConfig).test_client()
+    codes = [client.post("/api/auth/register", json={}).status_code for _ in range(12)]
+    assert codes == [400] * 5 + [429] * 7          # "5 per minute", burst or not
@@ -0,0 +1,99 @@
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import Job, Question, Tag, User, Vote
+from app.models.vote import VoteType
+from app.services import related
+
+
+def _question(title, tags, user_id=1):
+    question = Question(title=title, content="c", content_text="c", user_id=user_id,
+                        tags=Tag.ensure(tags))
+    db.session.add(question)
+    db.session.flush()
+    return question.id
+
+
+def _seed():
+    db.session.add_all([User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x")
+                        for i in range(1, 4)])
+    ids = [_question("Flask session", ["flask", "sqlalchemy"]),
+           _question("SQLAlchemy commit", ["sqlalchemy", "flask"]),
+           _question("CSS grid", ["css"]),
+           _question("Flexbox centering", ["css", "flexbox"])]
+    # voters 2 and 3 read the Flask and flexbox questions together
+    for user_id in (2, 3):
+        db.session.add_all([Vote(vote_type=VoteType.UP, user_id=user_id, question_id=ids[0]),
+                            Vote(vote_type=VoteType.UP, user_id=user_id, question_id=ids[3])])
+    db.session.commit()
+    return ids
+
+
+def test_rebuild_ranks_tags_then_covotes(app):
+    flask_q, commit_q, grid_q, flex_q = _seed()
+    assert related.rebuild() == 4
+
+    hits = related.related_for(flask_q)
+    assert [h["id"] for h in hits] == [commit_q, flex_q]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert [h["id"] for h in related.related_for(grid_q)] == [flex_q]
+
+
+def test_update_merges_new_question_into_neighbours(app):
+    flask_q, commit_q, _, _ = _seed()
+    related.rebuild()
+
+    new_q = _question("Flask SQLAlchemy pool", ["flask", "sqlalchemy"])
+    db.session.commit()
+    related.update(new_q)
+
+    assert {h["id"] for h in related.related_for(new_q)} == {flask_q, commit_q}
+    assert new_q in [h["id"] for h in related.related_for(commit_q)]
+
+
+def test_related_endpoint(app, client):
+    flask_q, commit_q, _, _ = _seed()
+    related.rebuild()
+
+    resp = client.get(f"/api/questions/{flask_q}/related")
+    assert resp.status_code == 200
+    assert resp.get_json()["related"][0] == {"id": commit_q, "title": "SQLAlchemy commit",
+                                             "score": resp.get_json()["related"][0]["score"]}
+    assert client.get("/api/questions/999/related").status_code == 404
+
+
+def test_rebuild_requeues_itself_each_period(app, client):
+    _seed()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=1)}"}
+    for title in ("First new question", "Second new question"):
+        assert client.post("/api/questions", json={"title": title, "content": "body text"},
+                           headers=headers).status_code == 201
+
+    def rebuilds():
+        return [(job.key, job.run_at) for job in
+                Job.query.filter_by(type="related.rebuild").order_by(Job.id)]
+
+    (key, run_at), = rebuilds()                 # one per period, not per post
+    related.rebuild_job()
+    (_, (next_key, next_run_at)) = rebuilds()
+    period = app.config["RELATED_REBUILD_SECONDS"]
+    assert int(next_key.rsplit(":", 1)[1]) == int(key.rsplit(":", 1)[1]) + 1
+    assert (next_run_at - run_at).total_seconds() >= period - 5
+
+
+def test_tag_ensure_tolerates_a_concurrent_insert(app):
+    from sqlalchemy import event
+
+    def racer(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tags"):
+            # another post created the tag between ensure's SELECT and its INSERT
+            cursor.execute("INSERT INTO tags (name) VALUES ('flask')")
+
+    event.listen(db.engine, "before_cursor_execute", racer)
+    try:
+        tags = Tag.ensure(["Flask", "jinja"])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", racer)
+    assert [t.name for t in tags] == ["flask", "jinja"]
+    assert all(t.id for t in tags)
+    assert Tag.query.filter_by(name="flask").count() == 1
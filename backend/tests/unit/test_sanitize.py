@@ -0,0 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils import html_to_text, sanitize_html
+
+
+def test_concurrent_sanitize_matches_serial():
+    posts = [f"<p>post <b>{i}</b><script>x({i})</script> <a href='/q/{i}'>link</a>"
+             f"<iframe src='e'></iframe>{'<i>word</i> ' * (i % 40)}</p>" for i in range(400)]
+    expected = [(sanitize_html(p), html_to_text(p)) for p in posts]
+
+    def render(post):
+        return sanitize_html(post), html_to_text(post)
+
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(3):
+            assert list(pool.map(render, posts)) == expected
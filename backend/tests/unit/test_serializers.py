@@ -0,0 +1,95 @@
+import json
+from datetime import datetime
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from app.extensions import db
+from app.json_provider import FastJSONProvider, orjson
+from app.models import Answer, Notification, Question, User, Vote, VoteType
+from app.serializers import (ANSWER, NOTIFICATION, QUESTION, USER, VOTE, RowSerializer, iso,
+                             stream_json_array)
+
+T0 = datetime(2026, 3, 1, 12, 30, 45, 123456)
+
+
+def _seed():
+    db.session.add_all([User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x")
+                        for i in (1, 2)])
+    db.session.add(Question(title="Q", content="<p>body</p>", content_text="body", user_id=1,
+                            created_at=T0))
+    db.session.flush()
+    db.session.add_all([Answer(content="a", question_id=1, user_id=2, created_at=T0),
+                        Vote(vote_type=VoteType.UP, user_id=2, question_id=1, created_at=T0),
+                        Notification(user_id=1, message="hi", created_at=T0)])
+    db.session.commit()
+
+
+def test_row_serializers_match_the_old_shapes(app):
+    _seed()
+    user = db.session.get(User, 1)
+    assert USER.obj(user) == user.to_dict()
+
+    question = db.session.get(Question, 1)
+    row = db.session.execute(QUESTION.select().where(Question.id == 1)).one()
+    listed = QUESTION(row)
+    old = question.to_dict()
+    del old["content"]                                # list rows carry the excerpt instead
+    assert {k: listed[k] for k in old} == old
+
+    notes = db.session.execute(NOTIFICATION.select().where(Notification.user_id == 1)).all()
+    assert NOTIFICATION.many(notes) == [
+        {"id": n.id, "message": n.message, "is_read": n.is_read,
+         "created_at": n.created_at.isoformat()}
+        for n in Notification.query.filter_by(user_id=1)]
+
+    from app.schemas.answer import AnswerSchema
+    dumped = AnswerSchema().dump(db.session.get(Answer, 1))
+    assert ANSWER.obj(db.session.get(Answer, 1)) == {k: dumped[k] for k in ANSWER.names}
+
+    assert VOTE.obj(db.session.get(Vote, 1))["vote_type"] == "up"
+
+
+def test_converters_pass_none_through():
+    ser = RowSerializer(("id", None), ("at", None, iso), ("n", None))
+    assert ser((1, None, None)) == {"id": 1, "at": None, "n": None}
+    assert ser((2, T0, 0)) == {"id": 2, "at": "2026-03-01T12:30:45.123456", "n": 0}
+    assert ser.only(["at", "nope"]).names == ["at"]
+
+
+def test_provider_output_matches_stdlib(app):
+    provider = app.json
+    assert isinstance(provider, FastJSONProvider)
+    payload = {"when": T0, "none": None, "text": "ünï", "ids": {1: [1.5, True]}}
+    stdlib = json.loads(DefaultJSONProvider(app).dumps(payload))
+    assert json.loads(provider.dumps(payload)) == stdlib
+    assert json.loads(provider.dumps_bytes(payload)) == stdlib
+    assert stdlib["when"] == "Sun, 01 Mar 2026 12:30:45 GMT"     # Flask's http date, unchanged
+    assert provider.loads(provider.dumps_bytes(payload)) == stdlib
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+def test_provider_uses_orjson(app):
+    assert app.json.dumps_bytes({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+
+@pytest.mark.parametrize("count, chunk", [(0, 2), (1, 2), (5, 2), (4, 2)])
+def test_stream_json_array_is_valid_json(app, count, chunk):
+    rows = [(i, f"t{i}") for i in range(count)]
+    ser = RowSerializer(("id", None), ("title", None))
+    with app.test_request_context():
+        wrapped = stream_json_array(rows, ser, key="questions", chunk_size=chunk)
+        bare = stream_json_array(rows, ser, chunk_size=chunk)
+        assert json.loads(b"".join(wrapped.response)) == {"questions": ser.many(rows)}
+        assert json.loads(b"".join(bare.response)) == ser.many(rows)
+
+
+def test_stream_param_matches_plain_listing(app):
+    _seed()
+    db.session.add_all([Question(title=f"Q{i}", content="c", content_text="c", user_id=1)
+                        for i in range(3)])
+    db.session.commit()
+    client = app.test_client()
+    streamed = client.get("/api/questions?stream=1")
+    assert streamed.mimetype == "application/json"
+    assert json.loads(streamed.data) == client.get("/api/questions").get_json()
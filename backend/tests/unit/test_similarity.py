@@ -0,0 +1,68 @@
+from app.extensions import db
+from app.models import Question, User
+from app.services import similarity
+from app.services.similarity import SimilarityIndex, similar_questions
+
+
+def test_lsh_finds_rephrased_title_only():
+    index = SimilarityIndex()
+    index.add(1, "How to reverse a list in Python")
+    index.add(2, "Centering a div with flexbox")
+    index.add(3, "Python list reverse without slicing")
+
+    hits = dict(index.query("reversing a python list", min_score=0.2))
+    assert 1 in hits and 2 not in hits
+    index.remove(1)
+    assert 1 not in dict(index.query("reversing a python list", min_score=0.2))
+
+
+def test_snapshot_round_trip(tmp_path):
+    index = SimilarityIndex()
+    index.add(7, "Flask SQLAlchemy session not committing")
+    index.last_id = 7
+    path = str(tmp_path / "sim.idx")
+    assert index.save(path)
+
+    restored = SimilarityIndex()
+    assert restored.load(path) and restored.last_id == 7
+    assert restored.query("flask sqlalchemy session commit", min_score=0.2)[0][0] == 7
+
+
+def test_similar_questions_skips_deleted(app):
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.add_all([Question(title="Docker compose volume permissions", content="c",
+                                 content_text="c", user_id=1) for _ in range(2)])
+    db.session.commit()
+    db.session.get(Question, 1).deleted_at = db.func.now()
+    db.session.commit()
+    similarity.index.catch_up()
+
+    assert [h["id"] for h in similar_questions("docker compose volume permission")] == [2]
+
+
+def test_lookups_wait_for_background_build(app):
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.add(Question(title="Docker compose volume permissions", content="c",
+                            content_text="c", user_id=1))
+    db.session.commit()
+    similarity.index.reset()                      # a fresh process
+
+    assert similar_questions("docker compose volume permission") == []
+    assert similarity.index.ready.wait(5)
+    assert [h["id"] for h in similar_questions("docker compose volume permission")] == [1]
+
+
+def test_catch_up_hashes_each_batch_off_the_hub(app, monkeypatch):
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.add_all([Question(title=f"Docker volume {i}", content="c", content_text="c",
+                                 user_id=1) for i in range(5)])
+    db.session.commit()
+    batches = []
+
+    def recording(fn, *args):
+        batches.append(len(args[0]))
+        return fn(*args)
+
+    monkeypatch.setattr(similarity, "run_blocking", recording)
+    assert similarity.index.catch_up(batch=2) == 5
+    assert batches == [2, 2, 1] and similarity.index.last_id == 5
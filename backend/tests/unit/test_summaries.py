@@ -0,0 +1,47 @@
+from app.extensions import db
+from app.models import Answer, Question, User
+from app.services import summaries
+
+
+def _seed():
+    user = User(username="ann", email="ann@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    questions = [Question(title=f"Q{i}", content="c", user_id=user.id) for i in range(3)]
+    db.session.add_all(questions)
+    db.session.commit()
+    return user, questions
+
+
+def test_get_many_loads_only_misses_and_counts_hits(app):
+    user, questions = _seed()
+    ids = [q.id for q in questions]
+
+    first = summaries.questions.get_many(ids[:2])
+    assert first[ids[0]].author_username == "ann"
+    again = summaries.questions.get_many(ids)
+    assert set(again) == set(ids)
+
+    m = summaries.questions.metrics()
+    assert (m["hits"], m["misses"], m["size"]) == (2, 3, 3)
+
+
+def test_invalidate_reloads_after_write(app):
+    user, questions = _seed()
+    qid = questions[0].id
+    assert summaries.questions.get(qid).answer_count == 0
+
+    db.session.add(Answer(content="a", question_id=qid, user_id=user.id))
+    db.session.commit()
+    assert summaries.questions.get(qid).answer_count == 0     # still cached
+    summaries.questions.invalidate(qid)
+    assert summaries.questions.get(qid).answer_count == 1
+
+
+def test_lru_bound_evicts_oldest(app):
+    app.config["SUMMARY_CACHE_SIZE"] = 2
+    _, questions = _seed()
+    for q in questions:
+        summaries.questions.get(q.id)
+    m = summaries.questions.metrics()
+    assert m["size"] == 2 and m["evictions"] == 1
@@ -0,0 +1,62 @@
+import threading
+
+from app.extensions import db
+from app.models import Question, User
+from app.services import views
+from app.services.views import HyperLogLog
+
+
+def test_hyperloglog_estimate_and_round_trip():
+    sketch = HyperLogLog()
+    for i in range(20_000):
+        sketch.add(f"viewer-{i}")
+    assert abs(sketch.estimate() - 20_000) < 20_000 * 0.08
+
+    small = HyperLogLog()
+    for i in range(40):
+        small.add(f"viewer-{i}")
+    raw = small.to_bytes()
+    assert len(raw) < 200                          # sparse while mostly empty
+    assert HyperLogLog.from_bytes(raw).estimate() == small.estimate()
+    assert HyperLogLog.from_bytes(sketch.to_bytes()).merge(small).estimate() == sketch.estimate()
+
+
+def _seed():
+    db.session.add(User(username="u", email="u@example.com", password_hash="x"))
+    db.session.add_all([Question(title=f"Q{i}", content="c", content_text="c", user_id=1)
+                        for i in range(2)])
+    db.session.commit()
+
+
+def test_reads_buffer_views_until_flush(app):
+    _seed()
+    client = app.test_client()
+    for agent in ("a", "b", "a"):
+        assert client.get("/api/questions/2/full",
+                          headers={"User-Agent": agent}).status_code == 200
+
+    db.session.expire_all()
+    assert db.session.get(Question, 2).view_count == 0
+    assert views.buffer.flush() == 1
+
+    db.session.expire_all()
+    question = db.session.get(Question, 2)
+    assert (question.view_count, question.unique_viewers) == (3, 2)
+    listed = client.get("/api/questions?sort=views").get_json()["questions"]
+    assert [(q["id"], q["views"]) for q in listed] == [(2, 3), (1, 0)]
+    assert client.get("/api/questions?sort=nope").status_code == 400
+
+
+def test_full_buffer_wakes_flusher_instead_of_failing_the_read(app, monkeypatch):
+    _seed()
+    app.config["VIEW_BUFFER_MAX"] = 1
+    flushed = threading.Event()
+
+    def broken_flush():
+        flushed.set()
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(views.buffer, "flush", broken_flush)
+    assert app.test_client().get("/api/questions/1/full").status_code == 200
+    assert flushed.wait(5)                       # the flusher thread tried, not the request
+    assert views.buffer.metrics()["pending"] == 1
@@ -1,8 +1,35 @@
-from app import create_app
-from gevent import monkey
-import eventlet
+"""WSGI entry point.
+
+The async runtime is monkey‑patched *first*, before the app (or anything
+that touches socket/threading) is imported. Choose it with
+ASYNC_MODE=eventlet|gevent|threading; gunicorn.conf.py picks the matching
+worker class and app.concurrency the matching DB pool. eventlet stays the
+default when the variable is unset.
+
+Under gevent / eventlet a PostgreSQL URL also gets psycogreen's wait
+callback, so psycopg2 yields to other greenlets while a query runs instead
+of blocking the worker.
+"""
+import os
+
+ASYNC_MODE = os.environ.setdefault("ASYNC_MODE", "eventlet")  # read by Config
+
+if ASYNC_MODE == "eventlet":
+    import eventlet
+    eventlet.monkey_patch()
+elif ASYNC_MODE == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+
+if ASYNC_MODE in ("eventlet", "gevent") and os.getenv("DATABASE_URI", "").startswith("postgres"):
+    if ASYNC_MODE == "eventlet":
+        from psycogreen.eventlet import patch_psycopg
+    else:
+        from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+from app import create_app  # noqa: E402
 
-monkey.patch_all()  # For WebSocket support
 app = create_app()
 
 if __name__ == '__main__':
@@ -15,10 +15,7 @@ const QuestionCard = ({ question }) => {
           >
             {question.title}
           </h2>
-          <p
-            className="text-sm text-gray-400"
-            dangerouslySetInnerHTML={{ __html: question.body }}
-          />
+          <p className="text-sm text-gray-400">{question.excerpt}</p>
         </div>
         <div className="flex flex-col items-center space-y-1">
           <button className="text-green-400 hover:text-green-500">
@@ -1,20 +1,56 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
+import { useParams } from 'react-router-dom';
 
 const QuestionDetails = () => {
-  // TODO: fetch question & answers
+  const { id } = useParams();
+  const [detail, setDetail] = useState(null);
+  const [error, setError] = useState('');
+
+  useEffect(() => {
+    // One composite call: question, answers, vote scores, my votes, authors
+    const token = localStorage.getItem('token');
+    fetch(`http://localhost:5000/api/questions/${id}/full`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+    })
+      .then((res) => (res.ok ? res.json() : Promise.reject(res.status)))
+      .then(setDetail)
+      .catch((err) => {
+        console.error('Failed to fetch question:', err);
+        setError('Could not load this question.');
+      });
+  }, [id]);
+
+  if (error) return <p className="max-w-4xl mx-auto p-6 text-red-400">{error}</p>;
+  if (!detail) return <p className="max-w-4xl mx-auto p-6 text-gray-300">Loading…</p>;
+
+  const { question, answers, votes, authors } = detail;
+  const authorName = (userId) => authors[userId]?.username || 'Unknown';
+
   return (
     <div className="max-w-4xl mx-auto p-6 text-white">
-      <h2 className="text-2xl font-bold mb-2">Question Title Goes Here</h2>
-      <p className="mb-4 text-gray-300">Asked by John Doe · 2 hours ago</p>
+      <h2 className="text-2xl font-bold mb-2">{question.title}</h2>
+      <p className="mb-4 text-gray-300">
+        Asked by {authorName(question.user_id)} · {new Date(question.created_at).toLocaleString()}
+        {' · '}score {votes.question.total}
+      </p>
       <div className="bg-gray-800 p-4 rounded mb-6">
-        <p>Question body and rich content goes here...</p>
+        <div dangerouslySetInnerHTML={{ __html: question.content }} />
       </div>
 
-      <h3 className="text-xl font-semibold mb-2">Answers</h3>
+      <h3 className="text-xl font-semibold mb-2">Answers ({answers.total})</h3>
       <div className="space-y-4">
-        <div className="bg-gray-700 p-4 rounded">
-          <p>Sample answer content here...</p>
-        </div>
+        {answers.items.length === 0 ? (
+          <p className="text-gray-400">No answers yet.</p>
+        ) : (
+          answers.items.map((answer) => (
+            <div key={answer.id} className="bg-gray-700 p-4 rounded">
+              <div dangerouslySetInnerHTML={{ __html: answer.content }} />
+              <p className="mt-2 text-sm text-gray-400">
+                {authorName(answer.user_id)} · score {votes.answers[answer.id]?.total ?? 0}
+              </p>
+            </div>
+          ))
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,55 @@
+"""questions.excerpt / content_length for list views
+
+Revision ID: 0b7e4d92c6a3
+Revises: f3a86d0c5e21
+Create Date: 2026-10-19 18:10:26.771058
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7e4d92c6a3'
+down_revision = 'f3a86d0c5e21'
+branch_labels = None
+depends_on = None
+
+
+BATCH = 500
+
+
+def _batches(bind, sql):
+    """Rows of *sql* (filtered on a still‑NULL column) until none are left."""
+    while True:
+        rows = bind.execute(sa.text(sql + f' ORDER BY id LIMIT {BATCH}')).all()
+        if not rows:
+            return
+        yield rows
+
+
+def upgrade():
+    # the app's own renderers, so backfilled rows match newly written ones
+    from app.utils import excerpt, html_to_text
+
+    op.add_column('questions', sa.Column('excerpt', sa.String(length=201), nullable=True))
+    op.add_column('questions', sa.Column('content_length', sa.Integer(), nullable=True))
+    bind = op.get_bind()
+
+    # 8f14c2a9d6e3 added content_text without filling it: render old posts first
+    for table in ('questions', 'answers'):
+        for rows in _batches(bind, f'SELECT id, content FROM {table} WHERE content_text IS NULL'):
+            bind.execute(sa.text(f'UPDATE {table} SET content_text = :text WHERE id = :id'),
+                         [{'id': id_, 'text': html_to_text(content or '')} for id_, content in rows])
+
+    for rows in _batches(bind, 'SELECT id, content_text FROM questions WHERE excerpt IS NULL'):
+        bind.execute(sa.text('UPDATE questions SET excerpt = :excerpt, content_length = :length '
+                             'WHERE id = :id'),
+                     [{'id': id_, 'excerpt': excerpt(text, 200), 'length': len(text)}
+                      for id_, text in rows])
+
+
+def downgrade():
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('content_length')
+        batch_op.drop_column('excerpt')
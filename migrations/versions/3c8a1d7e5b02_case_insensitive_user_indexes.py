@@ -0,0 +1,28 @@
+"""case-insensitive unique indexes on users.username / users.email
+
+Revision ID: 3c8a1d7e5b02
+Revises: 650f5f461489
+Create Date: 2026-10-19 10:02:14.540211
+
+Fails if existing rows collide case-insensitively; resolve those first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8a1d7e5b02'
+down_revision = '650f5f461489'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE users SET email = lower(trim(email))")
+    op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username)')], unique=True)
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.drop_index('ix_users_username_lower', table_name='users')
@@ -0,0 +1,34 @@
+"""questions.score / answers.score vote counters
+
+Revision ID: 5d8a3f60b2c9
+Revises: 7c2e9f1b4d86
+Create Date: 2026-10-19 20:14:07.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8a3f60b2c9'
+down_revision = '7c2e9f1b4d86'
+branch_labels = None
+depends_on = None
+
+_TOTAL = ("(SELECT COALESCE(SUM(CASE WHEN votes.vote_type = 'UP' THEN 1 ELSE -1 END), 0) "
+          "FROM votes WHERE votes.{column} = {table}.id)")
+
+
+def upgrade():
+    op.add_column('questions', sa.Column('score', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('answers', sa.Column('score', sa.Integer(), server_default='0', nullable=False))
+    # backfill from votes; `flask votes reconcile` does the same in batches
+    op.execute("UPDATE questions SET score = " + _TOTAL.format(column='question_id', table='questions'))
+    op.execute("UPDATE answers SET score = " + _TOTAL.format(column='answer_id', table='answers'))
+
+
+def downgrade():
+    with op.batch_alter_table('answers') as batch_op:
+        batch_op.drop_column('score')
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('score')
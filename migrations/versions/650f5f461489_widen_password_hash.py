@@ -0,0 +1,33 @@
+"""widen users.password_hash for scrypt hashes
+
+Revision ID: 650f5f461489
+Revises: e20281bfb2f3
+Create Date: 2026-10-19 09:12:40.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '650f5f461489'
+down_revision = 'e20281bfb2f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # scrypt hashes ("scrypt:32768:8:1$<salt>$<128 hex>") exceed 128 chars
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('password_hash',
+                              existing_type=sa.String(length=128),
+                              type_=sa.String(length=255),
+                              existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('password_hash',
+                              existing_type=sa.String(length=255),
+                              type_=sa.String(length=128),
+                              existing_nullable=False)
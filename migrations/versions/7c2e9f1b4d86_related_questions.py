@@ -0,0 +1,36 @@
+"""related_questions top‑k table and question_tags(tag_id) index
+
+Revision ID: 7c2e9f1b4d86
+Revises: 0b7e4d92c6a3
+Create Date: 2026-10-19 19:02:41.530118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9f1b4d86'
+down_revision = '0b7e4d92c6a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('related_questions',
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.SmallInteger(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_id'], ['questions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('question_id', 'rank')
+    )
+    op.create_index(op.f('ix_related_questions_related_id'), 'related_questions', ['related_id'], unique=False)
+    op.create_index('ix_question_tags_tag_id', 'question_tags', ['tag_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_question_tags_tag_id', table_name='question_tags')
+    op.drop_index(op.f('ix_related_questions_related_id'), table_name='related_questions')
+    op.drop_table('related_questions')
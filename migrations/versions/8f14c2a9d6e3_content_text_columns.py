@@ -0,0 +1,28 @@
+"""plain-text rendering columns for questions / answers
+
+Revision ID: 8f14c2a9d6e3
+Revises: 3c8a1d7e5b02
+Create Date: 2026-10-19 11:20:37.904115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f14c2a9d6e3'
+down_revision = '3c8a1d7e5b02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('questions', sa.Column('content_text', sa.Text(), nullable=True))
+    op.add_column('answers', sa.Column('content_text', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('answers') as batch_op:
+        batch_op.drop_column('content_text')
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('content_text')
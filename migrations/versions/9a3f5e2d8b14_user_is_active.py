@@ -0,0 +1,25 @@
+"""users.is_active flag checked by rbac and login
+
+Revision ID: 9a3f5e2d8b14
+Revises: 4e9b1c7a2f60
+Create Date: 2026-10-19 15:47:12.904531
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3f5e2d8b14'
+down_revision = '4e9b1c7a2f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('is_active')
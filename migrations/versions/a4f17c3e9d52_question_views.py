@@ -0,0 +1,35 @@
+"""questions view_count / unique_viewers / viewers_hll
+
+Revision ID: a4f17c3e9d52
+Revises: 5d8a3f60b2c9
+Create Date: 2026-10-19 21:03:55.604271
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f17c3e9d52'
+down_revision = '5d8a3f60b2c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('questions', sa.Column('view_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('questions', sa.Column('unique_viewers', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('questions', sa.Column('viewers_hll', sa.LargeBinary(), nullable=True))
+    op.create_index('ix_questions_live_view_count', 'questions', ['view_count', 'id'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NULL'),
+                    sqlite_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_questions_live_view_count', table_name='questions',
+                  postgresql_where=sa.text('deleted_at IS NULL'),
+                  sqlite_where=sa.text('deleted_at IS NULL'))
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('viewers_hll')
+        batch_op.drop_column('unique_viewers')
+        batch_op.drop_column('view_count')
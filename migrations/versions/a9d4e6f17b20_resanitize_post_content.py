@@ -0,0 +1,67 @@
+"""re-sanitize question / answer HTML stored before sanitize-on-write
+
+Revision ID: a9d4e6f17b20
+Revises: e7f3b9c20d15
+Create Date: 2026-10-21 09:42:17.530611
+
+Questions posted through the old ``post_question_safe`` path were stored
+unsanitized and were only cleaned when read through ``QuestionSchema``. Read
+paths now serve ``content`` as stored, so every existing body is run through
+the write‑time sanitizer once; rows whose HTML changes also get their
+``content_text`` (and a question's excerpt) re‑rendered.
+
+Not reversible: the unsanitized HTML is not kept.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4e6f17b20'
+down_revision = 'e7f3b9c20d15'
+branch_labels = None
+depends_on = None
+
+
+BATCH = 500
+
+
+def _batches(bind, table):
+    """``(id, content)`` rows of *table* in id order, BATCH at a time."""
+    last = 0
+    while True:
+        rows = bind.execute(sa.text(f'SELECT id, content FROM {table} WHERE id > :last '
+                                    f'ORDER BY id LIMIT {BATCH}'), {'last': last}).all()
+        if not rows:
+            return
+        last = rows[-1][0]
+        yield rows
+
+
+def upgrade():
+    # the app's own renderers, so cleaned rows match newly written ones
+    from app.utils import excerpt, html_to_text, sanitize_html
+
+    bind = op.get_bind()
+    for table in ('questions', 'answers'):
+        for rows in _batches(bind, table):
+            changed = []
+            for id_, content in rows:
+                html = sanitize_html(content or '')
+                if html != content:
+                    changed.append({'id': id_, 'content': html, 'text': html_to_text(html)})
+            if not changed:
+                continue
+            if table == 'questions':
+                for row in changed:
+                    row['excerpt'], row['length'] = excerpt(row['text'], 200), len(row['text'])
+                bind.execute(sa.text('UPDATE questions SET content = :content, '
+                                     'content_text = :text, excerpt = :excerpt, '
+                                     'content_length = :length WHERE id = :id'), changed)
+            else:
+                bind.execute(sa.text('UPDATE answers SET content = :content, '
+                                     'content_text = :text WHERE id = :id'), changed)
+
+
+def downgrade():
+    pass
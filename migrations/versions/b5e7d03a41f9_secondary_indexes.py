@@ -0,0 +1,41 @@
+"""secondary indexes on foreign keys and sort columns
+
+Revision ID: b5e7d03a41f9
+Revises: 8f14c2a9d6e3
+Create Date: 2026-10-19 13:05:51.277630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e7d03a41f9'
+down_revision = '8f14c2a9d6e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_questions_user_id', 'questions', ['user_id'])
+    op.create_index('ix_questions_created_at', 'questions', ['created_at'])
+    op.create_index('ix_answers_user_id', 'answers', ['user_id'])
+    op.create_index('ix_answers_question_id_created_at', 'answers', ['question_id', 'created_at'])
+    # the unique (user_id, <target>) constraints cannot serve target-only lookups
+    op.create_index('ix_votes_question_id', 'votes', ['question_id'])
+    op.create_index('ix_votes_answer_id', 'votes', ['answer_id'])
+    op.create_index('ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at'])
+    op.create_index('ix_notifications_user_unread', 'notifications', ['user_id'],
+                    postgresql_where=sa.text('is_read = false'),
+                    sqlite_where=sa.text('is_read = false'))
+
+
+def downgrade():
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_index('ix_notifications_user_id_created_at', table_name='notifications')
+    op.drop_index('ix_votes_answer_id', table_name='votes')
+    op.drop_index('ix_votes_question_id', table_name='votes')
+    op.drop_index('ix_answers_question_id_created_at', table_name='answers')
+    op.drop_index('ix_answers_user_id', table_name='answers')
+    op.drop_index('ix_questions_created_at', table_name='questions')
+    op.drop_index('ix_questions_user_id', table_name='questions')
@@ -0,0 +1,141 @@
+"""monthly range partitions for votes and notifications (PostgreSQL only)
+
+Revision ID: b81c6e2f7a93
+Revises: a4f17c3e9d52
+Create Date: 2026-10-19 21:48:12.907416
+
+Each table is renamed aside, recreated as ``PARTITION BY RANGE (created_at)``
+with one partition per month from its oldest row to three months ahead,
+refilled and the old table dropped. The primary key becomes
+``(id, created_at)`` (a partitioned table's unique keys must contain the
+partition key), so the one‑vote‑per‑user unique constraints become plain
+indexes; ``Vote.lock_target`` serialises the check instead.
+
+Other databases keep the plain tables.
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81c6e2f7a93'
+down_revision = 'a4f17c3e9d52'
+branch_labels = None
+depends_on = None
+
+AHEAD = 3
+
+VOTE_COLUMNS = """
+    id          integer NOT NULL DEFAULT nextval('votes_id_seq'),
+    vote_type   votetype NOT NULL,
+    user_id     integer NOT NULL REFERENCES users (id),
+    question_id integer REFERENCES questions (id),
+    answer_id   integer REFERENCES answers (id),
+    created_at  timestamp without time zone NOT NULL,
+    updated_at  timestamp without time zone,
+    CONSTRAINT vote_target_check CHECK (
+        (question_id IS NOT NULL AND answer_id IS NULL) OR
+        (question_id IS NULL AND answer_id IS NOT NULL))"""
+
+NOTIFICATION_COLUMNS = """
+    id         integer NOT NULL DEFAULT nextval('notifications_id_seq'),
+    user_id    integer NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    message    varchar(255) NOT NULL,
+    is_read    boolean NOT NULL,
+    created_at timestamp without time zone NOT NULL"""
+
+# (table, column list, indexes of the partitioned table, extra plain‑table DDL)
+TABLES = [
+    ('votes', VOTE_COLUMNS, [
+        'CREATE INDEX ix_votes_question_id ON votes (question_id)',
+        'CREATE INDEX ix_votes_answer_id ON votes (answer_id)',
+        'CREATE INDEX ix_votes_user_question ON votes (user_id, question_id)',
+        'CREATE INDEX ix_votes_user_answer ON votes (user_id, answer_id)',
+    ], [
+        'CONSTRAINT uq_user_question_vote UNIQUE (user_id, question_id)',
+        'CONSTRAINT uq_user_answer_vote UNIQUE (user_id, answer_id)',
+    ]),
+    ('notifications', NOTIFICATION_COLUMNS, [
+        'CREATE INDEX ix_notifications_user_id_created_at ON notifications (user_id, created_at)',
+        'CREATE INDEX ix_notifications_user_unread ON notifications (user_id) WHERE is_read = false',
+    ], []),
+]
+
+PLAIN_INDEXES = {
+    'votes': TABLES[0][2][:2],
+    'notifications': TABLES[1][2],
+}
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _months(first, last):
+    month = date(first.year, first.month, 1)
+    while month <= last:
+        yield month
+        month = _next_month(month)
+
+
+def _set_aside(table, old):
+    """Rename *table* to *old*, freeing its sequence and index names."""
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+    for name in op.get_bind().execute(sa.text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = :t AND indexname LIKE 'ix\\_%'"),
+            {'t': old}).scalars().all():
+        op.execute(f'DROP INDEX {name}')
+    for name in ('uq_user_question_vote', 'uq_user_answer_vote'):
+        op.execute(f'ALTER TABLE {old} DROP CONSTRAINT IF EXISTS {name}')
+
+
+def _refill(table, old):
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'DROP TABLE {old}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    today = datetime.now(timezone.utc).date()
+    last = date(today.year, today.month, 1)
+    for _ in range(AHEAD):
+        last = _next_month(last)
+    # the partition key must be NOT NULL; old votes may lack created_at
+    op.execute('UPDATE votes SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL')
+
+    for table, columns, indexes, _ in TABLES:
+        old = f'{table}_unpartitioned'
+        _set_aside(table, old)
+        op.execute(f'CREATE TABLE {table} ({columns},\n'
+                   f'    CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)\n'
+                   f') PARTITION BY RANGE (created_at)')
+        first = bind.execute(sa.text(f'SELECT min(created_at) FROM {old}')).scalar() or today
+        for month in _months(first, last):
+            op.execute(f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                       f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')")
+        for ddl in indexes:
+            op.execute(ddl)
+        _refill(table, old)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, columns, _, unique in TABLES:
+        old = f'{table}_partitioned'
+        _set_aside(table, old)
+        extra = ''.join(f',\n    {ddl}' for ddl in unique)
+        op.execute(f'CREATE TABLE {table} ({columns},\n'
+                   f'    CONSTRAINT {table}_pkey PRIMARY KEY (id){extra}\n)')
+        for ddl in PLAIN_INDEXES[table]:
+            op.execute(ddl)
+        _refill(table, old)
+        if table == 'votes':
+            op.execute('ALTER TABLE votes ALTER COLUMN created_at DROP NOT NULL')
@@ -0,0 +1,32 @@
+"""vote_deltas ledger for write-behind vote counters
+
+Revision ID: c5e9a2d71f40
+Revises: b81c6e2f7a93
+Create Date: 2026-10-20 10:12:44.502113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e9a2d71f40'
+down_revision = 'b81c6e2f7a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('vote_deltas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('target', sa.String(length=16), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_vote_deltas_target_row', 'vote_deltas', ['target', 'row_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_vote_deltas_target_row', table_name='vote_deltas')
+    op.drop_table('vote_deltas')
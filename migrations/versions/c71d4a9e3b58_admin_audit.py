@@ -0,0 +1,36 @@
+"""admin_audit table, one row per bulk admin action
+
+Revision ID: c71d4a9e3b58
+Revises: 9a3f5e2d8b14
+Create Date: 2026-10-19 16:20:37.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71d4a9e3b58'
+down_revision = '9a3f5e2d8b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('admin_audit',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=64), nullable=False),
+    sa.Column('criteria', sa.JSON(), nullable=False),
+    sa.Column('changes', sa.JSON(), nullable=False),
+    sa.Column('affected_ids', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_admin_audit_created_at'), 'admin_audit', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_admin_audit_created_at'), table_name='admin_audit')
+    op.drop_table('admin_audit')
@@ -0,0 +1,25 @@
+"""users.reputation column used by vote handling
+
+Revision ID: d2a6f81c9e47
+Revises: b5e7d03a41f9
+Create Date: 2026-10-19 14:11:08.662914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a6f81c9e47'
+down_revision = 'b5e7d03a41f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('reputation', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('reputation')
@@ -0,0 +1,45 @@
+"""votes.recipient_id: the voted post's author, for the activity feed
+
+Revision ID: d6c1f8a3e592
+Revises: a9d4e6f17b20
+Create Date: 2026-10-22 10:17:44.602913
+
+The feed read a user's received votes by joining votes to their questions /
+answers and ordering by ``votes.created_at`` – no index serves that order,
+so every page sorted all of the user's votes. The author is copied onto the
+vote instead, with a ``(recipient_id, created_at, id)`` index the feed walks
+newest‑first. Existing votes are backfilled in id ranges.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6c1f8a3e592'
+down_revision = 'a9d4e6f17b20'
+branch_labels = None
+depends_on = None
+
+BATCH = 5000
+
+_BACKFILL = ('UPDATE votes SET recipient_id = (SELECT user_id FROM {table} '
+             'WHERE {table}.id = votes.{column}) '
+             'WHERE {column} IS NOT NULL AND id > :lo AND id <= :hi')
+
+
+def upgrade():
+    op.add_column('votes', sa.Column('recipient_id', sa.Integer(), nullable=True))
+    bind = op.get_bind()
+    top = bind.execute(sa.text('SELECT MAX(id) FROM votes')).scalar() or 0
+    for lo in range(0, top, BATCH):
+        for table, column in (('questions', 'question_id'), ('answers', 'answer_id')):
+            bind.execute(sa.text(_BACKFILL.format(table=table, column=column)),
+                         {'lo': lo, 'hi': lo + BATCH})
+    op.create_index('ix_votes_recipient_created_at', 'votes',
+                    ['recipient_id', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_votes_recipient_created_at', table_name='votes')
+    with op.batch_alter_table('votes') as batch_op:
+        batch_op.drop_column('recipient_id')
@@ -0,0 +1,39 @@
+"""deleted_at on questions/answers with partial indexes over live rows
+
+Revision ID: e5b2c8f41a07
+Revises: c71d4a9e3b58
+Create Date: 2026-10-19 16:58:03.126744
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2c8f41a07'
+down_revision = 'c71d4a9e3b58'
+branch_labels = None
+depends_on = None
+
+LIVE = sa.text('deleted_at IS NULL')
+
+
+def upgrade():
+    op.add_column('questions', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('answers', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.drop_index('ix_questions_created_at', table_name='questions')
+    op.create_index('ix_questions_live_created_at', 'questions', ['created_at'],
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.create_index('ix_answers_live_question_id_created_at', 'answers',
+                    ['question_id', 'created_at'],
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+
+
+def downgrade():
+    op.drop_index('ix_answers_live_question_id_created_at', table_name='answers')
+    op.drop_index('ix_questions_live_created_at', table_name='questions')
+    op.create_index('ix_questions_created_at', 'questions', ['created_at'])
+    with op.batch_alter_table('answers') as batch_op:
+        batch_op.drop_column('deleted_at')
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,42 @@
+"""DEFAULT partitions for votes and notifications (PostgreSQL only)
+
+Revision ID: e7f3b9c20d15
+Revises: c5e9a2d71f40
+Create Date: 2026-10-20 14:31:09.118204
+
+A safety net for the monthly partitions of ``b81c6e2f7a93``: if the daily
+``partitions.maintain`` job stops re‑queueing itself, rows for a month that
+was never created land in ``<table>_default`` instead of failing the
+INSERT. The next ``maintain`` run moves them into their month.
+
+Other databases keep the plain tables.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7f3b9c20d15'
+down_revision = 'c5e9a2d71f40'
+branch_labels = None
+depends_on = None
+
+TABLES = ('votes', 'notifications')
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.execute(f'CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        if bind.execute(sa.text(f'SELECT EXISTS (SELECT 1 FROM {table}_default)')).scalar():
+            raise RuntimeError(f'{table}_default still has rows; run '
+                               f'`flask partitions maintain` to move them into their months')
+        op.execute(f'DROP TABLE {table}_default')
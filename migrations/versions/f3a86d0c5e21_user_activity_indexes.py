@@ -0,0 +1,31 @@
+"""(user_id, created_at) indexes on questions/answers for the activity feed
+
+Revision ID: f3a86d0c5e21
+Revises: e5b2c8f41a07
+Create Date: 2026-10-19 17:41:55.083417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a86d0c5e21'
+down_revision = 'e5b2c8f41a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the composite indexes serve every user_id‑only lookup as well
+    op.create_index('ix_questions_user_id_created_at', 'questions', ['user_id', 'created_at'])
+    op.create_index('ix_answers_user_id_created_at', 'answers', ['user_id', 'created_at'])
+    op.drop_index('ix_questions_user_id', table_name='questions')
+    op.drop_index('ix_answers_user_id', table_name='answers')
+
+
+def downgrade():
+    op.create_index('ix_answers_user_id', 'answers', ['user_id'])
+    op.create_index('ix_questions_user_id', 'questions', ['user_id'])
+    op.drop_index('ix_answers_user_id_created_at', table_name='answers')
+    op.drop_index('ix_questions_user_id_created_at', table_name='questions')